@@ -0,0 +1,24 @@
+"""
+ASGI config for english_learning project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Set ASYNC_VIEWS=True to serve the multi-query read endpoints (dashboard,
+stats, review list, search) with async views that run their queries
+concurrently. They are off by default: on SQLite they were slower than the
+sync views (bench_async_views), so enable them only after the command shows
+a gain on the production database.
+
+Run with e.g.:
+    gunicorn english_learning.asgi:application -k uvicorn.workers.UvicornWorker --workers 4
+
+For more information on this file, see
+https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'english_learning.settings')
+
+application = get_asgi_application()
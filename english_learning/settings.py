@@ -32,6 +32,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'learning.perf.PerformanceMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -62,6 +63,11 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'english_learning.wsgi.application'
+ASGI_APPLICATION = 'english_learning.asgi.application'
+
+# 仪表盘、统计、复习列表、搜索使用异步视图并发查询（仅 ASGI 部署有效，默认关闭；
+# SQLite 上异步视图比同步视图慢，先在生产数据库上运行 bench_async_views 确认有收益再开启）
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS', 'False').lower() == 'true'
 
 
 # Database
@@ -75,6 +81,9 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # 测试库使用文件：内存测试库（共享缓存）并发写入时直接报表锁定而不等待，
+        # 并发复习测试需要与开发环境相同的锁行为
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
     }
 }
 
@@ -88,6 +97,46 @@ if os.environ.get('DATABASE_URL'):
     )
 
 
+# Cache
+# CACHE_BACKEND=locmem|file|db，默认开发环境 locmem、生产环境 file。
+# locmem 只在单个进程内有效，多个 gunicorn worker 共享缓存请使用 file 或 db
+# （db 需要先执行 python manage.py createcachetable）。
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'db': 'django.core.cache.backends.db.DatabaseCache',
+}
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem' if DEBUG else 'file')
+CACHE_LOCATIONS = {
+    'locmem': 'english-learning',
+    'file': os.environ.get('CACHE_DIR', '/tmp/english_learning_cache'),
+    'db': 'learning_cache',
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': CACHE_LOCATIONS[CACHE_BACKEND],
+        'TIMEOUT': 300,
+    }
+}
+
+# 请求性能统计（learning/perf.py）：每个 URL 名称保留的样本数；
+# PERF_SHARED=True 时各进程每 PERF_FLUSH_INTERVAL 秒把样本写入缓存，/api/_perf/ 合并查看
+PERF_SAMPLES = 1000
+PERF_SHARED = os.environ.get('PERF_SHARED', 'False').lower() == 'true'
+PERF_FLUSH_INTERVAL = 10
+# 是否输出 Server-Timing 响应头（会向客户端暴露 SQL 条数和耗时），关闭后仍记录样本
+PERF_SERVER_TIMING = os.environ.get('PERF_SERVER_TIMING', 'True').lower() == 'true'
+
+# 接口响应缓存的过期时间（秒），覆盖 learning/cache.py 中的默认值，设为 0 关闭
+# 例如 {'dashboard': 30, 'stats': 600}
+LEARNING_CACHE_TTLS = {}
+
+# 列表接口使用编译后的快速序列化（learning/fastlist.py），结果只含字符串、整数等
+# 原生类型时在安装了 orjson 的情况下用 orjson 编码；输出与 DRF 序列化器相同
+FAST_LIST_SERIALIZATION = True
+FAST_JSON_ENCODER = True
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -148,7 +197,7 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'learning.renderers.FastJSONRenderer',
     ],
 }
 
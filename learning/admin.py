@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Word, Sentence, Grammar, StudyLog, StudyGoal
+from .models import Word, Sentence, Grammar, StudyLog, StudyGoal, Tag
 
 
 @admin.register(Word)
@@ -37,6 +37,8 @@ class SentenceAdmin(admin.ModelAdmin):
     list_filter = ['sentence_type', 'is_favorite', 'created_at']
     search_fields = ['english', 'chinese', 'keywords']
     readonly_fields = ['review_count', 'last_reviewed', 'created_at', 'updated_at']
+    # 标签由关键词自动同步
+    exclude = ['tags']
     
     def english_short(self, obj):
         return obj.english[:50] + '...' if len(obj.english) > 50 else obj.english
@@ -53,6 +55,8 @@ class GrammarAdmin(admin.ModelAdmin):
     list_filter = ['difficulty', 'is_mastered', 'category', 'created_at']
     search_fields = ['title', 'structure', 'explanation']
     readonly_fields = ['review_count', 'last_reviewed', 'created_at', 'updated_at']
+    # 标签由分类自动同步
+    exclude = ['tags']
 
 
 @admin.register(StudyLog)
@@ -68,3 +72,15 @@ class StudyGoalAdmin(admin.ModelAdmin):
     list_display = ['title', 'target_words', 'target_sentences', 'target_grammar', 'is_active', 'start_date', 'end_date']
     list_filter = ['is_active', 'start_date', 'end_date']
     search_fields = ['title', 'description']
+
+
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    list_display = ['name', 'kind', 'count']
+    list_filter = ['kind']
+    search_fields = ['name']
+    # 标签由单词、句子、语法的分类 / 关键词自动同步，这里只用于查看
+    readonly_fields = ['kind', 'name', 'count']
+    
+    def has_add_permission(self, request):
+        return False
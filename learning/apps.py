@@ -5,3 +5,6 @@ class LearningConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'learning'
     verbose_name = '英语学习'
+    
+    def ready(self):
+        from . import signals  # noqa: F401
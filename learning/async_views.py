@@ -0,0 +1,162 @@
+"""
+异步视图（ASGI 部署时使用）
+
+仪表盘、统计、复习列表、搜索各自包含多条相互独立的查询，同步视图逐条执行。
+这里把每条查询放到线程池中并发执行（Django ORM 本身是同步的，每个线程使用
+自己的数据库连接），总耗时接近最慢的一条查询，而不是所有查询之和。
+
+响应内容与对应的同步视图一致（同样经过 ETag 和响应缓存）。
+``settings.ASYNC_VIEWS`` 关闭时 URL 仍然指向同步视图。
+"""
+import asyncio
+import logging
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.http import HttpResponse
+from django.utils import timezone
+from django.views import View
+from rest_framework.renderers import JSONRenderer
+
+from .cache import response_cache
+from .conditional import aconditional_response
+from .models import Word, Sentence, Grammar, StudyLog
+from .serializers import DashboardSerializer
+from .stats import (
+    DASHBOARD_COUNTERS, DISTRIBUTIONS, distribution, last_7_days, time_series,
+    wants_time_series, parse_series_window, recent_activities
+)
+from .views import EMPTY_DASHBOARD, DashboardView, ReviewListView, SearchView
+
+logger = logging.getLogger(__name__)
+
+
+def _in_thread(func, *args):
+    try:
+        return func(*args)
+    finally:
+        # 线程池中的连接不会随请求结束关闭，按 CONN_MAX_AGE 处理
+        close_old_connections()
+
+
+async def gather(*calls):
+    """在线程池中并发执行多个同步函数，calls 为 (函数, 参数...) 元组，按顺序返回结果"""
+    return await asyncio.gather(*(
+        sync_to_async(_in_thread, thread_sensitive=False)(*call) for call in calls
+    ))
+
+
+def json_response(data, status=200):
+    """与 DRF JSONRenderer 输出相同的 JSON 响应"""
+    return HttpResponse(JSONRenderer().render(data), content_type='application/json', status=status)
+
+
+class AsyncDashboardView(View):
+    """仪表盘视图（异步）"""
+
+    async def get(self, request):
+        return await aconditional_response(
+            request, (Word, Sentence, Grammar, StudyLog), self._respond, daily=True
+        )
+
+    async def _respond(self):
+        try:
+            return json_response(await response_cache.aget_or_set('dashboard', self._dashboard_data))
+        except Exception as e:
+            logger.error(f"Error in AsyncDashboardView: {str(e)}")
+            return json_response(dict(EMPTY_DASHBOARD, error=str(e)))
+
+    async def _dashboard_data(self):
+        *counters, activities, streak = await gather(
+            *((counter,) for counter in DASHBOARD_COUNTERS),
+            (recent_activities,),
+            (DashboardView._calculate_streak,),
+        )
+        data = {}
+        for part in counters:
+            data.update(part)
+        data['recent_activities'] = activities
+        data['study_streak'] = streak
+        return DashboardSerializer(data).data
+
+
+class AsyncStatisticsView(View):
+    """统计数据视图（异步）"""
+
+    async def get(self, request):
+        return await aconditional_response(
+            request, (Word, Sentence, Grammar, StudyLog), lambda: self._respond(request), daily=True
+        )
+
+    async def _respond(self, request):
+        try:
+            params = request.GET
+            return json_response(await response_cache.aget_or_set(
+                'stats', lambda: self._statistics(params), params
+            ))
+        except ValueError as e:
+            return json_response({'status': 'error', 'message': str(e)}, status=400)
+        except Exception as e:
+            logger.error(f"Error in AsyncStatisticsView: {str(e)}")
+            return json_response({
+                'word_by_difficulty': [],
+                'sentence_by_type': [],
+                'grammar_by_difficulty': [],
+                'last_7_days': []
+            })
+
+    async def _statistics(self, params):
+        window = parse_series_window(params) if wants_time_series(params) else None
+        calls = [(distribution, model, field) for model, field in DISTRIBUTIONS.values()]
+        calls.append((last_7_days,))
+        if window:
+            calls.append((time_series, *window))
+
+        results = await gather(*calls)
+        data = dict(zip(DISTRIBUTIONS, results))
+        data['last_7_days'] = results[len(DISTRIBUTIONS)]
+        if window:
+            data['time_series'] = results[-1]
+        return data
+
+
+class AsyncReviewListView(View):
+    """复习列表视图（异步），三种类型并发查询后归并"""
+
+    async def get(self, request):
+        try:
+            limit = ReviewListView.parse_limit(request)
+            now = timezone.now()
+            items = await gather(*(
+                (ReviewListView.due_items, item_type, now, limit) for item_type in ReviewListView.SOURCES
+            ))
+            return json_response(ReviewListView.merge(items, limit))
+        except Exception as e:
+            logger.error(f"Error in AsyncReviewListView: {str(e)}")
+            return json_response([])
+
+
+class AsyncSearchView(View):
+    """搜索视图（异步），单词、句子、语法并发搜索"""
+
+    async def get(self, request):
+        return await aconditional_response(request, (Word, Sentence, Grammar), lambda: self._respond(request))
+
+    async def _respond(self, request):
+        try:
+            only = SearchView.parse_section_fields(request.GET)
+        except ValueError as e:
+            return json_response({'status': 'error', 'message': str(e)}, status=400)
+        try:
+            query = request.GET.get('q', '')
+            if not query:
+                return json_response({'words': [], 'sentences': [], 'grammar': []})
+
+            results = await gather(*(
+                (SearchView.search_section, kind, serializer_class, query, 10, only[key])
+                for key, kind, serializer_class in SearchView.SECTIONS
+            ))
+            return json_response({key: result for (key, _, _), result in zip(SearchView.SECTIONS, results)})
+        except Exception as e:
+            logger.error(f"Error in AsyncSearchView: {str(e)}")
+            return json_response({'words': [], 'sentences': [], 'grammar': []})
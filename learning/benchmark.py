@@ -0,0 +1,724 @@
+"""
+性能基准：测试数据生成与接口压测
+
+``seed_benchmark`` 按指定规模批量写入单词、句子、语法和多年的学习记录（中英文内容、
+创建时间和复习进度都按真实使用的分布生成，随机数可用 seed 固定），写入后补齐搜索索引、
+每日汇总、连续天数和数据版本号，与通过接口录入的数据没有区别。
+
+``bench`` 依次请求 ``learning/urls.py`` 中的每个接口（``ROUTES``），记录延迟分位数、
+每次请求的 SQL 条数、响应大小和内存峰值，结果写成 JSON，可以在不同提交、
+不同数据规模（1k / 100k / 1M）之间对比。
+"""
+import io
+import json
+import os
+import platform
+import random
+import re
+import resource
+import subprocess
+import time
+import tracemalloc
+import urllib.error
+import urllib.request
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime, time as dt_time, timedelta
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test import Client
+from django.urls import URLPattern, URLResolver
+from django.utils import timezone
+
+from .models import (
+    DataVersion, SearchDocument, Word, Sentence, Grammar, StudyLog, StudyGoal, StudyLogDaily, Tag, touch_models
+)
+from .perf import PerfStore
+from .reviews import REVIEW_TYPES
+from .rollups import backfill
+from .search import SEARCH_VERSION, index_objects
+from .stats import rebuild_study_streak
+from .tags import tag_objects
+from .suggest import WORD_VERSION, suggest_index
+
+SEED_BATCH_SIZE = 5000
+
+# 测试数据素材
+
+COMMON_WORDS = [
+    ('apple', '/ˈæpl/', 'n.', '苹果'),
+    ('apply', '/əˈplaɪ/', 'v.', '申请；应用'),
+    ('approach', '/əˈprəʊtʃ/', 'n.', '方法；接近'),
+    ('appropriate', '/əˈprəʊpriət/', 'adj.', '适当的'),
+    ('abandon', '/əˈbændən/', 'v.', '放弃；抛弃'),
+    ('ability', '/əˈbɪləti/', 'n.', '能力；才能'),
+    ('accurate', '/ˈækjərət/', 'adj.', '准确的；精确的'),
+    ('achieve', '/əˈtʃiːv/', 'v.', '实现；达到'),
+    ('benefit', '/ˈbenɪfɪt/', 'n.', '好处；利益'),
+    ('brief', '/briːf/', 'adj.', '简短的'),
+    ('challenge', '/ˈtʃælɪndʒ/', 'n.', '挑战'),
+    ('colleague', '/ˈkɒliːɡ/', 'n.', '同事'),
+    ('confirm', '/kənˈfɜːm/', 'v.', '确认；证实'),
+    ('consider', '/kənˈsɪdə(r)/', 'v.', '考虑；认为'),
+    ('deadline', '/ˈdedlaɪn/', 'n.', '截止日期'),
+    ('efficient', '/ɪˈfɪʃnt/', 'adj.', '高效的'),
+    ('environment', '/ɪnˈvaɪrənmənt/', 'n.', '环境'),
+    ('evidence', '/ˈevɪdəns/', 'n.', '证据'),
+    ('flexible', '/ˈfleksəbl/', 'adj.', '灵活的'),
+    ('generate', '/ˈdʒenəreɪt/', 'v.', '产生；生成'),
+    ('however', '/haʊˈevə(r)/', 'adv.', '然而；不过'),
+    ('improve', '/ɪmˈpruːv/', 'v.', '改善；提高'),
+    ('knowledge', '/ˈnɒlɪdʒ/', 'n.', '知识'),
+    ('maintain', '/meɪnˈteɪn/', 'v.', '保持；维护'),
+    ('negotiate', '/nɪˈɡəʊʃieɪt/', 'v.', '谈判；协商'),
+    ('opportunity', '/ˌɒpəˈtjuːnəti/', 'n.', '机会'),
+    ('perhaps', '/pəˈhæps/', 'adv.', '也许；可能'),
+    ('reliable', '/rɪˈlaɪəbl/', 'adj.', '可靠的'),
+    ('schedule', '/ˈʃedjuːl/', 'n.', '日程安排'),
+    ('significant', '/sɪɡˈnɪfɪkənt/', 'adj.', '重要的；显著的'),
+]
+
+SYLLABLES = [
+    'ab', 'ac', 'ad', 'al', 'an', 'ap', 'ar', 'be', 'bi', 'ca', 'ce', 'co', 'com', 'con', 'de',
+    'di', 'dis', 'el', 'em', 'en', 'ex', 'fa', 'fi', 'ge', 'im', 'in', 'la', 'le', 'li', 'lo',
+    'ma', 'me', 'mi', 'mo', 'na', 'ne', 'no', 'ob', 'pa', 'per', 'pre', 'pro', 'ra', 're', 'ri',
+    'sa', 'se', 'si', 'so', 'sub', 'ta', 'te', 'ti', 'tra', 'un', 'va', 've', 'vi',
+]
+SUFFIXES = {
+    'n.': ['tion', 'ment', 'ness', 'ity', 'ance', 'er'],
+    'v.': ['ate', 'ize', 'fy', 'en', 'ish'],
+    'adj.': ['ful', 'able', 'ive', 'ous', 'al', 'ic'],
+    'adv.': ['ly', 'ward', 'wise'],
+}
+MEANINGS = {
+    'n.': ['计划', '机会', '问题', '方法', '城市', '经验', '环境', '信息', '结果', '能力', '关系',
+           '历史', '文化', '技术', '市场', '健康', '教育', '社会', '资源', '压力', '合同', '会议'],
+    'v.': ['学习', '发展', '建立', '改善', '解释', '讨论', '决定', '提供', '保护', '影响', '比较',
+           '证明', '包括', '减少', '增加', '组织', '选择', '接受', '拒绝', '理解', '安排', '预订'],
+    'adj.': ['重要的', '困难的', '必要的', '明显的', '有效的', '普遍的', '复杂的', '独立的',
+             '积极的', '实际的', '稳定的', '现代的', '传统的', '基本的', '合适的', '紧急的'],
+    'adv.': ['迅速地', '仔细地', '完全地', '经常', '几乎', '最终', '显然', '逐渐地', '大约', '特别地'],
+}
+WORD_CATEGORIES = ['日常', '商务', '学术', '旅行', '科技', '情感', '教育', '医疗', '饮食', '体育', '四级', '六级', '雅思']
+
+SUBJECTS = [('I', '我'), ('We', '我们'), ('My colleague', '我的同事'), ('The manager', '经理'),
+            ('Students', '学生们'), ('She', '她'), ('Our team', '我们团队')]
+# 过去式和情态动词，与任意主语搭配都不会出现主谓不一致
+VERBS = [('will review', '将要复习'), ('decided to improve', '决定改进'), ('started discussing', '开始讨论'),
+         ('will present', '将要展示'), ('forgot to check', '忘了检查'), ('tried to understand', '试着理解'),
+         ('finished', '完成了')]
+OBJECTS = [('the project plan', '项目计划'), ('the quarterly report', '季度报告'),
+           ('this grammar rule', '这条语法规则'), ('the new vocabulary', '新单词'),
+           ('the contract terms', '合同条款'), ('our travel schedule', '我们的行程安排'),
+           ('the research paper', '这篇研究论文')]
+TAILS = [('before Friday', '在周五之前'), ('every morning', '每天早上'), ('as soon as possible', '尽快'),
+         ('after the meeting', '会议之后'), ('', '')]
+
+GRAMMAR_TOPICS = [
+    ('一般现在时', '时态', '主语 + 动词原形 / 第三人称单数'),
+    ('现在完成时', '时态', '主语 + have/has + 过去分词'),
+    ('过去进行时', '时态', '主语 + was/were + 现在分词'),
+    ('被动语态', '语态', '主语 + be + 过去分词 (+ by + 动作执行者)'),
+    ('定语从句', '从句', '先行词 + that/which/who + 从句'),
+    ('宾语从句', '从句', '主句 + that/if/whether + 从句'),
+    ('虚拟语气', '语气', 'If + 主语 + 过去式, 主语 + would + 动词原形'),
+    ('比较级', '形容词与副词', '形容词比较级 + than'),
+    ('非谓语动词', '动词', 'to do / doing / done'),
+    ('倒装句', '特殊句式', 'Never / Seldom + 助动词 + 主语 + 谓语'),
+    ('强调句', '特殊句式', 'It is/was + 被强调部分 + that/who + 其他'),
+    ('情态动词', '动词', '情态动词 + 动词原形'),
+]
+GRAMMAR_ASPECTS = ['基本用法', '常见搭配', '否定与疑问', '与相近结构对比', '易错点', '写作中的运用']
+GRAMMAR_LEVELS = [('beginner', 3), ('intermediate', 5), ('advanced', 2)]
+
+
+def _weighted(rng, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
+
+
+def _created_at(rng, now, span):
+    """偏向近期的创建时间"""
+    return now - span * (rng.random() ** 1.5)
+
+
+def _review_fields(rng, created_at, now):
+    """随机的复习进度：部分从未复习，部分已到期"""
+    review_count = _weighted(rng, [(0, 4), (1, 2), (2, 2), (3, 1), (5, 1), (8, 1)])
+    if not review_count:
+        return {'next_due': created_at}
+    last_reviewed = created_at + (now - created_at) * rng.random()
+    interval = rng.choice([1, 3, 6, 15, 30, 60])
+    return {
+        'review_count': review_count,
+        'last_reviewed': last_reviewed,
+        'repetitions': min(review_count, rng.randint(0, 5)),
+        'interval': interval,
+        'ease_factor': round(rng.uniform(1.3, 2.8), 2),
+        'next_due': last_reviewed + timedelta(days=interval),
+    }
+
+
+def _sentence_text(rng):
+    (s, s_zh), (v, v_zh), (o, o_zh), (t, t_zh) = (
+        rng.choice(SUBJECTS), rng.choice(VERBS), rng.choice(OBJECTS), rng.choice(TAILS)
+    )
+    return ' '.join(filter(None, [s, v, o, t])) + '.', f'{s_zh}{t_zh}{v_zh}{o_zh}。'
+
+
+def make_word(rng, index, now, span):
+    if index < len(COMMON_WORDS):
+        word, phonetic, pos, meaning = COMMON_WORDS[index]
+        meaning = f'{pos} {meaning}'
+    else:
+        pos = _weighted(rng, [('n.', 5), ('v.', 3), ('adj.', 3), ('adv.', 1)])
+        word = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3))) + rng.choice(SUFFIXES[pos])
+        phonetic = f'/{word}/'
+        meaning = f'{pos} ' + '；'.join(rng.sample(MEANINGS[pos], rng.randint(1, 3)))
+    english, chinese = _sentence_text(rng)
+    created_at = _created_at(rng, now, span)
+    return Word(
+        word=word,
+        phonetic=phonetic,
+        meaning=meaning,
+        part_of_speech=pos,
+        example_sentence=english,
+        example_translation=chinese,
+        difficulty=_weighted(rng, [('easy', 3), ('medium', 5), ('hard', 2)]),
+        category=rng.choice(WORD_CATEGORIES) if rng.random() < 0.8 else '',
+        notes='注意发音' if rng.random() < 0.1 else '',
+        is_favorite=rng.random() < 0.1,
+        created_at=created_at,
+        **_review_fields(rng, created_at, now)
+    )
+
+
+def make_sentence(rng, index, now, span):
+    english, chinese = _sentence_text(rng)
+    created_at = _created_at(rng, now, span)
+    return Sentence(
+        english=english,
+        chinese=chinese,
+        sentence_type=_weighted(rng, [('daily', 5), ('business', 3), ('translation', 2),
+                                      ('academic', 2), ('slang', 1), ('quote', 1)]),
+        keywords=', '.join(rng.sample([o.split()[-1] for o, _ in OBJECTS], 2)),
+        grammar_points=rng.choice(GRAMMAR_TOPICS)[0],
+        notes='' if rng.random() < 0.7 else '适合口语练习',
+        is_favorite=rng.random() < 0.1,
+        created_at=created_at,
+        **_review_fields(rng, created_at, now)
+    )
+
+
+def make_grammar(rng, index, now, span):
+    name, category, structure = GRAMMAR_TOPICS[index % len(GRAMMAR_TOPICS)]
+    aspect = rng.choice(GRAMMAR_ASPECTS)
+    examples = [_sentence_text(rng) for _ in range(3)]
+    created_at = _created_at(rng, now, span)
+    return Grammar(
+        title=f'{name}：{aspect}',
+        structure=structure,
+        explanation=(
+            f'{name}用于表达特定的时间、语气或句子关系。本节介绍{name}的{aspect}，'
+            f'结构为“{structure}”。' * rng.randint(2, 4)
+        ),
+        usage=f'{name}常用于日常对话和书面表达，注意与相近结构区分。',
+        examples=[f'{english} {chinese}' for english, chinese in examples],
+        difficulty=_weighted(rng, GRAMMAR_LEVELS),
+        category=category,
+        common_mistakes=f'容易混淆{name}与其他{category}的用法。',
+        tips='多读例句，结合语境记忆。',
+        is_mastered=rng.random() < 0.2,
+        created_at=created_at,
+        **_review_fields(rng, created_at, now)
+    )
+
+
+SEED_TYPES = {
+    'word': (Word, make_word),
+    'sentence': (Sentence, make_sentence),
+    'grammar': (Grammar, make_grammar),
+}
+
+
+@contextmanager
+def explicit_created_at(*models):
+    """临时关闭 created_at 的 auto_now_add，让 bulk_create 写入生成的历史时间"""
+    fields = [model._meta.get_field('created_at') for model in models]
+    try:
+        for field in fields:
+            field.auto_now_add = False
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def _active_days(rng, today, days):
+    """有学习记录的日期：大约八成的日子，最近 30 天每天都有（保证连续天数）"""
+    return [
+        today - timedelta(days=offset) for offset in range(days)
+        if offset < 30 or rng.random() < 0.8
+    ]
+
+
+def make_logs(rng, count, id_ranges, days, now):
+    """生成 count 条学习记录，id_ranges 为 {类型: (最小 ID, 最大 ID)}，时间不晚于 now"""
+    kinds = list(id_ranges)
+    tz = timezone.get_current_timezone()
+    for _ in range(count):
+        kind = rng.choice(kinds)
+        _, title_field, action, notes = REVIEW_TYPES[kind]
+        low, high = id_ranges[kind]
+        moment = datetime.combine(rng.choice(days), dt_time(rng.randint(7, 23), rng.randint(0, 59)))
+        yield StudyLog(
+            log_type=kind,
+            reference_id=rng.randint(low, high),
+            action=action,
+            notes=notes.format(_sentence_text(rng)[0] if kind == 'sentence' else f'{kind} #{low}'),
+            # 今天的记录不能晚于当前时间
+            created_at=min(timezone.make_aware(moment, tz), now),
+        )
+
+
+def _batched(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def clear_data():
+    """删除全部学习数据（直接 DELETE，不逐行触发信号）"""
+    links = [model.tags.through for model in (Word, Sentence, Grammar)]
+    for model in (*links, Tag, StudyLog, StudyLogDaily, SearchDocument, Word, Sentence, Grammar, StudyGoal):
+        queryset = model.objects.all()
+        queryset._raw_delete(queryset.db)
+
+
+def seed(counts, years=3, goals=5, batch_size=SEED_BATCH_SIZE, rng_seed=0, progress=None):
+    """按 counts（{'word': n, 'sentence': n, 'grammar': n, 'log': n}）写入测试数据，返回写入数量"""
+    rng = random.Random(rng_seed)
+    now = timezone.now()
+    span = timedelta(days=365 * years)
+    written = {}
+
+    with explicit_created_at(Word, Sentence, Grammar, StudyLog):
+        for kind, (model, factory) in SEED_TYPES.items():
+            total = counts.get(kind, 0)
+            done = 0
+            for batch in _batched((factory(rng, i, now, span) for i in range(total)), batch_size):
+                with transaction.atomic():
+                    created = model.objects.bulk_create(batch)
+                    index_objects(kind, created)
+                    tag_objects(kind, created, created=True)
+                done += len(created)
+                if progress:
+                    progress(kind, done, total)
+            written[kind] = done
+
+        id_ranges = {}
+        for kind, (model, _) in SEED_TYPES.items():
+            ids = model.objects.order_by('id').values_list('id', flat=True)
+            if ids.exists():
+                id_ranges[kind] = (ids.first(), ids.last())
+        total = counts.get('log', 0)
+        if total and not id_ranges:
+            raise ValueError('生成学习记录前需要先有单词、句子或语法')
+        done = 0
+        days = _active_days(rng, timezone.localdate(now), 365 * years)
+        for batch in _batched(make_logs(rng, total, id_ranges, days, now), batch_size):
+            StudyLog.objects.bulk_create(batch)
+            done += len(batch)
+            if progress:
+                progress('log', done, total)
+        written['log'] = done
+
+    today = timezone.localdate(now)
+    StudyGoal.objects.bulk_create([
+        StudyGoal(
+            title=f'第{i + 1}阶段学习目标',
+            description='每天坚持复习',
+            target_words=rng.choice([100, 300, 500]),
+            target_sentences=rng.choice([50, 100]),
+            target_grammar=rng.choice([10, 20]),
+            start_date=today - timedelta(days=30 * (i + 1)),
+            end_date=today + timedelta(days=30 * (goals - i)),
+            is_active=i == 0,
+        ) for i in range(goals)
+    ])
+    written['goal'] = goals
+
+    # bulk_create 不触发信号：补齐每日汇总、连续天数和各类版本号
+    if written['log']:
+        backfill()
+    rebuild_study_streak()
+    touch_models(Word, Sentence, Grammar, StudyLog, StudyGoal)
+    DataVersion.bump(WORD_VERSION, SEARCH_VERSION)
+    suggest_index.invalidate()
+    return written
+
+
+# 接口压测
+
+# name: 结果中的名称；url_name: 对应的 URL 名称（用于检查覆盖）；
+# path 中的 {word} 等占位符替换为样本 ID；write: 写操作（事务中执行后回滚）；
+# admin: 需要管理员登录；max_iterations: 单次耗时很长的接口限制请求次数
+Route = namedtuple('Route', 'name url_name method path data write admin max_iterations')
+
+
+def route(name, path, method='get', data=None, url_name=None, write=False, admin=False, max_iterations=None):
+    return Route(name, url_name or name, method, path, data, write, admin, max_iterations)
+
+
+def _review_results(sample):
+    return {'results': [
+        {'type': kind, 'id': sample[kind], 'grade': 'good'} for kind in ('word', 'sentence', 'grammar')
+    ]}
+
+
+def _import_file():
+    rows = ['word,meaning,difficulty,category']
+    rows += [f'benchimport{i},n. 压测导入,medium,压测' for i in range(50)]
+    upload = io.BytesIO('\n'.join(rows).encode())
+    upload.name = 'bench.csv'
+    return upload
+
+
+ROUTES = [
+    route('api-root', '/api/'),
+    # 单词
+    route('word-list', '/api/words/'),
+    route('word-list:page-50', '/api/words/?page=50', url_name='word-list'),
+    route('word-list:cursor', '/api/words/?paginate=cursor', url_name='word-list'),
+    route('word-list:filtered', '/api/words/?difficulty=hard&is_favorite=true', url_name='word-list'),
+    route('word-list:search', '/api/words/?search=co', url_name='word-list'),
+    route('word-list:fields', '/api/words/?page_size=100&fields=id,word', url_name='word-list'),
+    route('word-list:category', '/api/words/?category=雅思', url_name='word-list'),
+    route('word-detail', '/api/words/{word}/'),
+    route('word-detail:patch', '/api/words/{word}/', 'patch', {'notes': 'bench'}, 'word-detail', write=True),
+    route('word-detail:delete', '/api/words/{word}/', 'delete', url_name='word-detail', write=True),
+    route('word-list:create', '/api/words/', 'post', {'word': 'benchmark', 'meaning': 'n. 基准'},
+          'word-list', write=True),
+    route('word-review', '/api/words/{word}/review/', 'post', {'grade': 'good'}, write=True),
+    route('word-toggle-favorite', '/api/words/{word}/toggle_favorite/', 'post', write=True),
+    route('word-categories', '/api/words/categories/'),
+    route('word-facets', '/api/words/facets/'),
+    route('word-facets:filtered', '/api/words/facets/?difficulty=hard&search=co', url_name='word-facets'),
+    route('word-suggest', '/api/words/suggest/?prefix=app'),
+    route('word-random', '/api/words/random/?count=10'),
+    # 句子
+    route('sentence-list', '/api/sentences/'),
+    route('sentence-list:filtered', '/api/sentences/?type=business', url_name='sentence-list'),
+    route('sentence-list:keyword', '/api/sentences/?keyword=plan', url_name='sentence-list'),
+    route('sentence-detail', '/api/sentences/{sentence}/'),
+    route('sentence-detail:patch', '/api/sentences/{sentence}/', 'patch', {'notes': 'bench'},
+          'sentence-detail', write=True),
+    route('sentence-detail:delete', '/api/sentences/{sentence}/', 'delete', url_name='sentence-detail', write=True),
+    route('sentence-review', '/api/sentences/{sentence}/review/', 'post', {'grade': 'good'}, write=True),
+    route('sentence-toggle-favorite', '/api/sentences/{sentence}/toggle_favorite/', 'post', write=True),
+    route('sentence-types', '/api/sentences/types/'),
+    route('sentence-facets', '/api/sentences/facets/?is_favorite=true'),
+    route('sentence-random', '/api/sentences/random/?count=10'),
+    # 语法
+    route('grammar-list', '/api/grammar/'),
+    route('grammar-list:page-100', '/api/grammar/?page_size=100', url_name='grammar-list'),
+    route('grammar-list:filtered', '/api/grammar/?difficulty=advanced&category=时态', url_name='grammar-list'),
+    route('grammar-detail', '/api/grammar/{grammar}/'),
+    route('grammar-detail:patch', '/api/grammar/{grammar}/', 'patch', {'tips': 'bench'},
+          'grammar-detail', write=True),
+    route('grammar-detail:delete', '/api/grammar/{grammar}/', 'delete', url_name='grammar-detail', write=True),
+    route('grammar-review', '/api/grammar/{grammar}/review/', 'post', {'grade': 'good'}, write=True),
+    route('grammar-toggle-mastered', '/api/grammar/{grammar}/toggle_mastered/', 'post', write=True),
+    route('grammar-categories', '/api/grammar/categories/'),
+    route('grammar-facets', '/api/grammar/facets/'),
+    # 学习记录和目标
+    route('study-log-list', '/api/study-logs/'),
+    route('study-log-list:range', '/api/study-logs/?type=word&from={month_ago}', url_name='study-log-list'),
+    route('study-log-detail', '/api/study-logs/{log}/'),
+    route('study-goal-list', '/api/study-goals/'),
+    route('study-goal-detail', '/api/study-goals/{goal}/'),
+    # 汇总接口
+    route('dashboard', '/api/dashboard/'),
+    route('stats', '/api/stats/'),
+    route('stats:series', '/api/stats/?days=365&bucket=week', url_name='stats'),
+    route('cache-stats', '/api/cache-stats/', admin=True),
+    route('perf-stats', '/api/_perf/', admin=True),
+    route('review-list', '/api/review/'),
+    route('review-submit', '/api/review/submit/', 'post', _review_results, write=True),
+    route('search', '/api/search/?q=project'),
+    route('search:cjk', '/api/search/?q=计划', url_name='search'),
+    route('search:fields', '/api/search/?q=project&fields[words]=id,word&fields[sentences]=id,english'
+                           '&fields[grammar]=id,title', url_name='search'),
+    # 导入导出和批量操作
+    route('import', '/api/import/', 'post', lambda sample: {'type': 'word', 'file': _import_file()}, write=True),
+    route('export', '/api/export/?format=ndjson&models=grammar', max_iterations=3),
+    route('word-bulk-delete', '/api/words/bulk-delete/', 'post', lambda sample: {'ids': sample['words']},
+          write=True),
+    route('word-bulk-delete:filters', '/api/words/bulk-delete/', 'post', {'filters': {'category': '雅思'}},
+          'word-bulk-delete', write=True, max_iterations=20),
+    route('sentence-bulk-delete', '/api/sentences/bulk-delete/', 'post', lambda sample: {'ids': sample['sentences']},
+          write=True),
+    route('grammar-bulk-delete', '/api/grammar/bulk-delete/', 'post', lambda sample: {'ids': sample['grammars']},
+          write=True),
+    route('word-bulk-update', '/api/words/bulk-update/', 'post',
+          lambda sample: {'ids': sample['words'], 'set': {'is_favorite': True, 'difficulty': 'hard'}}, write=True),
+    route('word-bulk-update:filters', '/api/words/bulk-update/', 'post',
+          {'filters': {'category': '雅思'}, 'set': {'category': '考试'}}, 'word-bulk-update', write=True),
+    route('sentence-bulk-update', '/api/sentences/bulk-update/', 'post',
+          lambda sample: {'ids': sample['sentences'], 'set': {'keywords': 'plan, report'}}, write=True),
+    route('grammar-bulk-update', '/api/grammar/bulk-update/', 'post',
+          {'filters': {'difficulty': 'advanced'}, 'set': {'is_mastered': True}}, write=True),
+]
+
+SAMPLE_MODELS = {
+    'word': Word, 'sentence': Sentence, 'grammar': Grammar, 'log': StudyLog, 'goal': StudyGoal,
+}
+
+
+def sample_ids():
+    """路由中使用的样本 ID（每类最新的一条，批量操作取最新的 20 条）"""
+    sample = {'month_ago': (timezone.localdate() - timedelta(days=30)).isoformat()}
+    for key, model in SAMPLE_MODELS.items():
+        ids = list(model.objects.order_by('-id').values_list('id', flat=True)[:20])
+        sample[key] = ids[0] if ids else None
+        sample[f'{key}s'] = ids
+    return sample
+
+
+def url_names(patterns):
+    """递归列出 URL 配置中的全部 URL 名称"""
+    names = set()
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            names |= url_names(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            names.add(pattern.name)
+    return names
+
+
+def uncovered_routes():
+    """learning/urls.py 中没有对应压测路由的 URL 名称"""
+    from . import urls
+    return sorted(url_names(urls.urlpatterns) - {item.url_name for item in ROUTES})
+
+
+SERVER_TIMING_DB = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+
+
+def parse_server_timing(value):
+    """从 Server-Timing 响应头取出 (数据库耗时 ms, SQL 条数)"""
+    match = SERVER_TIMING_DB.search(value or '')
+    return (float(match.group(1)), int(match.group(2))) if match else (None, None)
+
+
+class ClientRunner:
+    """通过 Django 测试客户端在当前进程内请求"""
+    mode = 'client'
+
+    def __init__(self):
+        self.client = Client()
+
+    @contextmanager
+    def session(self, item):
+        """写操作和管理员接口在一个回滚的事务里执行，不改变数据"""
+        if not (item.write or item.admin):
+            yield
+            return
+        with transaction.atomic():
+            if item.admin:
+                users = get_user_model().objects
+                user = users.filter(is_superuser=True, is_active=True).first()
+                self.client.force_login(user or users.create_superuser('bench-admin', password=None))
+            try:
+                yield
+            finally:
+                self.client.logout()
+                transaction.set_rollback(True)
+
+    def request(self, item, path, data):
+        start = time.perf_counter()
+        if item.write:
+            with transaction.atomic():
+                response = self._send(item, path, data)
+                body = self._content(response)
+                transaction.set_rollback(True)
+        else:
+            response = self._send(item, path, data)
+            body = self._content(response)
+        elapsed = time.perf_counter() - start
+        return response.status_code, len(body), response.get('Server-Timing'), elapsed
+
+    def _send(self, item, path, data):
+        method = getattr(self.client, item.method)
+        if item.method == 'post' and isinstance(data, dict) and 'file' in data:
+            return method(path, data)
+        if data is None:
+            return method(path)
+        return method(path, data, content_type='application/json')
+
+    @staticmethod
+    def _content(response):
+        if response.streaming:
+            return b''.join(response.streaming_content)
+        return response.content
+
+
+class HTTPRunner:
+    """请求运行中的服务（如本地 gunicorn），只压测只读接口"""
+    mode = 'http'
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    @contextmanager
+    def session(self, item):
+        yield
+
+    def request(self, item, path, data):
+        request = urllib.request.Request(self.base_url + path)
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request) as response:
+                body = response.read()
+                status, timing = response.status, response.headers.get('Server-Timing')
+        except urllib.error.HTTPError as e:
+            body, status, timing = e.read(), e.code, e.headers.get('Server-Timing')
+        return status, len(body), timing, time.perf_counter() - start
+
+
+def _resolve(item, sample):
+    missing = [key for key in re.findall(r'{(\w+)}', item.path) if sample.get(key) is None]
+    if missing:
+        return None, None
+    data = item.data(sample) if callable(item.data) else item.data
+    return item.path.format(**sample), data
+
+
+def _max_rss_kb():
+    # Linux 上单位为 KB，macOS 上为字节
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if platform.system() == 'Darwin' else rss
+
+
+def bench_route(runner, item, sample, iterations, warmup, measure_memory):
+    """压测一个路由，返回结果字典；缺少样本数据时返回 None"""
+    path, data = _resolve(item, sample)
+    if path is None:
+        return None
+    if item.max_iterations:
+        iterations = min(iterations, item.max_iterations)
+        warmup = min(warmup, 1)
+
+    latencies, db_times, queries, sizes, statuses = [], [], [], [], set()
+    with runner.session(item):
+        for i in range(warmup + iterations):
+            status, size, timing, elapsed = runner.request(item, path, _resolve(item, sample)[1])
+            if i < warmup:
+                continue
+            db_time, query_count = parse_server_timing(timing)
+            latencies.append(elapsed * 1000)
+            statuses.add(status)
+            sizes.append(size)
+            if query_count is not None:
+                db_times.append(db_time)
+                queries.append(query_count)
+
+        peak = None
+        if measure_memory:
+            tracemalloc.start()
+            try:
+                runner.request(item, path, _resolve(item, sample)[1])
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+    result = {
+        'method': item.method.upper(),
+        'path': path,
+        'status': sorted(statuses),
+        'iterations': len(latencies),
+        'latency_ms': dict(PerfStore.percentiles(latencies), mean=round(sum(latencies) / len(latencies), 2)),
+        'db_ms': PerfStore.percentiles(db_times) if db_times else None,
+        'queries': max(queries) if queries else None,
+        'bytes': max(sizes),
+        'peak_kb': round(peak / 1024, 1) if peak is not None else None,
+    }
+    return result
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def dataset_counts():
+    return {
+        label: model.objects.count()
+        for label, model in (('word', Word), ('sentence', Sentence), ('grammar', Grammar),
+                             ('log', StudyLog), ('log_daily', StudyLogDaily), ('goal', StudyGoal))
+    }
+
+
+def run_bench(runner, routes, iterations=20, warmup=2, measure_memory=True, progress=None):
+    """压测 routes，返回可写成 JSON 的结果"""
+    sample = sample_ids()
+    results, skipped = {}, []
+    for item in routes:
+        result = bench_route(runner, item, sample, iterations, warmup, measure_memory)
+        if result is None:
+            skipped.append(item.name)
+            continue
+        results[item.name] = result
+        if progress:
+            progress(item.name, result)
+
+    return {
+        'meta': {
+            'revision': _git_revision(),
+            'created_at': timezone.now().isoformat(),
+            'mode': runner.mode,
+            'database': connection.vendor,
+            'async_views': settings.ASYNC_VIEWS,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'pid': os.getpid(),
+            'iterations': iterations,
+            'warmup': warmup,
+            'dataset': dataset_counts(),
+            'max_rss_kb': _max_rss_kb(),
+        },
+        'skipped': skipped,
+        'uncovered': uncovered_routes(),
+        'results': results,
+    }
+
+
+def compare(old, new):
+    """对比两次结果，返回 [(名称, 旧 p50, 新 p50, 变化比例, 旧 SQL 条数, 新 SQL 条数)]"""
+    rows = []
+    for name, result in new['results'].items():
+        before = old.get('results', {}).get(name)
+        if not before:
+            continue
+        old_p50, new_p50 = before['latency_ms']['p50'], result['latency_ms']['p50']
+        change = (new_p50 - old_p50) / old_p50 if old_p50 else None
+        rows.append((name, old_p50, new_p50, change, before.get('queries'), result.get('queries')))
+    return rows
+
+
+def load_results(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
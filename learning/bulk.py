@@ -0,0 +1,171 @@
+"""
+批量修改与批量删除
+
+按 id 列表或列表接口的筛选参数选出对象。筛选参数不能为空值，布尔参数只接受 true / false，
+筛选后没有任何条件（会选中整张表）时拒绝执行。
+
+批量修改：所有要修改的字段在同一条 UPDATE 中写入
+
+- 先取出满足条件的 id，按 ``BATCH_SIZE`` 分批（SQLite 单条语句的参数个数有限），每批一条 UPDATE
+- 返回数据库实际更新的行数（不存在的 id 不计入）
+- update() 不触发信号：修改分类 / 关键词时同步标签，最后递增数据版本号
+
+批量删除：按主键分批，每批一个短事务，不会长时间占用 SQLite 的写锁
+
+- 每批扣减标签计数，删除标签关联、搜索文档、对象的学习记录和对象本身
+- 用 ``delete_rows`` 直接 DELETE、绕过模型信号（逐行发送信号每行要执行多条 SQL），最后统一递增数据版本号
+- 返回实际删除的对象数和学习记录数；每日汇总是历史记录，不随之减少
+"""
+from django.db import transaction
+from django.http import QueryDict
+from django.utils import timezone
+
+from .models import DataVersion, StudyLog, delete_rows, touch_models
+from .search import remove_objects
+from .suggest import WORD_VERSION, suggest_index
+from .tags import MODEL_KINDS, TAG_FIELDS, tag_objects, untag_objects
+
+# 每条语句最多的 id 数（SQLite 旧版本默认最多 999 个参数）
+BATCH_SIZE = 500
+# 布尔筛选参数
+FLAG_FILTERS = ('is_favorite', 'is_mastered')
+
+
+def chunked(items, size=BATCH_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def parse_ids(value):
+    """请求中的 ids -> 去重后的整数列表；没有提供时返回 None"""
+    if value in (None, '', []):
+        return None
+    if not isinstance(value, list):
+        raise ValueError('ids 必须是数组')
+    try:
+        return list(dict.fromkeys(int(pk) for pk in value))
+    except (TypeError, ValueError):
+        raise ValueError('ids 只能包含整数')
+
+
+def parse_filters(value, allowed):
+    """请求中的 filters 对象 -> 与列表接口查询参数相同的 QueryDict；没有提供时返回 None"""
+    if not value:
+        return None
+    if not isinstance(value, dict):
+        raise ValueError('filters 必须是对象')
+    unknown = [key for key in value if key not in allowed]
+    if unknown:
+        raise ValueError(f'不支持的筛选条件: {", ".join(unknown)}（可选: {", ".join(allowed)}）')
+    params = QueryDict(mutable=True)
+    for key, item in value.items():
+        items = item if isinstance(item, list) else [item]
+        values = [str(x).lower() if isinstance(x, bool) else str(x) for x in items if x is not None]
+        if not values or len(values) < len(items) or not all(x.strip() for x in values):
+            raise ValueError(f'筛选条件 {key} 不能为空')
+        if key in FLAG_FILTERS and any(x.lower() not in ('true', 'false') for x in values):
+            raise ValueError(f'筛选条件 {key} 只能是 true 或 false')
+        params.setlist(key, values)
+    return params
+
+
+def filter_queryset(queryset, filters, apply_filters):
+    """按 parse_filters 的结果筛选；筛选后没有任何条件时拒绝（防止误改、误删整张表）"""
+    queryset = apply_filters(queryset, filters)
+    if not queryset.query.has_filters():
+        raise ValueError('filters 没有限制任何对象')
+    return queryset
+
+
+def parse_changes(value, serializer_class, allowed):
+    """请求中的 set 对象 -> 校验后的 {字段: 值}（使用模型序列化器的字段校验）"""
+    if not value or not isinstance(value, dict):
+        raise ValueError(f'set 必须是非空对象（可修改: {", ".join(allowed)}）')
+    unknown = [key for key in value if key not in allowed]
+    if unknown:
+        raise ValueError(f'不支持批量修改的字段: {", ".join(unknown)}（可修改: {", ".join(allowed)}）')
+    serializer = serializer_class(data=value, partial=True)
+    if not serializer.is_valid():
+        raise ValueError('; '.join(
+            f'{field}: {" ".join(str(error) for error in errors)}' for field, errors in serializer.errors.items()
+        ))
+    return dict(serializer.validated_data)
+
+
+def bulk_update(queryset, changes, ids=None):
+    """把 changes 写入 queryset 中的对象（给出 ids 时只修改其中的对象），返回更新的行数"""
+    model = queryset.model
+    kind = MODEL_KINDS[model]
+    field = TAG_FIELDS[kind][1]
+    retag = field in changes
+    values = dict(changes, updated_at=timezone.now())
+
+    updated = 0
+    with transaction.atomic():
+        # 先取出满足条件的 id 再按 id 分批 UPDATE：搜索筛选用 extra() 连接全文索引表，
+        # Django 生成 UPDATE 时不带这些表；修改分类后对象也可能不再满足筛选条件
+        if ids is None:
+            ids = list(queryset.order_by().values_list('pk', flat=True))
+        else:
+            ids = [
+                pk for chunk in chunked(ids)
+                for pk in queryset.filter(pk__in=chunk).order_by().values_list('pk', flat=True)
+            ]
+        for chunk in chunked(ids):
+            updated += model.objects.filter(pk__in=chunk).update(**values)
+            if retag:
+                tag_objects(kind, list(model.objects.filter(pk__in=chunk).only('id', field)))
+        if updated:
+            touch_models(model)
+    return updated
+
+
+def purge_logs(kind, pks):
+    """删除对象的学习记录（不逐行触发信号），返回删除的条数"""
+    return delete_rows(StudyLog, pks, 'reference_id', log_type=kind)
+
+
+def _pending_chunks(queryset, chunk_size):
+    """按主键顺序逐批取出仍满足条件的 id"""
+    queryset = queryset.order_by('pk').values_list('pk', flat=True)
+    last = None
+    while True:
+        pending = queryset if last is None else queryset.filter(pk__gt=last)
+        ids = list(pending[:chunk_size])
+        if not ids:
+            return
+        last = ids[-1]
+        yield ids
+
+
+def bulk_delete(queryset, ids=None, chunk_size=BATCH_SIZE):
+    """删除 queryset 中的对象（给出 ids 时只删除其中的对象）及其学习记录，
+    返回 (删除的对象数, 删除的学习记录数)
+    """
+    model = queryset.model
+    kind = MODEL_KINDS[model]
+    if ids is None:
+        chunks = _pending_chunks(queryset, chunk_size)
+    else:
+        chunks = (list(queryset.filter(pk__in=chunk).values_list('pk', flat=True)) for chunk in chunked(ids, chunk_size))
+
+    deleted = logs = 0
+    try:
+        for chunk in chunks:
+            if not chunk:
+                continue
+            with transaction.atomic():
+                untag_objects(kind, chunk)
+                remove_objects(kind, chunk)
+                logs += purge_logs(kind, chunk)
+                deleted += delete_rows(model, chunk)
+    finally:
+        # 中途出错时已提交的批次也要让缓存和 ETag 失效
+        if deleted:
+            touch_models(model)
+            if kind == 'word':
+                DataVersion.bump(WORD_VERSION)
+                suggest_index.invalidate()
+        if logs:
+            touch_models(StudyLog)
+    return deleted, logs
@@ -0,0 +1,150 @@
+"""
+接口响应缓存
+
+仪表盘、统计、分类等只读接口每次请求都重复计算相同的结果，这里把计算结果
+（序列化后的数据）放进 Django 缓存：
+
+- 每个接口单独设置过期时间，可以用 ``settings.LEARNING_CACHE_TTLS`` 覆盖，设为 0 关闭
+- 每个接口声明依赖的模型，数据变更（``data_changed`` 信号）时递增该接口的代数，
+  旧代数的缓存项不会再被读取，等待自然过期
+- 代数也保存在缓存里，使用 file / db 后端时各个 worker 共享缓存和失效；
+  locmem 只在单个进程内有效，其他进程最多读到过期时间内的旧数据
+- 命中 / 未命中次数按进程统计
+"""
+import hashlib
+import os
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+KEY_PREFIX = 'learning:response'
+
+# 接口 -> (默认过期秒数, 依赖的模型, 是否随本地日期变化)
+ENDPOINTS = {
+    'dashboard': (60, ('learning.word', 'learning.sentence', 'learning.grammar', 'learning.studylog'), True),
+    'stats': (300, ('learning.word', 'learning.sentence', 'learning.grammar', 'learning.studylog'), True),
+    'word_categories': (3600, ('learning.word',), False),
+    'grammar_categories': (3600, ('learning.grammar',), False),
+    'sentence_types': (86400, (), False),
+    'word_facets': (300, ('learning.word',), False),
+    'sentence_facets': (300, ('learning.sentence',), False),
+    'grammar_facets': (300, ('learning.grammar',), False),
+}
+
+_MISSING = object()
+
+
+class ResponseCache:
+    """按接口缓存计算结果，按依赖的模型失效"""
+
+    def __init__(self, endpoints, alias='default'):
+        self.endpoints = endpoints
+        self.alias = alias
+        self._lock = threading.Lock()
+        self._counters = {name: {'hits': 0, 'misses': 0} for name in endpoints}
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def ttl(self, name):
+        overrides = getattr(settings, 'LEARNING_CACHE_TTLS', {})
+        return overrides.get(name, self.endpoints[name][0])
+
+    def _generation_key(self, name):
+        return f'{KEY_PREFIX}:{name}:generation'
+
+    def _generation(self, name):
+        key = self._generation_key(name)
+        generation = self.cache.get(key)
+        if generation is None:
+            # 代数丢失（被淘汰或缓存被清空）时从当前时间重新开始，不会读到更早的缓存项
+            self.cache.add(key, time.time_ns(), None)
+            generation = self.cache.get(key)
+        return generation
+
+    def _key(self, name, params):
+        params = params or {}
+        # QueryDict 的 items() 每个参数只给最后一个值，?keyword=a&keyword=b 须保留全部取值
+        lists = params.lists() if hasattr(params, 'lists') else ((key, [value]) for key, value in params.items())
+        parts = [f'{key}={value}' for key, values in sorted(lists) for value in values]
+        if self.endpoints[name][2]:
+            parts.append(timezone.localdate().isoformat())
+        digest = hashlib.md5('&'.join(parts).encode()).hexdigest()
+        return f'{KEY_PREFIX}:{name}:{self._generation(name)}:{digest}'
+
+    def _count(self, name, counter):
+        with self._lock:
+            self._counters[name][counter] += 1
+
+    def get_or_set(self, name, compute, params=None):
+        """返回缓存的结果，未命中时调用 compute() 计算并写入；compute 抛出的异常不会被缓存"""
+        ttl = self.ttl(name)
+        if not ttl:
+            self._count(name, 'misses')
+            return compute()
+
+        key = self._key(name, params)
+        data = self.cache.get(key, _MISSING)
+        if data is not _MISSING:
+            self._count(name, 'hits')
+            return data
+
+        self._count(name, 'misses')
+        data = compute()
+        self.cache.set(key, data, ttl)
+        return data
+
+    async def aget_or_set(self, name, compute, params=None):
+        """get_or_set 的异步版本，compute 为无参数的协程函数"""
+        ttl = self.ttl(name)
+        if not ttl:
+            self._count(name, 'misses')
+            return await compute()
+
+        key = await sync_to_async(self._key)(name, params)
+        data = await self.cache.aget(key, _MISSING)
+        if data is not _MISSING:
+            self._count(name, 'hits')
+            return data
+
+        self._count(name, 'misses')
+        data = await compute()
+        await self.cache.aset(key, data, ttl)
+        return data
+
+    def invalidate(self, labels):
+        """让依赖这些模型的接口缓存失效"""
+        labels = set(labels)
+        for name, (_, dependencies, _) in self.endpoints.items():
+            if labels.intersection(dependencies):
+                try:
+                    self.cache.incr(self._generation_key(name))
+                except ValueError:
+                    # 代数不存在，下次读取时会重新开始
+                    pass
+
+    def stats(self):
+        """本进程的命中统计"""
+        with self._lock:
+            endpoints = {
+                name: dict(counters, ttl=self.ttl(name))
+                for name, counters in self._counters.items()
+            }
+        hits = sum(item['hits'] for item in endpoints.values())
+        misses = sum(item['misses'] for item in endpoints.values())
+        return {
+            'backend': settings.CACHES[self.alias]['BACKEND'],
+            'pid': os.getpid(),
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / (hits + misses), 4) if hits + misses else None,
+            'endpoints': endpoints,
+        }
+
+
+response_cache = ResponseCache(ENDPOINTS)
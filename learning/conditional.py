@@ -0,0 +1,96 @@
+"""
+条件请求（ETag）
+
+每个模型在 DataVersion 中有一行版本号（名称为 ``learning.word`` 这样的模型标签），
+所有写入都会递增它：save / delete 由信号处理，update()、bulk_create 等批量写入
+调用 ``touch_models``。GET 请求先用一次查询读出相关版本号算出 ETag，
+``If-None-Match`` 命中时直接返回 304，不执行列表查询和序列化。
+
+版本号总是在数据写入之后递增，所以 ETag 只可能偏旧（多一次完整响应），
+不会让客户端拿着过期数据得到 304。
+"""
+import hashlib
+import logging
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from .models import DataVersion
+
+logger = logging.getLogger(__name__)
+
+
+def compute_etag(request, model_classes, daily=False):
+    """根据请求地址、响应格式和相关模型的版本号计算强 ETag"""
+    versions = DataVersion.current(*(model._meta.label_lower for model in model_classes))
+    parts = [request.get_full_path(), getattr(request, 'accepted_media_type', '') or '']
+    parts += [f'{name}={version}' for name, version in versions.items()]
+    if daily:
+        # “今日”统计、连续学习天数等跨天会变化
+        parts.append(timezone.localdate().isoformat())
+    return '"%s"' % hashlib.sha1('|'.join(parts).encode()).hexdigest()
+
+
+def conditional_response(request, model_classes, handler, daily=False):
+    """未修改时返回 304，否则调用 handler 生成响应并附上 ETag"""
+    try:
+        etag = compute_etag(request, model_classes, daily)
+    except Exception as e:
+        logger.error(f"Error in compute_etag: {str(e)}")
+        return handler()
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = handler()
+        if response.status_code != 200:
+            return response
+    response['ETag'] = etag
+    # 让浏览器每次都带 If-None-Match 重新验证
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+async def aconditional_response(request, model_classes, handler, daily=False):
+    """conditional_response 的异步版本，handler 为无参数的协程函数"""
+    try:
+        etag = await sync_to_async(compute_etag)(request, model_classes, daily)
+    except Exception as e:
+        logger.error(f"Error in compute_etag: {str(e)}")
+        return await handler()
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = await handler()
+        if response.status_code != 200:
+            return response
+    response['ETag'] = etag
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+def conditional(*model_classes, daily=False):
+    """视图方法装饰器，响应内容取决于 model_classes 中的数据"""
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            return conditional_response(
+                request, model_classes, lambda: method(self, request, *args, **kwargs), daily
+            )
+        return wrapper
+    return decorator
+
+
+class ConditionalGetMixin:
+    """ViewSet 的 list / retrieve 支持 If-None-Match"""
+
+    def list(self, request, *args, **kwargs):
+        return conditional_response(
+            request, [self.queryset.model], lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return conditional_response(
+            request, [self.queryset.model], lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs)
+        )
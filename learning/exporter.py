@@ -0,0 +1,128 @@
+"""
+流式导出
+
+用 ``values_list().iterator(chunk_size=...)`` 分块读取，逐行生成 NDJSON / CSV，
+不实例化模型、不经过序列化器，内存占用与数据量无关。
+
+NDJSON 每行与 Django 的 jsonl 序列化格式一致：
+``{"model": "learning.word", "pk": 1, "fields": {...}}``。
+
+ASGI 下 StreamingHttpResponse 会把同步迭代器整体读入内存后再发送，
+需要用 ``aiter_export`` 包装成异步迭代器。
+"""
+import csv
+import json
+from datetime import date, datetime
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Word, Sentence, Grammar, StudyLog, StudyGoal
+
+EXPORT_MODELS = {
+    'word': Word,
+    'sentence': Sentence,
+    'grammar': Grammar,
+    'studylog': StudyLog,
+    'studygoal': StudyGoal,
+}
+EXPORT_FORMATS = ('ndjson', 'csv')
+CHUNK_SIZE = 2000
+# 异步导出时每次切换线程取出的行数
+ASYNC_BATCH_ROWS = 500
+
+
+def parse_models(value):
+    """解析逗号分隔的模型列表，默认全部"""
+    names = [name.strip().lower() for name in (value or '').split(',') if name.strip()]
+    if not names:
+        return list(EXPORT_MODELS)
+    unknown = [name for name in names if name not in EXPORT_MODELS]
+    if unknown:
+        raise ValueError(f'未知模型: {", ".join(unknown)}')
+    return list(dict.fromkeys(names))
+
+
+def export_fields(model):
+    """导出的字段名（不含主键）"""
+    return [field.attname for field in model._meta.concrete_fields if not field.primary_key]
+
+
+def iter_rows(model, chunk_size=CHUNK_SIZE):
+    """按主键顺序分块读取 (pk, 字段值...)"""
+    fields = export_fields(model)
+    return model.objects.order_by('pk').values_list('pk', *fields).iterator(chunk_size=chunk_size)
+
+
+def iter_ndjson(names, chunk_size=CHUNK_SIZE):
+    """逐行生成 NDJSON"""
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for name in names:
+        model = EXPORT_MODELS[name]
+        fields = export_fields(model)
+        label = model._meta.label_lower
+        for row in iter_rows(model, chunk_size):
+            yield encoder.encode({
+                'model': label,
+                'pk': row[0],
+                'fields': dict(zip(fields, row[1:]))
+            }) + '\n'
+
+
+class _Echo:
+    """csv.writer 的伪文件对象，write 直接返回写入的内容"""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def iter_csv(name, chunk_size=CHUNK_SIZE):
+    """逐行生成单个模型的 CSV（首行为字段名，可直接用于批量导入）"""
+    model = EXPORT_MODELS[name]
+    writer = csv.writer(_Echo())
+    yield writer.writerow(['id'] + export_fields(model))
+    for row in iter_rows(model, chunk_size):
+        yield writer.writerow([_csv_value(value) for value in row])
+
+
+def iter_export(fmt, names, chunk_size=CHUNK_SIZE):
+    """按格式生成导出内容；CSV 一次只能导出一个模型"""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f'format 只能是 {", ".join(EXPORT_FORMATS)}')
+    if fmt == 'csv':
+        if len(names) != 1:
+            raise ValueError('CSV 格式一次只能导出一个模型')
+        return iter_csv(names[0], chunk_size)
+    return iter_ndjson(names, chunk_size)
+
+
+def _next_batch(rows, size):
+    return ''.join(islice(rows, size))
+
+
+async def aiter_export(rows, batch_rows=ASYNC_BATCH_ROWS):
+    """把同步的导出迭代器包装成异步迭代器（ASGI 下使用）
+
+    数据库查询仍是同步的，在同一个同步线程（thread_sensitive）中逐批取出，
+    游标在批次之间保持打开；每批合并成一个字符串发送，减少线程切换次数。
+    """
+    next_batch = sync_to_async(_next_batch, thread_sensitive=True)
+    try:
+        while True:
+            batch = await next_batch(rows, batch_rows)
+            if not batch:
+                break
+            yield batch
+    finally:
+        await sync_to_async(rows.close, thread_sensitive=True)()
@@ -0,0 +1,91 @@
+"""
+筛选项计数（facets）
+
+在当前筛选和搜索条件下统计每个筛选字段各取值的条数，一个模型只执行一条查询：
+
+- PostgreSQL：``GROUP BY GROUPING SETS ((difficulty), (category), (is_favorite), ())``，
+  用 ``GROUPING()`` 区分每一行属于哪个字段，空分组集给出总数
+- 其他数据库（SQLite 不支持 GROUPING SETS）：按全部筛选字段一起分组，
+  在 Python 中按字段汇总；分组数不超过各字段取值数的乘积，远小于行数
+
+有 choices 的字段和布尔字段列出全部取值（没有数据的计数为 0），
+其他字段（如分类）按取值排序列出非空的取值。
+"""
+from collections import Counter
+
+from django.core.exceptions import EmptyResultSet
+from django.db import connections, models
+from django.db.models import Count
+
+
+def _grouping_sets_counts(queryset, fields):
+    """PostgreSQL：一条 GROUPING SETS 查询，返回 ({字段: Counter}, 总数)"""
+    connection = connections[queryset.db]
+    qn = connection.ops.quote_name
+    inner, params = queryset.order_by().values(*fields).query.sql_with_params()
+    columns = ', '.join(qn(field) for field in fields)
+    groupings = ', '.join(f'GROUPING({qn(field)})' for field in fields)
+    sets = ', '.join(f'({qn(field)})' for field in fields)
+    sql = (
+        f'SELECT {columns}, {groupings}, COUNT(*) FROM ({inner}) AS facet_rows '
+        f'GROUP BY GROUPING SETS ({sets}, ())'
+    )
+    counts = {field: Counter() for field in fields}
+    total = 0
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        for row in cursor.fetchall():
+            values, grouped, count = row[:len(fields)], row[len(fields):-1], row[-1]
+            if all(grouped):
+                total = count
+                continue
+            # GROUPING(col) 为 0 的列就是这一行的分组字段
+            index = grouped.index(0)
+            counts[fields[index]][values[index]] += count
+    return counts, total
+
+
+def _rollup_counts(queryset, fields):
+    """其他数据库：按全部字段一起分组，在 Python 中汇总"""
+    counts = {field: Counter() for field in fields}
+    total = 0
+    for row in queryset.order_by().values(*fields).annotate(facet_count=Count('pk')):
+        count = row['facet_count']
+        total += count
+        for field in fields:
+            counts[field][row[field]] += count
+    return counts, total
+
+
+def _facet_values(model_field, counter):
+    if model_field.choices:
+        return [
+            {'value': value, 'label': str(label), 'count': counter.get(value, 0)}
+            for value, label in model_field.flatchoices
+        ]
+    if isinstance(model_field, models.BooleanField):
+        return [{'value': value, 'count': counter.get(value, 0)} for value in (True, False)]
+    return [
+        {'value': value, 'count': count}
+        for value, count in sorted(counter.items())
+        if value not in ('', None)
+    ]
+
+
+def facet_counts(queryset, fields):
+    """返回 {'total': 总数, 'facets': {字段: [{'value', 'label'?, 'count'}]}}"""
+    fields = list(fields)
+    try:
+        if connections[queryset.db].vendor == 'postgresql':
+            counts, total = _grouping_sets_counts(queryset, fields)
+        else:
+            counts, total = _rollup_counts(queryset, fields)
+    except EmptyResultSet:
+        # 查询集为 none()（如搜索没有结果）
+        counts, total = {field: Counter() for field in fields}, 0
+
+    meta = queryset.model._meta
+    return {
+        'total': total,
+        'facets': {field: _facet_values(meta.get_field(field), counts[field]) for field in fields},
+    }
@@ -0,0 +1,244 @@
+"""
+列表接口的快速序列化
+
+ModelSerializer 序列化一页数据时，每一行都要实例化模型对象，再逐个字段调用
+get_attribute / to_representation。列表序列化器只用到少数几个普通字段，这里
+根据序列化器的字段预先编译出 (输出键, 列, 转换函数) 映射：
+
+- 用 ``values_list()`` 只读取需要的列，不实例化模型
+- 字符串、整数、布尔值原样输出，日期时间等使用 DRF 字段自己的 to_representation，
+  ``get_*_display`` 字段直接查 choices 表
+- 只包含字符串、整数、布尔值和 None 的结果标记为 ``json_native``，
+  ``FastJSONRenderer`` 在安装了 orjson 时用它编码
+
+输出与原来的序列化器逐字节相同。序列化器中有方法字段、关联字段等无法编译的字段时
+退回原来的流程；``settings.FAST_LIST_SERIALIZATION = False`` 时总是使用原来的流程。
+退回时也用 ``.only()`` 只读取序列化器用到的列，不加载语法解释、例句、备注等长文本。
+
+``?fields=id,word`` 只返回指定的字段（必须是列表序列化器中的字段），SQL 也只读取这些列。
+"""
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.response import Response
+
+# to_representation 对数据库取出的值没有影响的字段类型
+PASSTHROUGH_FIELDS = (
+    serializers.IntegerField, serializers.BooleanField, serializers.CharField, serializers.ChoiceField,
+)
+# 输出为字符串的字段类型（不会产生浮点数等 orjson 与标准库编码不一致的值）
+NATIVE_FIELDS = PASSTHROUGH_FIELDS + (
+    serializers.DateTimeField, serializers.DateField,
+)
+# 游标分页需要的列
+PAGINATION_COLUMNS = ('created_at', 'id')
+
+
+def readable_fields(serializer, only=None):
+    """序列化器输出的 (字段名, 字段)，only 不为空时只保留其中的字段"""
+    return [
+        (key, field) for key, field in serializer.fields.items()
+        if not field.write_only and (only is None or key in only)
+    ]
+
+
+def model_column(model, field):
+    """序列化器字段读取的模型字段（get_*_display 对应原字段），不是普通列时返回 None"""
+    source = field.source
+    if source.startswith('get_') and source.endswith('_display'):
+        source = source[4:-8]
+    try:
+        model_field = model._meta.get_field(source)
+    except FieldDoesNotExist:
+        return None
+    if not model_field.concrete or model_field.is_relation:
+        return None
+    if field.source != source and not model_field.choices:
+        return None
+    return model_field
+
+
+@lru_cache(maxsize=None)
+def field_names(serializer_class):
+    return tuple(key for key, _ in readable_fields(serializer_class()))
+
+
+def parse_fields(value, serializer_class):
+    """解析 ?fields=，返回按序列化器顺序排列的字段名元组；没有指定时返回 None"""
+    names = [name.strip() for name in (value or '').split(',') if name.strip()]
+    if not names:
+        return None
+    available = field_names(serializer_class)
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise ValueError(f'未知字段: {", ".join(unknown)}（可选: {", ".join(available)}）')
+    return tuple(name for name in available if name in names)
+
+
+@lru_cache(maxsize=256)
+def only_columns(serializer_class, only=None):
+    """序列化器用到的列（用于 .only()），有方法字段等无法确定的字段时返回 None"""
+    serializer = serializer_class()
+    model = serializer.Meta.model
+    columns = []
+    for _, field in readable_fields(serializer, only):
+        model_field = model_column(model, field)
+        if model_field is None:
+            return None
+        columns.append(model_field.attname)
+    return tuple(dict.fromkeys(columns + list(PAGINATION_COLUMNS)))
+
+
+def sparse_serializer(serializer, only):
+    """去掉 only 以外的字段（many=True 时作用于 child）"""
+    if only is not None:
+        target = getattr(serializer, 'child', serializer)
+        for key in list(target.fields):
+            if key not in only:
+                target.fields.pop(key)
+    return serializer
+
+
+def _display(choices):
+    """与 Model.get_FOO_display() 相同"""
+    def convert(value):
+        return str(choices.get(value, value))
+    return convert
+
+
+class ListPlan:
+    """编译后的列表序列化方案"""
+
+    def __init__(self, columns, fields, json_native):
+        self.columns = columns
+        # [(输出键, 列下标, 转换函数或 None)]
+        self.fields = fields
+        self.json_native = json_native
+
+    @classmethod
+    def compile(cls, serializer_class, only=None):
+        """根据序列化器字段编译方案（only 为要输出的字段），有无法编译的字段时返回 None"""
+        serializer = serializer_class()
+        model = serializer.Meta.model
+        columns, fields, json_native = [], [], True
+
+        def column(name):
+            if name not in columns:
+                columns.append(name)
+            return columns.index(name)
+
+        for key, field in readable_fields(serializer, only):
+            model_field = model_column(model, field)
+            if model_field is None:
+                return None
+            if field.source != model_field.name:
+                # get_*_display
+                if type(field) is not serializers.CharField:
+                    return None
+                fields.append((key, column(model_field.attname), _display(dict(model_field.flatchoices))))
+                continue
+            if isinstance(field, serializers.ModelField):
+                # ModelField 的 to_representation 需要模型对象
+                return None
+            if type(field) in PASSTHROUGH_FIELDS:
+                convert = None
+            elif isinstance(field, serializers.IntegerField):
+                # BigIntegerField（DRF 3.15+）只有 COERCE_BIG_INT_TO_STRING 时才转成字符串
+                convert = field.to_representation if getattr(field, 'coerce_to_string', False) else None
+            else:
+                convert = field.to_representation
+            json_native = json_native and (
+                type(field) in NATIVE_FIELDS or isinstance(field, serializers.IntegerField)
+            )
+            fields.append((key, column(model_field.attname), convert))
+
+        for name in PAGINATION_COLUMNS:
+            column(name)
+        return cls(tuple(columns), fields, json_native)
+
+    def values(self, queryset):
+        """只读取需要的列；行是命名元组，游标分页可以取 created_at / id"""
+        return queryset.values_list(*self.columns, named=True)
+
+    def rows(self, values):
+        """把 values() 的行转换成与序列化器相同的字典"""
+        fields = self.fields
+        result = []
+        for row in values:
+            item = {}
+            for key, index, convert in fields:
+                value = row[index]
+                item[key] = value if convert is None or value is None else convert(value)
+            result.append(item)
+        return result
+
+
+@lru_cache(maxsize=256)
+def _compiled_plan(serializer_class, only):
+    return ListPlan.compile(serializer_class, only)
+
+
+def list_plan(serializer_class, only=None):
+    """编译后的方案；关闭快速序列化或无法编译时返回 None"""
+    if not settings.FAST_LIST_SERIALIZATION:
+        return None
+    return _compiled_plan(serializer_class, only)
+
+
+def serialize_ranked(serializer_class, ids, only=None):
+    """按 ids 的顺序序列化对象（搜索结果），只读取需要的列"""
+    if not ids:
+        return []
+    queryset = serializer_class.Meta.model.objects.filter(pk__in=ids)
+    plan = list_plan(serializer_class, only)
+    if plan is not None:
+        rows = {row.id: row for row in plan.values(queryset)}
+        return plan.rows([rows[pk] for pk in ids if pk in rows])
+
+    columns = only_columns(serializer_class, only)
+    if columns:
+        queryset = queryset.only(*columns)
+    objects = queryset.in_bulk(ids)
+    serializer = serializer_class([objects[pk] for pk in ids if pk in objects], many=True)
+    return sparse_serializer(serializer, only).data
+
+
+class FastListMixin:
+    """ViewSet 的 list 使用编译后的序列化方案，支持 ?fields="""
+    fields_query_param = 'fields'
+
+    def list(self, request, *args, **kwargs):
+        serializer_class = self.get_serializer_class()
+        try:
+            self.sparse_fields = parse_fields(request.query_params.get(self.fields_query_param), serializer_class)
+        except ValueError as e:
+            return Response({'status': 'error', 'message': str(e)}, status=400)
+
+        plan = list_plan(serializer_class, self.sparse_fields)
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        values = plan.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(values)
+        if page is not None:
+            response = self.get_paginated_response(plan.rows(page))
+        else:
+            response = Response(plan.rows(values))
+        response.json_native = plan.json_native
+        return response
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action == 'list':
+            columns = only_columns(self.get_serializer_class(), getattr(self, 'sparse_fields', None))
+            if columns:
+                queryset = queryset.only(*columns)
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if self.action == 'list':
+            sparse_serializer(serializer, getattr(self, 'sparse_fields', None))
+        return serializer
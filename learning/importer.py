@@ -0,0 +1,171 @@
+"""
+批量导入
+
+逐行读取 CSV / JSONL，按批用序列化器校验，去掉与数据库和本次导入中已有内容
+重复的行，再在事务中 bulk_create。校验失败的行记录行号和错误信息，不影响同批的其他行。
+"""
+import codecs
+import csv
+import io
+import json
+import time
+
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from .models import Word, Sentence, Grammar, DataVersion, touch_models
+from .search import index_objects
+from .serializers import WordSerializer, SentenceSerializer, GrammarSerializer
+from .suggest import WORD_VERSION, suggest_index
+from .tags import tag_objects
+
+# 类型 -> (模型, 序列化器, 去重字段)
+IMPORT_TYPES = {
+    'word': (Word, WordSerializer, 'word'),
+    'sentence': (Sentence, SentenceSerializer, 'english'),
+    'grammar': (Grammar, GrammarSerializer, 'title'),
+}
+IMPORT_FORMATS = ('csv', 'jsonl')
+DEFAULT_BATCH_SIZE = 500
+# 响应中最多返回的错误条数
+MAX_REPORTED_ERRORS = 100
+
+
+def guess_format(filename):
+    """根据文件扩展名判断格式"""
+    name = (filename or '').lower()
+    if name.endswith('.csv'):
+        return 'csv'
+    if name.endswith(('.jsonl', '.ndjson', '.json')):
+        return 'jsonl'
+    return None
+
+
+def _text_stream(fileobj):
+    """把二进制文件包装成逐行读取的文本流（兼容 UTF-8 BOM）"""
+    if isinstance(fileobj, io.TextIOBase):
+        return fileobj
+    return codecs.getreader('utf-8-sig')(fileobj)
+
+
+def read_rows(fileobj, fmt):
+    """逐行产出 (行号, 数据或异常)，不把整个文件读进内存"""
+    stream = _text_stream(fileobj)
+    if fmt == 'csv':
+        for number, row in enumerate(csv.DictReader(stream), start=1):
+            # CSV 空单元格视为未提供，使用字段默认值
+            data = {key: value for key, value in row.items() if key and value not in (None, '')}
+            if isinstance(data.get('examples'), str):
+                try:
+                    data['examples'] = json.loads(data['examples'])
+                except ValueError:
+                    data['examples'] = [data['examples']]
+            yield number, data
+    else:
+        for number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield number, json.loads(line)
+            except ValueError as e:
+                yield number, e
+
+
+class ImportResult:
+    """导入结果"""
+
+    def __init__(self):
+        self.created = 0
+        self.skipped = 0
+        self.error_count = 0
+        self.errors = []
+        self.started = time.monotonic()
+        self.elapsed = 0.0
+
+    def add_error(self, row, errors):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row, 'errors': errors})
+
+    @property
+    def rows_per_second(self):
+        total = self.created + self.skipped + self.error_count
+        return round(total / self.elapsed, 1) if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            'created': self.created,
+            'skipped': self.skipped,
+            'error_count': self.error_count,
+            'errors': self.errors,
+            'elapsed': round(self.elapsed, 3),
+            'rows_per_second': self.rows_per_second
+        }
+
+
+def _import_batch(kind, batch, seen, result):
+    """校验、去重并写入一批 (行号, 数据)"""
+    model, serializer_class, key_field = IMPORT_TYPES[kind]
+    # 与 ListSerializer 相同，复用同一个序列化器实例逐行校验，避免每行重新构建字段
+    validator = serializer_class()
+    valid = []
+    for number, data in batch:
+        if isinstance(data, Exception):
+            result.add_error(number, {'non_field_errors': [str(data)]})
+            continue
+        if not isinstance(data, dict):
+            result.add_error(number, {'non_field_errors': ['每行必须是一个对象']})
+            continue
+        try:
+            valid.append(validator.run_validation(data))
+        except ValidationError as e:
+            result.add_error(number, e.detail)
+
+    keys = {data[key_field] for data in valid}
+    existing = set(
+        model.objects.filter(**{f'{key_field}__in': keys}).values_list(key_field, flat=True)
+    ) if keys else set()
+
+    objects = []
+    for data in valid:
+        key = data[key_field]
+        if key in existing or key in seen:
+            result.skipped += 1
+            continue
+        seen.add(key)
+        objects.append(model(**data))
+
+    if objects:
+        with transaction.atomic():
+            created = model.objects.bulk_create(objects)
+            index_objects(kind, created)
+            tag_objects(kind, created, created=True)
+        result.created += len(created)
+
+
+def import_file(kind, fileobj, fmt, batch_size=DEFAULT_BATCH_SIZE):
+    """导入一个 CSV / JSONL 文件，返回 ImportResult"""
+    if kind not in IMPORT_TYPES:
+        raise ValueError(f'type 只能是 {", ".join(IMPORT_TYPES)}')
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f'format 只能是 {", ".join(IMPORT_FORMATS)}')
+
+    result = ImportResult()
+    seen = set()
+    batch = []
+    for row in read_rows(fileobj, fmt):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            _import_batch(kind, batch, seen, result)
+            batch = []
+    if batch:
+        _import_batch(kind, batch, seen, result)
+
+    if result.created:
+        # bulk_create 不触发信号，手动让 ETag 和单词联想索引失效
+        touch_models(IMPORT_TYPES[kind][0])
+        if kind == 'word':
+            DataVersion.bump(WORD_VERSION)
+            suggest_index.invalidate()
+    result.elapsed = time.monotonic() - result.started
+    return result
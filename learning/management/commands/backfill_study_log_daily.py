@@ -0,0 +1,20 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from learning.models import StudyLog, touch_models
+from learning.rollups import backfill
+from learning.stats import rebuild_study_streak
+
+
+class Command(BaseCommand):
+    help = '根据原始学习记录回填每日学习汇总（可重复执行，不会重复计数）'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--since', type=date.fromisoformat, help='只处理该日期（YYYY-MM-DD）之后的记录')
+    
+    def handle(self, *args, **options):
+        days, total = backfill(options['since'])
+        rebuild_study_streak()
+        touch_models(StudyLog)
+        self.stdout.write(self.style.SUCCESS(f'已汇总 {days} 天、{total} 条学习记录'))
@@ -0,0 +1,81 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from learning.benchmark import ROUTES, ClientRunner, HTTPRunner, compare, load_results, run_bench
+from learning.cache import ENDPOINTS as CACHED_ENDPOINTS
+
+
+class Command(BaseCommand):
+    help = '依次压测 learning/urls.py 中的每个接口，输出延迟分位数、SQL 条数和内存，结果写入 JSON'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('-o', '--output', default='bench-results.json', help='结果文件')
+        parser.add_argument('--iterations', type=int, default=20, help='每个接口的请求次数')
+        parser.add_argument('--warmup', type=int, default=2, help='不计入结果的预热请求次数')
+        parser.add_argument('--only', action='append', help='只压测名称包含该字符串的接口，可重复使用')
+        parser.add_argument(
+            '--base-url', help='请求运行中的服务（如 http://127.0.0.1:8000），只压测只读接口；默认使用测试客户端'
+        )
+        parser.add_argument('--cache', action='store_true', help='保留响应缓存（默认关闭，测量实际计算耗时；--base-url 时由服务端配置决定）')
+        parser.add_argument('--no-memory', action='store_true', help='不测量内存峰值')
+        parser.add_argument('--compare', help='与之前的结果文件对比 p50 和 SQL 条数')
+    
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError('--iterations 至少为 1')
+        routes = ROUTES
+        if options['only']:
+            routes = [item for item in routes if any(text in item.name for text in options['only'])]
+        if options['base_url']:
+            runner = HTTPRunner(options['base_url'])
+            routes = [item for item in routes if not (item.write or item.admin)]
+        else:
+            runner = ClientRunner()
+        if not routes:
+            raise CommandError('没有匹配的接口')
+        
+        ttls = {} if options['cache'] else {name: 0 for name in CACHED_ENDPOINTS}
+        self.stdout.write(
+            f"{'接口':<28}{'状态':>6}{'p50':>9}{'p95':>9}{'p99':>9}{'SQL':>5}{'KB':>9}{'峰值 KB':>10}"
+        )
+        with override_settings(LEARNING_CACHE_TTLS=ttls):
+            report = run_bench(
+                runner, routes, iterations=options['iterations'], warmup=options['warmup'],
+                measure_memory=runner.mode == 'client' and not options['no_memory'], progress=self.progress
+            )
+        
+        with open(options['output'], 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        meta = report['meta']
+        self.stdout.write(f"数据量 {meta['dataset']}，进程最大 RSS {meta['max_rss_kb']} KB")
+        if report['skipped']:
+            self.stdout.write(self.style.WARNING(f"缺少样本数据，已跳过: {', '.join(report['skipped'])}"))
+        if report['uncovered']:
+            self.stdout.write(self.style.WARNING(f"没有压测路由的 URL: {', '.join(report['uncovered'])}"))
+        self.stdout.write(self.style.SUCCESS(f"结果已写入 {options['output']}"))
+        
+        if options['compare']:
+            self.write_comparison(load_results(options['compare']), report)
+    
+    def progress(self, name, result):
+        latency = result['latency_ms']
+        status = ','.join(str(code) for code in result['status'])
+        queries = '-' if result['queries'] is None else result['queries']
+        peak = '-' if result['peak_kb'] is None else result['peak_kb']
+        self.stdout.write(
+            f"{name:<28}{status:>6}{latency['p50']:>9.2f}{latency['p95']:>9.2f}{latency['p99']:>9.2f}"
+            f"{queries:>5}{result['bytes'] / 1024:>9.1f}{peak:>10}"
+        )
+    
+    def write_comparison(self, old, new):
+        self.stdout.write(f"\n对比 {old['meta'].get('revision')} -> {new['meta'].get('revision')}（p50 ms）")
+        for name, old_p50, new_p50, change, old_queries, new_queries in compare(old, new):
+            line = (
+                f"{name:<28}{old_p50:>9.2f}{new_p50:>9.2f}{'' if change is None else f'{change:+.1%}':>9}"
+                f'  SQL {old_queries} -> {new_queries}'
+            )
+            # 变慢超过 10% 或 SQL 条数增加时标红
+            regressed = (change or 0) > 0.1 or (new_queries or 0) > (old_queries or 0)
+            self.stdout.write(self.style.ERROR(line) if regressed else line)
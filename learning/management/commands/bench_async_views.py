@@ -0,0 +1,89 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.test import AsyncRequestFactory, RequestFactory, override_settings
+
+from learning.async_views import (
+    AsyncDashboardView, AsyncStatisticsView, AsyncReviewListView, AsyncSearchView
+)
+from learning.cache import ENDPOINTS as CACHED_ENDPOINTS
+from learning.views import DashboardView, StatisticsView, ReviewListView, SearchView
+
+# 名称 -> (地址, 同步视图, 异步视图)
+ENDPOINTS = {
+    'dashboard': ('/api/dashboard/', DashboardView, AsyncDashboardView),
+    'stats': ('/api/stats/?days=90&bucket=week', StatisticsView, AsyncStatisticsView),
+    'review': ('/api/review/', ReviewListView, AsyncReviewListView),
+    'search': ('/api/search/?q={query}', SearchView, AsyncSearchView),
+}
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+class Command(BaseCommand):
+    help = '在当前数据库上对比同步 / 异步视图在并发请求下的延迟（关闭响应缓存）'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoint', action='append', choices=list(ENDPOINTS), help='可重复使用；默认全部')
+        parser.add_argument('--requests', type=int, default=200, help='每个视图的请求数')
+        parser.add_argument('--concurrency', type=int, default=16, help='并发请求数')
+        parser.add_argument('--query', default='a', help='搜索关键词')
+    
+    def handle(self, *args, **options):
+        names = options['endpoint'] or list(ENDPOINTS)
+        n, concurrency = options['requests'], options['concurrency']
+        
+        self.stdout.write(f'{n} 个请求，并发 {concurrency}（延迟单位 ms）')
+        self.stdout.write(f"{'接口':<10}{'模式':<7}{'平均':>9}{'p50':>9}{'p95':>9}{'吞吐 req/s':>13}")
+        with override_settings(LEARNING_CACHE_TTLS={name: 0 for name in CACHED_ENDPOINTS}):
+            for name in names:
+                url, sync_view, async_view = ENDPOINTS[name]
+                url = url.format(query=options['query'])
+                for mode, (latencies, elapsed) in (
+                    ('sync', self.run_sync(sync_view.as_view(), url, n, concurrency)),
+                    ('async', asyncio.run(self.run_async(async_view.as_view(), url, n, concurrency))),
+                ):
+                    self.stdout.write(
+                        f'{name:<10}{mode:<7}{sum(latencies) / n * 1000:>9.2f}'
+                        f'{percentile(latencies, 50) * 1000:>9.2f}{percentile(latencies, 95) * 1000:>9.2f}'
+                        f'{n / elapsed:>13.1f}'
+                    )
+    
+    def run_sync(self, view, url, n, concurrency):
+        factory = RequestFactory()
+        
+        def one(_):
+            start = time.perf_counter()
+            try:
+                response = view(factory.get(url))
+                response.render()
+                assert response.status_code == 200, response.status_code
+                return time.perf_counter() - start
+            finally:
+                close_old_connections()
+        
+        start = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as executor:
+            latencies = list(executor.map(one, range(n)))
+        return latencies, time.perf_counter() - start
+    
+    async def run_async(self, view, url, n, concurrency):
+        factory = AsyncRequestFactory()
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await view(factory.get(url))
+                assert response.status_code == 200, response.status_code
+                return time.perf_counter() - start
+        
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(one() for _ in range(n)))
+        return latencies, time.perf_counter() - start
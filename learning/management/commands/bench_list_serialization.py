@@ -0,0 +1,81 @@
+import time
+import tracemalloc
+from urllib.parse import quote
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+
+from learning.perf import PerfStore
+from learning.renderers import orjson
+
+ENDPOINTS = {
+    'words': '/api/words/?page_size={size}',
+    'sentences': '/api/sentences/?page_size={size}',
+    'grammar': '/api/grammar/?page_size={size}',
+    'study-logs': '/api/study-logs/?page_size={size}',
+    'words-cursor': '/api/words/?paginate=cursor&page_size={size}',
+}
+
+# 模式 -> (FAST_LIST_SERIALIZATION, FAST_JSON_ENCODER)
+MODES = {
+    'drf': (False, False),
+    'values': (True, False),
+    'values+orjson': (True, True),
+}
+
+
+class Command(BaseCommand):
+    help = '对比列表接口使用 DRF 序列化器与快速序列化（values + 可选 orjson）的耗时，并检查输出逐字节相同'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoint', action='append', choices=list(ENDPOINTS), help='可重复使用；默认全部')
+        parser.add_argument('--requests', type=int, default=50, help='每种模式的请求数')
+        parser.add_argument('--page-size', type=int, default=100, help='每页条数')
+        parser.add_argument('--fields', help='附加 ?fields= 参数（如 id,title），配合 --endpoint 使用')
+    
+    def handle(self, *args, **options):
+        names = options['endpoint'] or list(ENDPOINTS)
+        modes = [mode for mode in MODES if mode != 'values+orjson' or orjson is not None]
+        if orjson is None:
+            self.stdout.write(self.style.WARNING('未安装 orjson，跳过 values+orjson 模式'))
+        client = Client()
+        
+        self.stdout.write(f"{options['requests']} 个请求，每页 {options['page_size']} 条（延迟单位 ms）")
+        self.stdout.write(
+            f"{'接口':<14}{'模式':<15}{'平均':>9}{'p50':>9}{'p95':>9}{'加速':>8}{'KB':>9}{'峰值 KB':>10}"
+        )
+        for name in names:
+            url = ENDPOINTS[name].format(size=options['page_size'])
+            if options['fields']:
+                url += f"&fields={quote(options['fields'])}"
+            baseline, expected = None, None
+            for mode in modes:
+                fast_list, fast_json = MODES[mode]
+                with override_settings(FAST_LIST_SERIALIZATION=fast_list, FAST_JSON_ENCODER=fast_json):
+                    content = client.get(url).content
+                    tracemalloc.start()
+                    try:
+                        client.get(url)
+                        peak = tracemalloc.get_traced_memory()[1]
+                    finally:
+                        tracemalloc.stop()
+                    latencies = []
+                    for _ in range(options['requests']):
+                        start = time.perf_counter()
+                        response = client.get(url)
+                        latencies.append((time.perf_counter() - start) * 1000)
+                        if response.status_code != 200:
+                            raise CommandError(f'{url} 返回 {response.status_code}: {response.content[:200]}')
+                if expected is None:
+                    expected = content
+                elif content != expected:
+                    raise CommandError(f'{name} 在 {mode} 模式下的输出与 DRF 序列化器不同')
+                
+                mean = sum(latencies) / len(latencies)
+                baseline = baseline or mean
+                percentiles = PerfStore.percentiles(latencies)
+                self.stdout.write(
+                    f"{name:<14}{mode:<15}{mean:>9.2f}{percentiles['p50']:>9.2f}{percentiles['p95']:>9.2f}"
+                    f"{baseline / mean:>7.2f}x{len(content) / 1024:>9.1f}{peak / 1024:>10.1f}"
+                )
+        self.stdout.write(self.style.SUCCESS('各模式输出逐字节相同'))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from learning.rollups import COMPACT_CHUNK_SIZE, compact_logs
+
+
+class Command(BaseCommand):
+    help = '把 N 天之前的原始学习记录并入每日汇总后删除'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=90, help='保留最近多少天的原始记录（默认 90）')
+        parser.add_argument('--chunk-size', type=int, default=COMPACT_CHUNK_SIZE, help='每批删除的记录数')
+        parser.add_argument('--dry-run', action='store_true', help='只统计将要删除的记录数')
+    
+    def handle(self, *args, **options):
+        if options['days'] < 1:
+            raise CommandError('--days 必须大于 0')
+        days, deleted = compact_logs(options['days'], options['chunk_size'], options['dry_run'])
+        if options['dry_run']:
+            self.stdout.write(f'将压缩 {days} 天、{deleted} 条学习记录')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'已压缩 {days} 天、{deleted} 条学习记录'))
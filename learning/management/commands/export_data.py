@@ -0,0 +1,28 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from learning.exporter import CHUNK_SIZE, EXPORT_FORMATS, iter_export, parse_models
+
+
+class Command(BaseCommand):
+    help = '流式导出学习数据为 NDJSON 或 CSV'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=EXPORT_FORMATS, default='ndjson', help='导出格式')
+        parser.add_argument('--models', default='', help='逗号分隔的模型：word,sentence,grammar,studylog,studygoal；默认全部')
+        parser.add_argument('-o', '--output', help='输出文件路径，默认输出到标准输出')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='每次从数据库读取的行数')
+    
+    def handle(self, *args, **options):
+        try:
+            names = parse_models(options['models'])
+            rows = iter_export(options['format'], names, options['chunk_size'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as f:
+                f.writelines(rows)
+        else:
+            sys.stdout.writelines(rows)
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from learning.importer import (
+    DEFAULT_BATCH_SIZE, IMPORT_FORMATS, IMPORT_TYPES, guess_format, import_file
+)
+
+
+class Command(BaseCommand):
+    help = '从 CSV / JSONL 文件批量导入单词、句子或语法'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV 或 JSONL 文件路径')
+        parser.add_argument('--type', required=True, choices=list(IMPORT_TYPES), help='导入的数据类型')
+        parser.add_argument('--format', choices=IMPORT_FORMATS, help='文件格式，默认按扩展名判断')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='每批校验、写入的行数')
+    
+    def handle(self, *args, **options):
+        fmt = options['format'] or guess_format(options['path'])
+        if not fmt:
+            raise CommandError('无法根据扩展名判断文件格式，请使用 --format')
+        
+        with open(options['path'], encoding='utf-8-sig', newline='') as f:
+            result = import_file(options['type'], f, fmt, batch_size=options['batch_size'])
+        
+        for error in result.errors:
+            self.stderr.write(f"第 {error['row']} 行: {error['errors']}")
+        self.stdout.write(self.style.SUCCESS(
+            f'新增 {result.created} 条，跳过重复 {result.skipped} 条，错误 {result.error_count} 条，'
+            f'耗时 {result.elapsed:.2f} 秒（{result.rows_per_second} 行/秒）'
+        ))
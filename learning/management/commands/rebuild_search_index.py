@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from learning.search import SEARCH_FIELDS, rebuild_index
+
+
+class Command(BaseCommand):
+    help = '重建单词、句子、语法的搜索索引'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--kind', action='append', choices=list(SEARCH_FIELDS),
+            help='只重建指定类型，可重复使用；默认全部'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help='每批写入的文档数')
+    
+    def handle(self, *args, **options):
+        total = rebuild_index(options['kind'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'已重建 {total} 个搜索文档'))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from learning.models import Tag, touch_models
+from learning.tags import TAG_FIELDS, rebuild_tags
+
+
+class Command(BaseCommand):
+    help = '根据单词、语法的分类和句子的关键词重建标签关联与计数'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--kind', action='append', choices=list(TAG_FIELDS),
+            help='只重建指定类型，可重复使用；默认全部'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help='每批处理的对象数')
+    
+    def handle(self, *args, **options):
+        kinds = options['kind'] or list(TAG_FIELDS)
+        total = rebuild_tags(kinds, batch_size=options['batch_size'])
+        # 分类列表的 ETag 和缓存依赖对应模型的版本号
+        touch_models(*(TAG_FIELDS[kind][0] for kind in kinds))
+        tags = Tag.objects.filter(kind__in=kinds).count()
+        self.stdout.write(self.style.SUCCESS(f'已重建 {tags} 个标签、{total} 条关联'))
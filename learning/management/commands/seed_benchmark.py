@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from learning.benchmark import SEED_BATCH_SIZE, clear_data, seed
+
+
+class Command(BaseCommand):
+    help = '生成压测用的单词、句子、语法和多年的学习记录'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--words', type=int, default=1000, help='单词数')
+        parser.add_argument('--sentences', type=int, default=1000, help='句子数')
+        parser.add_argument('--grammar', type=int, default=200, help='语法数')
+        parser.add_argument('--logs', type=int, default=10000, help='学习记录数')
+        parser.add_argument('--years', type=int, default=3, help='创建时间和学习记录覆盖的年数')
+        parser.add_argument('--goals', type=int, default=5, help='学习目标数')
+        parser.add_argument('--batch-size', type=int, default=SEED_BATCH_SIZE, help='每批写入的行数')
+        parser.add_argument('--seed', type=int, default=0, help='随机数种子（相同参数生成相同数据）')
+        parser.add_argument('--clear', action='store_true', help='先删除已有的全部学习数据')
+    
+    def handle(self, *args, **options):
+        if options['years'] < 1:
+            raise CommandError('--years 至少为 1')
+        if options['clear']:
+            clear_data()
+            self.stdout.write('已删除已有数据')
+        
+        counts = {
+            'word': options['words'],
+            'sentence': options['sentences'],
+            'grammar': options['grammar'],
+            'log': options['logs'],
+        }
+        started = time.monotonic()
+        try:
+            written = seed(
+                counts, years=options['years'], goals=options['goals'],
+                batch_size=options['batch_size'], rng_seed=options['seed'], progress=self.progress
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        summary = '，'.join(f'{kind} {count}' for kind, count in written.items())
+        self.stdout.write(self.style.SUCCESS(f'已写入 {summary}，耗时 {time.monotonic() - started:.1f} 秒'))
+    
+    def progress(self, kind, done, total):
+        self.stdout.write(f'  {kind}: {done}/{total}', ending='\r' if done < total else '\n')
+        self.stdout.flush()
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-18 05:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudyStreak',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('current_streak', models.IntegerField(default=0, verbose_name='当前连续天数')),
+                ('last_active_date', models.DateField(blank=True, null=True, verbose_name='最后学习日期')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+            ],
+            options={
+                'verbose_name': '连续学习',
+                'verbose_name_plural': '连续学习',
+            },
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 4.2.30 on 2026-10-18 05:24
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0002_studystreak'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='grammar',
+            name='ease_factor',
+            field=models.FloatField(default=2.5, verbose_name='难度系数'),
+        ),
+        migrations.AddField(
+            model_name='grammar',
+            name='interval',
+            field=models.IntegerField(default=0, verbose_name='复习间隔（天）'),
+        ),
+        migrations.AddField(
+            model_name='grammar',
+            name='next_due',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='下次复习时间'),
+        ),
+        migrations.AddField(
+            model_name='grammar',
+            name='repetitions',
+            field=models.IntegerField(default=0, verbose_name='连续记住次数'),
+        ),
+        migrations.AddField(
+            model_name='sentence',
+            name='ease_factor',
+            field=models.FloatField(default=2.5, verbose_name='难度系数'),
+        ),
+        migrations.AddField(
+            model_name='sentence',
+            name='interval',
+            field=models.IntegerField(default=0, verbose_name='复习间隔（天）'),
+        ),
+        migrations.AddField(
+            model_name='sentence',
+            name='next_due',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='下次复习时间'),
+        ),
+        migrations.AddField(
+            model_name='sentence',
+            name='repetitions',
+            field=models.IntegerField(default=0, verbose_name='连续记住次数'),
+        ),
+        migrations.AddField(
+            model_name='word',
+            name='ease_factor',
+            field=models.FloatField(default=2.5, verbose_name='难度系数'),
+        ),
+        migrations.AddField(
+            model_name='word',
+            name='interval',
+            field=models.IntegerField(default=0, verbose_name='复习间隔（天）'),
+        ),
+        migrations.AddField(
+            model_name='word',
+            name='next_due',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='下次复习时间'),
+        ),
+        migrations.AddField(
+            model_name='word',
+            name='repetitions',
+            field=models.IntegerField(default=0, verbose_name='连续记住次数'),
+        ),
+    ]
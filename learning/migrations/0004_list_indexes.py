@@ -0,0 +1,65 @@
+# Generated by Django 4.2.30 on 2026-10-18 05:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0003_review_schedule'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='grammar',
+            index=models.Index(fields=['-created_at'], name='grammar_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grammar',
+            index=models.Index(fields=['difficulty', '-created_at'], name='grammar_difficulty_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grammar',
+            index=models.Index(fields=['is_mastered', '-created_at'], name='grammar_mastered_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grammar',
+            index=models.Index(fields=['category'], name='grammar_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sentence',
+            index=models.Index(fields=['-created_at'], name='sentence_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sentence',
+            index=models.Index(fields=['sentence_type', '-created_at'], name='sentence_type_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sentence',
+            index=models.Index(fields=['is_favorite', '-created_at'], name='sentence_favorite_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studylog',
+            index=models.Index(fields=['-created_at'], name='studylog_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studylog',
+            index=models.Index(fields=['log_type', '-created_at'], name='studylog_type_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='word',
+            index=models.Index(fields=['-created_at'], name='word_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='word',
+            index=models.Index(fields=['difficulty', '-created_at'], name='word_difficulty_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='word',
+            index=models.Index(fields=['is_favorite', '-created_at'], name='word_favorite_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='word',
+            index=models.Index(fields=['category'], name='word_category_idx'),
+        ),
+    ]
@@ -0,0 +1,135 @@
+# Generated by Django 4.2.30 on 2026-10-18 05:27
+
+import re
+
+from django.db import migrations, models
+
+FTS_TABLE = 'learning_search_fts'
+
+SQLITE_FTS_SQL = [
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+    f"title, body, content='learning_searchdocument', content_rowid='id')",
+    f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON learning_searchdocument BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON learning_searchdocument BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); END",
+    f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON learning_searchdocument BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); "
+    f"INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+]
+SQLITE_FTS_DROP_SQL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+POSTGRES_INDEX_SQL = (
+    "CREATE INDEX searchdocument_tsv_idx ON learning_searchdocument USING GIN ("
+    "(setweight(to_tsvector('simple', title), 'A') || setweight(to_tsvector('simple', body), 'B')))"
+)
+POSTGRES_INDEX_DROP_SQL = "DROP INDEX IF EXISTS searchdocument_tsv_idx"
+
+
+def create_fulltext_index(apps, schema_editor):
+    """SQLite 建 FTS5 表，PostgreSQL 建 tsvector 索引；SQLite 未编译 FTS5 时跳过"""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(POSTGRES_INDEX_SQL)
+    elif vendor == 'sqlite':
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+            if not cursor.fetchone()[0]:
+                return
+        for sql in SQLITE_FTS_SQL:
+            schema_editor.execute(sql)
+
+
+def drop_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(POSTGRES_INDEX_DROP_SQL)
+    elif vendor == 'sqlite':
+        for sql in SQLITE_FTS_DROP_SQL:
+            schema_editor.execute(sql)
+
+
+# learning.search 中分词规则的冻结副本：迁移不导入应用代码，以后修改分词不影响已有的迁移
+# （修改分词后用 rebuild_search_index 重建索引）
+WORD_RE = re.compile(r'[a-z0-9]+')
+CJK_RE = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+')
+
+
+def tokenize(text, cjk_unigrams=True):
+    text = (text or '').lower()
+    tokens = WORD_RE.findall(text)
+    for run in CJK_RE.findall(text):
+        if cjk_unigrams or len(run) == 1:
+            tokens.extend(run)
+        tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def build_documents(apps, schema_editor):
+    """为已有的单词、句子、语法生成搜索文档"""
+    SearchDocument = apps.get_model('learning', 'SearchDocument')
+    sources = [
+        ('word', apps.get_model('learning', 'Word'), 'word', ('meaning',)),
+        ('sentence', apps.get_model('learning', 'Sentence'), 'english', ('chinese',)),
+        ('grammar', apps.get_model('learning', 'Grammar'), 'title', ('structure', 'explanation')),
+    ]
+    for kind, model, title_field, body_fields in sources:
+        batch = []
+        for obj in model.objects.only('id', title_field, *body_fields).order_by().iterator(chunk_size=1000):
+            batch.append(SearchDocument(
+                kind=kind,
+                ref_id=obj.pk,
+                title=' '.join(tokenize(getattr(obj, title_field))),
+                body=' '.join(t for field in body_fields for t in tokenize(getattr(obj, field))),
+            ))
+            if len(batch) >= 1000:
+                SearchDocument.objects.bulk_create(batch)
+                batch = []
+        SearchDocument.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0004_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True, verbose_name='名称')),
+                ('version', models.BigIntegerField(default=0, verbose_name='版本号')),
+            ],
+            options={
+                'verbose_name': '数据版本',
+                'verbose_name_plural': '数据版本',
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('word', '单词'), ('sentence', '句子'), ('grammar', '语法')], max_length=10, verbose_name='类型')),
+                ('ref_id', models.BigIntegerField(verbose_name='关联ID')),
+                ('title', models.TextField(blank=True, verbose_name='标题词')),
+                ('body', models.TextField(blank=True, verbose_name='正文词')),
+            ],
+            options={
+                'verbose_name': '搜索文档',
+                'verbose_name_plural': '搜索文档',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='searchdocument',
+            constraint=models.UniqueConstraint(fields=('kind', 'ref_id'), name='searchdocument_kind_ref_unique'),
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+        migrations.RunPython(build_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.30 on 2026-10-18 05:41
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def build_rollups(apps, schema_editor):
+    """按本地日期、类型、操作汇总已有的学习记录"""
+    StudyLog = apps.get_model('learning', 'StudyLog')
+    StudyLogDaily = apps.get_model('learning', 'StudyLogDaily')
+    rows = (
+        StudyLog.objects.annotate(day=TruncDate('created_at'))
+        .values('day', 'log_type', 'action')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    StudyLogDaily.objects.bulk_create(
+        [
+            StudyLogDaily(date=row['day'], log_type=row['log_type'], action=row['action'], count=row['count'])
+            for row in rows.iterator()
+        ],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0005_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudyLogDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='日期')),
+                ('log_type', models.CharField(choices=[('word', '单词'), ('sentence', '句子'), ('grammar', '语法')], max_length=10, verbose_name='学习类型')),
+                ('action', models.CharField(max_length=50, verbose_name='操作')),
+                ('count', models.IntegerField(default=0, verbose_name='次数')),
+            ],
+            options={
+                'verbose_name': '每日学习汇总',
+                'verbose_name_plural': '每日学习汇总',
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='studylogdaily',
+            constraint=models.UniqueConstraint(fields=('date', 'log_type', 'action'), name='studylogdaily_day_unique'),
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:22
+
+import re
+from collections import Counter
+
+from django.db import migrations, models
+
+# learning.tags 中规范化规则的冻结副本：迁移不导入应用代码，以后修改规则不影响已有的迁移
+SEPARATOR_RE = re.compile(r'[,，;；、]')
+NAME_MAX_LENGTH = 200
+
+
+def tag_names(value, multiple=False):
+    parts = SEPARATOR_RE.split(value or '') if multiple else [value or '']
+    return list(dict.fromkeys(
+        part.strip()[:NAME_MAX_LENGTH] for part in parts if part.strip()
+    ))
+
+
+def build_tags(apps, schema_editor):
+    """根据已有的分类、关键词建立标签、关联和计数"""
+    Tag = apps.get_model('learning', 'Tag')
+    sources = [
+        ('word', apps.get_model('learning', 'Word'), 'category', False),
+        ('sentence', apps.get_model('learning', 'Sentence'), 'keywords', True),
+        ('grammar', apps.get_model('learning', 'Grammar'), 'category', False),
+    ]
+    for kind, model, field, multiple in sources:
+        tags_field = model._meta.get_field('tags')
+        through = tags_field.remote_field.through
+        column = f'{tags_field.m2m_field_name()}_id'
+        names = {
+            pk: tag_names(value, multiple)
+            for pk, value in model.objects.order_by().values_list('id', field).iterator(chunk_size=1000)
+        }
+        counts = Counter(name for values in names.values() for name in values)
+        Tag.objects.bulk_create(
+            [Tag(kind=kind, name=name, count=count) for name, count in counts.items()], batch_size=1000
+        )
+        ids = dict(Tag.objects.filter(kind=kind).values_list('name', 'id'))
+        through.objects.bulk_create(
+            [through(**{column: pk, 'tag_id': ids[name]}) for pk, values in names.items() for name in values],
+            batch_size=1000
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0006_study_log_daily'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('word', '单词'), ('sentence', '句子'), ('grammar', '语法')], max_length=10, verbose_name='类型')),
+                ('name', models.CharField(max_length=200, verbose_name='名称')),
+                ('count', models.IntegerField(default=0, verbose_name='条数')),
+            ],
+            options={
+                'verbose_name': '标签',
+                'verbose_name_plural': '标签',
+                'ordering': ['kind', 'name'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='tag',
+            constraint=models.UniqueConstraint(fields=('kind', 'name'), name='tag_kind_name_unique'),
+        ),
+        migrations.AddField(
+            model_name='grammar',
+            name='tags',
+            field=models.ManyToManyField(blank=True, related_name='+', to='learning.tag', verbose_name='分类标签'),
+        ),
+        migrations.AddField(
+            model_name='sentence',
+            name='tags',
+            field=models.ManyToManyField(blank=True, related_name='+', to='learning.tag', verbose_name='关键词标签'),
+        ),
+        migrations.AddField(
+            model_name='word',
+            name='tags',
+            field=models.ManyToManyField(blank=True, related_name='+', to='learning.tag', verbose_name='分类标签'),
+        ),
+        migrations.RunPython(build_tags, migrations.RunPython.noop),
+    ]
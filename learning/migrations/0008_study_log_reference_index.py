@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0007_tags'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studylog',
+            index=models.Index(fields=['log_type', 'reference_id'], name='studylog_type_ref_idx'),
+        ),
+    ]
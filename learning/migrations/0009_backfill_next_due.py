@@ -0,0 +1,62 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:10
+
+from datetime import timedelta
+
+from django.db import migrations
+from django.db.models import F
+
+# learning.scheduler 中 SM-2 规则的冻结副本：迁移不导入应用代码
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+MAX_INTERVAL = 36500
+# 以前的复习没有记录评分，按 good 重放
+REPLAY_GRADE = 4
+
+
+def replay_schedule(review_count):
+    """按 good 连续复习 review_count 次后的 (ease_factor, interval, repetitions)"""
+    ease_factor, interval, repetitions = DEFAULT_EASE, 0, 0
+    for _ in range(review_count):
+        if repetitions == 0:
+            interval = 1
+        elif repetitions == 1:
+            interval = 6
+        else:
+            interval = min(MAX_INTERVAL, max(1, round(interval * ease_factor)))
+        repetitions += 1
+        miss = 5 - REPLAY_GRADE
+        ease_factor = max(MIN_EASE, ease_factor + 0.1 - miss * (0.08 + miss * 0.02))
+    return round(ease_factor, 2), interval, repetitions
+
+
+def backfill_next_due(apps, schema_editor):
+    """0003 给已有对象的 next_due 都填了迁移时刻，所有对象同时到期
+
+    还没有经过调度的对象（interval 为 0）：复习过的按复习次数重放 SM-2，
+    下次复习时间为最后复习时间加上间隔；没有复习过的从创建时间起到期（先加入的先复习）。
+    """
+    for name in ('Word', 'Sentence', 'Grammar'):
+        model = apps.get_model('learning', name)
+        pending = model.objects.filter(interval=0)
+        reviewed = pending.filter(review_count__gt=0, last_reviewed__isnull=False)
+        counts = reviewed.order_by().values_list('review_count', flat=True).distinct()
+        for review_count in list(counts):
+            ease_factor, interval, repetitions = replay_schedule(review_count)
+            reviewed.filter(review_count=review_count).update(
+                ease_factor=ease_factor,
+                interval=interval,
+                repetitions=repetitions,
+                next_due=F('last_reviewed') + timedelta(days=interval),
+            )
+        pending.filter(last_reviewed__isnull=True).update(next_due=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0008_study_log_reference_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_next_due, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,82 @@
-from django.db import models
+from django.db import connections, models, transaction
+from django.dispatch import Signal
 from django.utils import timezone
 
+from .scheduler import DEFAULT_EASE, DEFAULT_GRADE, apply_review
+
+# 数据变更信号，参数 labels 为变更的模型标签列表（如 ['learning.word']）
+data_changed = Signal()
+
+
+def record_review(obj, grade):
+    """记录一次复习
+
+    在事务中先用 ``review_count + 1`` 原子递增复习次数：这条 UPDATE 锁住该行
+    （SQLite 不支持 FOR UPDATE，由它取得写锁），并发复习同一对象的请求在此排队；
+    再读取当前的调度字段计算并写回。不会丢失更新，也不会因为冲突而失败。
+
+    调度公式只在 scheduler.py 中实现一份（批量提交复习也使用），不改写成 SQL 表达式：
+    SQL 的 ROUND 与 Python 的 round 对 .5 的处理不同，日期加减在各数据库上的写法也不同。
+    """
+    manager = type(obj)._default_manager
+    schedule_fields = ['ease_factor', 'interval', 'repetitions', 'next_due']
+    now = timezone.now()
+    with transaction.atomic():
+        manager.filter(pk=obj.pk).update(
+            review_count=models.F('review_count') + 1,
+            last_reviewed=now,
+            updated_at=now
+        )
+        current = manager.select_for_update().values(*schedule_fields, 'review_count').get(pk=obj.pk)
+        for field, value in current.items():
+            setattr(obj, field, value)
+        apply_review(obj, grade, now)
+        manager.filter(pk=obj.pk).update(**{field: getattr(obj, field) for field in schedule_fields})
+    obj.last_reviewed = now
+    obj.updated_at = now
+    touch_models(type(obj))
+
+
+def toggle_flag(model, pk, field):
+    """用一条 ``SET field = NOT field`` 切换布尔字段，返回新值；对象不存在时返回 None"""
+    if not model.objects.filter(pk=pk).update(**{field: ~models.F(field), 'updated_at': timezone.now()}):
+        return None
+    touch_models(model)
+    return model.objects.filter(pk=pk).values_list(field, flat=True).first()
+
+
+def touch_models(*model_classes):
+    """记录数据变更：递增模型的数据版本号（条件请求的 ETag 据此计算），
+    并发送 data_changed 信号（响应缓存据此失效）
+
+    save / delete 由信号处理，update()、bulk_create 等不触发信号的写入需要手动调用。
+    """
+    labels = [model._meta.label_lower for model in model_classes]
+    DataVersion.bump(*labels)
+    data_changed.send(sender=DataVersion, labels=labels)
+
+
+def delete_rows(model, values, column='id', **equals):
+    """直接执行 ``DELETE FROM 表 WHERE column IN (values) [AND 字段 = 值 ...]``，返回删除的行数
+
+    批量删除、压缩学习记录时使用：QuerySet.delete() 要先取出对象、逐行发送
+    pre_delete / post_delete 信号（搜索索引、标签计数、连续天数等处理器每行都要执行多条 SQL），
+    这些数据由调用方按批统一维护。不处理级联，也不递增数据版本号（调用方调用 touch_models）。
+    """
+    values = list(values)
+    if not values:
+        return 0
+    connection = connections[model.objects.db]
+    quote = connection.ops.quote_name
+    conditions = [f'{quote(column)} IN ({", ".join(["%s"] * len(values))})']
+    params = values
+    for field, value in equals.items():
+        conditions.append(f'{quote(field)} = %s')
+        params.append(value)
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {quote(model._meta.db_table)} WHERE {" AND ".join(conditions)}', params)
+        return cursor.rowcount
+
 
 class Word(models.Model):
     """单词模型"""
@@ -18,9 +94,14 @@ class Word(models.Model):
     example_translation = models.TextField(blank=True, verbose_name='例句翻译')
     difficulty = models.CharField(max_length=10, choices=DIFFICULTY_CHOICES, default='medium', verbose_name='难度')
     category = models.CharField(max_length=100, blank=True, verbose_name='分类')
+    tags = models.ManyToManyField('Tag', blank=True, related_name='+', verbose_name='分类标签')
     notes = models.TextField(blank=True, verbose_name='备注')
     review_count = models.IntegerField(default=0, verbose_name='复习次数')
     last_reviewed = models.DateTimeField(null=True, blank=True, verbose_name='最后复习时间')
+    ease_factor = models.FloatField(default=DEFAULT_EASE, verbose_name='难度系数')
+    interval = models.IntegerField(default=0, verbose_name='复习间隔（天）')
+    repetitions = models.IntegerField(default=0, verbose_name='连续记住次数')
+    next_due = models.DateTimeField(default=timezone.now, db_index=True, verbose_name='下次复习时间')
     is_favorite = models.BooleanField(default=False, verbose_name='收藏')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
@@ -29,15 +110,19 @@ class Word(models.Model):
         verbose_name = '单词'
         verbose_name_plural = '单词'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='word_created_idx'),
+            models.Index(fields=['difficulty', '-created_at'], name='word_difficulty_created_idx'),
+            models.Index(fields=['is_favorite', '-created_at'], name='word_favorite_created_idx'),
+            models.Index(fields=['category'], name='word_category_idx'),
+        ]
     
     def __str__(self):
         return self.word
     
-    def review(self):
-        """记录复习"""
-        self.review_count += 1
-        self.last_reviewed = timezone.now()
-        self.save()
+    def review(self, grade=DEFAULT_GRADE):
+        """记录复习，并按评分安排下次复习"""
+        record_review(self, grade)
 
 
 class Sentence(models.Model):
@@ -55,11 +140,16 @@ class Sentence(models.Model):
     chinese = models.TextField(verbose_name='中文翻译')
     sentence_type = models.CharField(max_length=20, choices=SENTENCE_TYPES, default='daily', verbose_name='类型')
     keywords = models.CharField(max_length=200, blank=True, verbose_name='关键词')
+    tags = models.ManyToManyField('Tag', blank=True, related_name='+', verbose_name='关键词标签')
     grammar_points = models.TextField(blank=True, verbose_name='语法要点')
     notes = models.TextField(blank=True, verbose_name='备注')
     is_favorite = models.BooleanField(default=False, verbose_name='收藏')
     review_count = models.IntegerField(default=0, verbose_name='复习次数')
     last_reviewed = models.DateTimeField(null=True, blank=True, verbose_name='最后复习时间')
+    ease_factor = models.FloatField(default=DEFAULT_EASE, verbose_name='难度系数')
+    interval = models.IntegerField(default=0, verbose_name='复习间隔（天）')
+    repetitions = models.IntegerField(default=0, verbose_name='连续记住次数')
+    next_due = models.DateTimeField(default=timezone.now, db_index=True, verbose_name='下次复习时间')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
     
@@ -67,15 +157,18 @@ class Sentence(models.Model):
         verbose_name = '句子'
         verbose_name_plural = '句子'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='sentence_created_idx'),
+            models.Index(fields=['sentence_type', '-created_at'], name='sentence_type_created_idx'),
+            models.Index(fields=['is_favorite', '-created_at'], name='sentence_favorite_created_idx'),
+        ]
     
     def __str__(self):
         return self.english[:50]
     
-    def review(self):
-        """记录复习"""
-        self.review_count += 1
-        self.last_reviewed = timezone.now()
-        self.save()
+    def review(self, grade=DEFAULT_GRADE):
+        """记录复习，并按评分安排下次复习"""
+        record_review(self, grade)
 
 
 class Grammar(models.Model):
@@ -93,11 +186,16 @@ class Grammar(models.Model):
     examples = models.JSONField(default=list, verbose_name='例句列表')
     difficulty = models.CharField(max_length=15, choices=DIFFICULTY_CHOICES, default='intermediate', verbose_name='难度')
     category = models.CharField(max_length=100, verbose_name='语法分类')
+    tags = models.ManyToManyField('Tag', blank=True, related_name='+', verbose_name='分类标签')
     common_mistakes = models.TextField(blank=True, verbose_name='常见错误')
     tips = models.TextField(blank=True, verbose_name='学习技巧')
     is_mastered = models.BooleanField(default=False, verbose_name='已掌握')
     review_count = models.IntegerField(default=0, verbose_name='复习次数')
     last_reviewed = models.DateTimeField(null=True, blank=True, verbose_name='最后复习时间')
+    ease_factor = models.FloatField(default=DEFAULT_EASE, verbose_name='难度系数')
+    interval = models.IntegerField(default=0, verbose_name='复习间隔（天）')
+    repetitions = models.IntegerField(default=0, verbose_name='连续记住次数')
+    next_due = models.DateTimeField(default=timezone.now, db_index=True, verbose_name='下次复习时间')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
     
@@ -105,15 +203,19 @@ class Grammar(models.Model):
         verbose_name = '语法'
         verbose_name_plural = '语法'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='grammar_created_idx'),
+            models.Index(fields=['difficulty', '-created_at'], name='grammar_difficulty_created_idx'),
+            models.Index(fields=['is_mastered', '-created_at'], name='grammar_mastered_created_idx'),
+            models.Index(fields=['category'], name='grammar_category_idx'),
+        ]
     
     def __str__(self):
         return self.title
     
-    def review(self):
-        """记录复习"""
-        self.review_count += 1
-        self.last_reviewed = timezone.now()
-        self.save()
+    def review(self, grade=DEFAULT_GRADE):
+        """记录复习，并按评分安排下次复习"""
+        record_review(self, grade)
 
 
 class StudyLog(models.Model):
@@ -134,6 +236,11 @@ class StudyLog(models.Model):
         verbose_name = '学习记录'
         verbose_name_plural = '学习记录'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='studylog_created_idx'),
+            models.Index(fields=['log_type', '-created_at'], name='studylog_type_created_idx'),
+            models.Index(fields=['log_type', 'reference_id'], name='studylog_type_ref_idx'),
+        ]
     
     def __str__(self):
         return f"{self.get_log_type_display()} - {self.action}"
@@ -158,3 +265,118 @@ class StudyGoal(models.Model):
     
     def __str__(self):
         return self.title
+
+
+class StudyStreak(models.Model):
+    """连续学习天数缓存
+
+    只保存一行，在写入学习记录时增量更新，仪表盘直接读取，无需扫描学习记录。
+    """
+    current_streak = models.IntegerField(default=0, verbose_name='当前连续天数')
+    last_active_date = models.DateField(null=True, blank=True, verbose_name='最后学习日期')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
+    
+    class Meta:
+        verbose_name = '连续学习'
+        verbose_name_plural = '连续学习'
+    
+    def __str__(self):
+        return f"{self.current_streak} 天"
+
+
+class StudyLogDaily(models.Model):
+    """学习记录每日汇总
+
+    每个本地日期、类型、操作一行，写入学习记录时增量累加。统计和连续学习天数
+    读取汇总表，开销只与天数有关；旧的原始记录可以压缩（删除）而不影响历史统计。
+    """
+    date = models.DateField(verbose_name='日期')
+    log_type = models.CharField(max_length=10, choices=StudyLog.LOG_TYPES, verbose_name='学习类型')
+    action = models.CharField(max_length=50, verbose_name='操作')
+    count = models.IntegerField(default=0, verbose_name='次数')
+    
+    class Meta:
+        verbose_name = '每日学习汇总'
+        verbose_name_plural = '每日学习汇总'
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'log_type', 'action'], name='studylogdaily_day_unique'),
+        ]
+    
+    def __str__(self):
+        return f"{self.date} {self.get_log_type_display()} - {self.action}: {self.count}"
+
+
+class DataVersion(models.Model):
+    """数据版本号
+
+    每类数据一行，写入时递增。多个 worker 进程据此判断各自的内存索引、缓存是否过期。
+    """
+    name = models.CharField(max_length=50, unique=True, verbose_name='名称')
+    version = models.BigIntegerField(default=0, verbose_name='版本号')
+    
+    class Meta:
+        verbose_name = '数据版本'
+        verbose_name_plural = '数据版本'
+    
+    def __str__(self):
+        return f"{self.name}: {self.version}"
+    
+    @classmethod
+    def bump(cls, *names):
+        """递增版本号"""
+        for name in names:
+            if not cls.objects.filter(name=name).update(version=models.F('version') + 1):
+                obj, created = cls.objects.get_or_create(name=name, defaults={'version': 1})
+                if not created:
+                    cls.objects.filter(name=name).update(version=models.F('version') + 1)
+    
+    @classmethod
+    def current(cls, *names):
+        """一次查询读取多个版本号，不存在的记为 0"""
+        versions = dict(cls.objects.filter(name__in=names).values_list('name', 'version'))
+        return {name: versions.get(name, 0) for name in names}
+
+
+class SearchDocument(models.Model):
+    """搜索索引文档
+
+    保存预先分词后的文本（英文单词 + 中文单字/双字），由信号在保存、删除时维护。
+    SQLite 上由 FTS5 表、PostgreSQL 上由 tsvector 表达式索引提供全文检索。
+    """
+    kind = models.CharField(max_length=10, choices=StudyLog.LOG_TYPES, verbose_name='类型')
+    ref_id = models.BigIntegerField(verbose_name='关联ID')
+    title = models.TextField(blank=True, verbose_name='标题词')
+    body = models.TextField(blank=True, verbose_name='正文词')
+    
+    class Meta:
+        verbose_name = '搜索文档'
+        verbose_name_plural = '搜索文档'
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'ref_id'], name='searchdocument_kind_ref_unique'),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind}:{self.ref_id}"
+
+
+class Tag(models.Model):
+    """分类 / 关键词
+
+    单词分类、语法分类和句子关键词规范化后的取值，每个类型、名称一行，通过多对多
+    关联到对象。count 为关联的条数，保存、删除对象时增量更新，分类列表直接读取。
+    """
+    kind = models.CharField(max_length=10, choices=StudyLog.LOG_TYPES, verbose_name='类型')
+    name = models.CharField(max_length=200, verbose_name='名称')
+    count = models.IntegerField(default=0, verbose_name='条数')
+    
+    class Meta:
+        verbose_name = '标签'
+        verbose_name_plural = '标签'
+        ordering = ['kind', 'name']
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'name'], name='tag_kind_name_unique'),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.name} ({self.count})"
@@ -0,0 +1,139 @@
+"""
+列表分页
+
+默认仍是页码分页（兼容现有前端），另外支持：
+
+- ``?page_size=``：客户端指定每页条数（最多 100）
+- ``?count=false``：页码分页时跳过 COUNT(*)，多取一行判断是否有下一页
+- ``?paginate=cursor`` 或带上 ``?cursor=``：按 (created_at, id) 的游标分页，
+  每页都是一次索引范围扫描，翻到多深都不会变慢；默认不返回总数，
+  需要时加 ``?count=true``
+"""
+import base64
+from collections import OrderedDict
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _flag(value, default):
+    if value in (None, ''):
+        return default
+    return value.lower() not in ('false', '0', 'no')
+
+
+class LearningPagination(PageNumberPagination):
+    """页码分页 + 可选的 (created_at, id) 游标分页"""
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    mode_query_param = 'paginate'
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        params = request.query_params
+        self.cursor_mode = params.get(self.mode_query_param) == 'cursor' or self.cursor_query_param in params
+        self.count = None
+
+        if self.cursor_mode:
+            if _flag(params.get(self.count_query_param), False):
+                self.count = queryset.count()
+            return self._paginate_cursor(queryset, params.get(self.cursor_query_param))
+
+        if not _flag(params.get(self.count_query_param), True):
+            return self._paginate_without_count(queryset, params.get(self.page_query_param))
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode and not hasattr(self, 'has_next'):
+            return super().get_paginated_response(data)
+        items = []
+        if self.count is not None:
+            items.append(('count', self.count))
+        items += [
+            ('next', self.next_link),
+            ('previous', self.previous_link),
+            ('results', data),
+        ]
+        return Response(OrderedDict(items))
+
+    # 页码分页，不计算总数
+
+    def _paginate_without_count(self, queryset, page):
+        try:
+            number = int(page or 1)
+        except ValueError:
+            raise NotFound('Invalid page.')
+        if number < 1:
+            raise NotFound('Invalid page.')
+
+        offset = (number - 1) * self.page_size
+        rows = list(queryset[offset:offset + self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        url = self.request.build_absolute_uri()
+        self.next_link = replace_query_param(url, self.page_query_param, number + 1) if self.has_next else None
+        if number == 1:
+            self.previous_link = None
+        elif number == 2:
+            self.previous_link = remove_query_param(url, self.page_query_param)
+        else:
+            self.previous_link = replace_query_param(url, self.page_query_param, number - 1)
+        return rows[:self.page_size]
+
+    # 游标分页
+
+    @staticmethod
+    def encode_cursor(direction, obj):
+        # obj 可以是模型对象，也可以是 values_list(named=True) 的行
+        raw = f'{direction}|{obj.created_at.isoformat()}|{obj.id}'
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """返回 (方向, created_at, id)，格式错误时抛出 NotFound"""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+            direction, created_at, pk = raw.split('|')
+            if direction not in ('n', 'p'):
+                raise ValueError(direction)
+            return direction, datetime.fromisoformat(created_at), int(pk)
+        except (ValueError, UnicodeDecodeError):
+            raise NotFound('Invalid cursor.')
+
+    def _cursor_link(self, direction, obj):
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(direction, obj))
+
+    def _paginate_cursor(self, queryset, cursor):
+        direction, created_at, pk = self.decode_cursor(cursor) if cursor else ('n', None, None)
+
+        if direction == 'n':
+            queryset = queryset.order_by('-created_at', '-id')
+            if cursor:
+                queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+        else:
+            queryset = queryset.order_by('created_at', 'id').filter(
+                Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+            )
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if direction == 'p':
+            rows.reverse()
+
+        has_next = has_more if direction == 'n' else bool(cursor)
+        has_previous = bool(cursor) if direction == 'n' else has_more
+        self.next_link = self._cursor_link('n', rows[-1]) if rows and has_next else None
+        self.previous_link = self._cursor_link('p', rows[0]) if rows and has_previous else None
+        return rows
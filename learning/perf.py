@@ -0,0 +1,252 @@
+"""
+请求性能统计
+
+``PerformanceMiddleware`` 记录每个请求的 SQL 条数、数据库耗时、渲染耗时和总耗时：
+
+- 通过 ``Server-Timing`` 响应头返回，浏览器开发者工具里可以直接看到
+  （``PERF_SERVER_TIMING=False`` 时不输出）
+- 按 URL 名称（如 ``word-list``、``dashboard``）保存最近的样本，计算 p50 / p95 / p99，
+  管理员可以在 ``/api/_perf/`` 查看
+
+SQL 统计通过数据库连接的 execute_wrapper 完成，当前请求保存在 contextvar 中，
+异步视图在线程池里执行的查询也会计入。
+
+默认只统计本进程；``PERF_SHARED=True`` 时各进程定期把样本写入 Django 缓存
+（file / db 后端可跨 worker 共享），``/api/_perf/`` 合并所有进程的样本。
+"""
+import contextvars
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'learning:perf'
+PERCENTILES = (50, 95, 99)
+# 样本字段
+METRICS = ('total', 'db', 'queries', 'render')
+
+_current = contextvars.ContextVar('learning_perf_request', default=None)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+class RequestMetrics:
+    """单个请求的计时"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_started = None
+        self.render_time = 0.0
+        self._lock = threading.Lock()
+
+    def add_query(self, duration):
+        with self._lock:
+            self.queries += 1
+            self.db_time += duration
+
+    def start_render(self):
+        self.render_started = time.perf_counter()
+
+    def finish_render(self, response):
+        if self.render_started is not None:
+            self.render_time = time.perf_counter() - self.render_started
+        return response
+
+    def server_timing(self, total):
+        app = max(0.0, total - self.db_time - self.render_time)
+        return ', '.join([
+            f'total;dur={total * 1000:.2f}',
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries"',
+            f'render;dur={self.render_time * 1000:.2f}',
+            f'app;dur={app * 1000:.2f}',
+        ])
+
+
+def _record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.add_query(time.perf_counter() - start)
+
+
+def install_query_wrapper(connection, **kwargs):
+    """为数据库连接安装计时 wrapper（每个连接对象只安装一次）"""
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+class PerfStore:
+    """按 URL 名称保存最近的样本"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = defaultdict(self._new_buffer)
+        self._last_flush = 0.0
+
+    @staticmethod
+    def _new_buffer():
+        return deque(maxlen=_setting('PERF_SAMPLES', 1000))
+
+    def add(self, name, sample):
+        with self._lock:
+            self._samples[name].append(sample)
+        if _setting('PERF_SHARED', False):
+            self._flush_if_due()
+
+    def snapshot(self):
+        with self._lock:
+            return {name: list(samples) for name, samples in self._samples.items()}
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+    # 跨进程共享
+
+    @property
+    def cache(self):
+        return caches[_setting('PERF_CACHE_ALIAS', 'default')]
+
+    def _flush_if_due(self):
+        interval = _setting('PERF_FLUSH_INTERVAL', 10)
+        now = time.monotonic()
+        if now - self._last_flush < interval:
+            return
+        self._last_flush = now
+        try:
+            pid = os.getpid()
+            # 进程退出后样本在几个刷新周期后过期
+            self.cache.set(f'{KEY_PREFIX}:worker:{pid}', self.snapshot(), interval * 6)
+            workers = self.cache.get(f'{KEY_PREFIX}:workers') or []
+            if pid not in workers:
+                self.cache.set(f'{KEY_PREFIX}:workers', (workers + [pid])[-64:], None)
+        except Exception as e:
+            logger.error(f"Error in PerfStore flush: {str(e)}")
+
+    def shared_snapshot(self):
+        """合并所有进程最近一次写入的样本（本进程使用实时数据），返回 (样本, 进程数)"""
+        merged = defaultdict(list)
+        pid = os.getpid()
+        workers = [pid]
+        for name, samples in self.snapshot().items():
+            merged[name].extend(samples)
+        others = [worker for worker in self.cache.get(f'{KEY_PREFIX}:workers') or [] if worker != pid]
+        keys = {f'{KEY_PREFIX}:worker:{worker}': worker for worker in others}
+        for key, snapshot in self.cache.get_many(list(keys)).items():
+            workers.append(keys[key])
+            for name, samples in snapshot.items():
+                merged[name].extend(samples)
+        return merged, len(workers)
+
+    # 汇总
+
+    @staticmethod
+    def percentiles(values):
+        values = sorted(values)
+        result = {}
+        for p in PERCENTILES:
+            index = max(0, min(len(values) - 1, -(-len(values) * p // 100) - 1))
+            result[f'p{p}'] = round(values[index], 2)
+        return result
+
+    def summary(self, shared=False):
+        if shared:
+            samples, workers = self.shared_snapshot()
+        else:
+            samples, workers = self.snapshot(), 1
+        endpoints = {}
+        for name, rows in sorted(samples.items()):
+            if not rows:
+                continue
+            columns = list(zip(*rows))
+            endpoints[name] = dict(
+                count=len(rows),
+                **{metric: self.percentiles(values) for metric, values in zip(METRICS, columns)}
+            )
+        return {
+            'scope': 'shared' if shared else 'process',
+            'workers': workers,
+            'unit': 'ms',
+            'endpoints': endpoints,
+        }
+
+
+perf_store = PerfStore()
+
+
+class PerformanceMiddleware:
+    """记录请求耗时，输出 Server-Timing 响应头并按 URL 名称汇总"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        connection_created.connect(install_query_wrapper)
+
+    def _start(self, request):
+        # 已经建立的连接不会再触发 connection_created
+        for connection in connections.all(initialized_only=True):
+            install_query_wrapper(connection)
+        metrics = RequestMetrics()
+        request._perf_metrics = metrics
+        return metrics, _current.set(metrics)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics, token = self._start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics, token = self._start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, metrics)
+
+    def process_template_response(self, request, response):
+        """DRF 的 Response 在这之后渲染，记录渲染耗时"""
+        metrics = getattr(request, '_perf_metrics', None)
+        if metrics is not None:
+            metrics.start_render()
+            response.add_post_render_callback(metrics.finish_render)
+        return response
+
+    def _finish(self, request, response, metrics):
+        total = time.perf_counter() - metrics.started
+        if _setting('PERF_SERVER_TIMING', True):
+            response['Server-Timing'] = metrics.server_timing(total)
+        match = getattr(request, 'resolver_match', None)
+        if match is not None and match.view_name:
+            perf_store.add(match.view_name, (
+                round(total * 1000, 3),
+                round(metrics.db_time * 1000, 3),
+                metrics.queries,
+                round(metrics.render_time * 1000, 3),
+            ))
+        return response
@@ -0,0 +1,65 @@
+"""
+自定义渲染器
+
+导出接口通过 ``?format=ndjson|csv`` 选择格式，DRF 会按 format 协商渲染器，
+因此这里为这两种格式注册渲染器。导出视图直接返回流式响应，渲染器只在普通
+Response（如错误信息）时使用。
+
+``FastJSONRenderer`` 是默认的 JSON 渲染器：响应标记了 ``json_native``（只包含字符串、
+整数、布尔值和 None，见 ``learning/fastlist.py``）并且安装了 orjson 时用 orjson 编码，
+结果与 DRF 的 JSONRenderer 逐字节相同；其他响应仍由 JSONRenderer 编码。
+"""
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """可选使用 orjson 的 JSONRenderer"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        response = (renderer_context or {}).get('response')
+        if (
+            orjson is None or data is None or not settings.FAST_JSON_ENCODER
+            or not getattr(response, 'json_native', False)
+            # orjson 只支持紧凑、不转义非 ASCII 字符的输出
+            or self.ensure_ascii or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # 与 JSONRenderer 一样转义 U+2028 / U+2029
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+class NDJSONRenderer(BaseRenderer):
+    """每行一个 JSON 对象"""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data if isinstance(data, list) else [data]
+        return ''.join(
+            json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n' for row in rows
+        ).encode(self.charset)
+
+
+class CSVRenderer(BaseRenderer):
+    """CSV 导出出错时的普通响应，渲染为 JSON 文本"""
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False).encode(self.charset)
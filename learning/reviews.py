@@ -0,0 +1,106 @@
+"""
+批量提交复习结果
+
+一次复习会话的结果整体提交：每种类型一次查询取出调度字段，在内存中按 SM-2
+计算新的间隔，然后在同一个事务中用 bulk_update 写调度字段、用
+``F('review_count') + 1`` 原子递增复习次数，并一次 bulk_create 所有学习记录。
+
+同一项目在一次提交中只能出现一次（重复时整批拒绝）：否则调度会按两次复习计算，
+而返回的 reviewed 只计一个项目。
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Word, Sentence, Grammar, StudyLog, touch_models
+from .rollups import record_daily_logs
+from .scheduler import parse_grade, apply_review
+from .stats import record_study_activity
+
+# 类型 -> (模型, 标题字段, 学习记录动作, 备注模板)
+REVIEW_TYPES = {
+    'word': (Word, 'word', '复习单词', '复习了单词: {}'),
+    'sentence': (Sentence, 'english', '复习句子', '复习了句子: {:.30}...'),
+    'grammar': (Grammar, 'title', '复习语法', '复习了语法: {}'),
+}
+SCHEDULE_FIELDS = ['ease_factor', 'interval', 'repetitions', 'next_due']
+MAX_RESULTS = 500
+
+
+def parse_results(results):
+    """校验提交内容，返回 [(类型, ID, 评分)]，不合法时抛出 ValueError"""
+    if not isinstance(results, list) or not results:
+        raise ValueError('results 必须是非空列表')
+    if len(results) > MAX_RESULTS:
+        raise ValueError(f'一次最多提交 {MAX_RESULTS} 条')
+    parsed = []
+    seen = {}
+    for index, item in enumerate(results):
+        if not isinstance(item, dict) or item.get('type') not in REVIEW_TYPES:
+            raise ValueError(f'第 {index + 1} 条: type 只能是 {", ".join(REVIEW_TYPES)}')
+        try:
+            entry = (item['type'], int(item['id']), parse_grade(item.get('grade')))
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f'第 {index + 1} 条: {e}')
+        key = entry[:2]
+        if key in seen:
+            raise ValueError(f'第 {index + 1} 条: 与第 {seen[key] + 1} 条重复')
+        seen[key] = index
+        parsed.append(entry)
+    return parsed
+
+
+def submit_reviews(parsed, now=None):
+    """应用一批复习结果（每个项目至多一条，见 parse_results），返回 (已更新的项目, 不存在的项目)"""
+    now = now or timezone.now()
+    by_type = defaultdict(list)
+    for kind, pk, grade in parsed:
+        by_type[kind].append((pk, grade))
+
+    updated = []
+    missing = []
+    logs = []
+    with transaction.atomic():
+        for kind, entries in by_type.items():
+            model, title_field, action, notes = REVIEW_TYPES[kind]
+            objects = model.objects.select_for_update().only('id', title_field, *SCHEDULE_FIELDS).in_bulk(
+                {pk for pk, _ in entries}
+            )
+            reviewed = []
+            for pk, grade in entries:
+                obj = objects.get(pk)
+                if obj is None:
+                    missing.append({'type': kind, 'id': pk})
+                    continue
+                apply_review(obj, grade, now)
+                reviewed.append(obj)
+                logs.append(StudyLog(
+                    log_type=kind,
+                    reference_id=pk,
+                    action=action,
+                    notes=notes.format(getattr(obj, title_field))
+                ))
+            if not reviewed:
+                continue
+
+            model.objects.bulk_update(reviewed, SCHEDULE_FIELDS)
+            model.objects.filter(pk__in=[obj.pk for obj in reviewed]).update(
+                review_count=F('review_count') + 1,
+                last_reviewed=now,
+                updated_at=now
+            )
+            touch_models(model)
+            updated.extend(
+                {'type': kind, 'id': obj.pk, 'interval': obj.interval, 'next_due': obj.next_due}
+                for obj in reviewed
+            )
+
+        if logs:
+            StudyLog.objects.bulk_create(logs)
+            # bulk_create 不触发信号，手动更新每日汇总、连续学习天数和数据版本号
+            record_daily_logs(logs)
+            record_study_activity(now)
+            touch_models(StudyLog)
+    return updated, missing
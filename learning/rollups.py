@@ -0,0 +1,114 @@
+"""
+学习记录每日汇总（StudyLogDaily）
+
+- 新增学习记录时按 (本地日期, 类型, 操作) 增量累加，批量写入路径手动调用
+  ``record_daily_logs``
+- 汇总表记录的是“发生过的学习活动”，删除原始记录不会减少汇总次数
+- ``rollup_day`` 用某一天的原始记录校正汇总（取较大值），用于回填和压缩：
+  重复执行、中途失败后重跑都不会重复计数
+- ``compact_logs`` 把 N 天前的原始记录并入汇总后分批删除
+"""
+from collections import Counter
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import StudyLog, StudyLogDaily, delete_rows, touch_models
+from .stats import local_day_range
+
+COMPACT_CHUNK_SIZE = 1000
+
+
+def add_daily_count(day, log_type, action, count=1):
+    """累加一个汇总行，不存在时创建"""
+    rows = StudyLogDaily.objects.filter(date=day, log_type=log_type, action=action)
+    if rows.update(count=F('count') + count):
+        return
+    try:
+        with transaction.atomic():
+            StudyLogDaily.objects.create(date=day, log_type=log_type, action=action, count=count)
+    except IntegrityError:
+        # 另一个进程刚刚创建了这一行
+        rows.update(count=F('count') + count)
+
+
+def record_daily_logs(logs):
+    """把新增的学习记录计入每日汇总，同一汇总行合并为一条 UPDATE"""
+    counts = Counter(
+        (timezone.localdate(log.created_at), log.log_type, log.action) for log in logs
+    )
+    for (day, log_type, action), count in counts.items():
+        add_daily_count(day, log_type, action, count)
+
+
+def raw_log_dates(before=None):
+    """有原始学习记录的本地日期（正序），before 为不包含的截止日期"""
+    queryset = StudyLog.objects.all()
+    if before:
+        start, _ = local_day_range(before)
+        queryset = queryset.filter(created_at__lt=start)
+    return list(
+        queryset.annotate(day=TruncDate('created_at'))
+        .values_list('day', flat=True)
+        .distinct()
+        .order_by('day')
+    )
+
+
+def rollup_day(day):
+    """用某一天的原始记录校正汇总，汇总次数少于原始记录数时补齐；返回原始记录数"""
+    start, end = local_day_range(day)
+    rows = (
+        StudyLog.objects.filter(created_at__gte=start, created_at__lt=end)
+        .values('log_type', 'action')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    total = 0
+    for row in rows:
+        total += row['count']
+        obj, created = StudyLogDaily.objects.get_or_create(
+            date=day, log_type=row['log_type'], action=row['action'],
+            defaults={'count': row['count']}
+        )
+        if not created:
+            StudyLogDaily.objects.filter(pk=obj.pk, count__lt=row['count']).update(count=row['count'])
+    return total
+
+
+def backfill(since=None):
+    """为所有（或 since 之后）有原始记录的日期校正汇总，返回 (天数, 记录数)"""
+    days = [day for day in raw_log_dates() if since is None or day >= since]
+    total = sum(rollup_day(day) for day in days)
+    return len(days), total
+
+
+def compact_logs(keep_days, chunk_size=COMPACT_CHUNK_SIZE, dry_run=False):
+    """把 keep_days 天之前的原始记录并入汇总后删除，返回 (天数, 删除的记录数)
+
+    逐天处理：先校正当天的汇总，再按主键分批删除，每批一个短事务。用 ``delete_rows``
+    直接删除、不发送模型信号（压缩不应重置连续天数缓存、逐行发送信号也太慢）。
+    """
+    cutoff = timezone.localdate() - timedelta(days=keep_days)
+    days = raw_log_dates(before=cutoff)
+    deleted = 0
+    for day in days:
+        if dry_run:
+            start, end = local_day_range(day)
+            deleted += StudyLog.objects.filter(created_at__gte=start, created_at__lt=end).count()
+            continue
+        rollup_day(day)
+        start, end = local_day_range(day)
+        logs = StudyLog.objects.filter(created_at__gte=start, created_at__lt=end).order_by('pk')
+        while True:
+            ids = list(logs.values_list('pk', flat=True)[:chunk_size])
+            if not ids:
+                break
+            with transaction.atomic():
+                deleted += delete_rows(StudyLog, ids)
+    if deleted and not dry_run:
+        touch_models(StudyLog)
+    return len(days), deleted
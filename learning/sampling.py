@@ -0,0 +1,55 @@
+"""
+随机抽样
+
+不再把整张表的 ID 读进内存。先取 ID 的上下界，再随机生成 ID 做主键范围探测
+（``id >= r ORDER BY id LIMIT 1``），每次探测都走主键索引，
+总开销只与抽样数量有关，与表大小无关。
+
+探测到已抽中的 ID 时取其后第一个未抽中的 ID（到末尾后从头开始），
+因此总能返回 min(数量, 匹配行数) 个 ID，稀疏或带筛选的查询集也不会少取。
+
+ID 有空洞时，紧跟在大空洞之后的行被抽中的概率略高，对闪卡场景足够。
+"""
+import random
+
+from django.db.models import Max, Min
+
+MAX_SAMPLE = 50
+
+
+def make_rng(seed=None):
+    """有 seed 时返回可复现的随机数生成器"""
+    return random.Random(seed) if seed not in (None, '') else random.Random()
+
+
+def sample_ids(queryset, count, rng):
+    """从查询集中随机抽取最多 count 个不重复的 ID"""
+    bounds = queryset.order_by().aggregate(lo=Min('id'), hi=Max('id'))
+    lo, hi = bounds['lo'], bounds['hi']
+    if lo is None:
+        return []
+
+    # ID 区间很小时直接取出区间内的全部 ID
+    if hi - lo + 1 <= count * 2:
+        ids = list(queryset.order_by('id').values_list('id', flat=True))
+        return rng.sample(ids, min(count, len(ids)))
+
+    ids = []
+    while len(ids) < count:
+        candidates = queryset.exclude(id__in=ids).order_by('id').values_list('id', flat=True)
+        pk = candidates.filter(id__gte=rng.randint(lo, hi)).first()
+        if pk is None:
+            # 探测点之后没有未抽中的 ID，从头开始
+            pk = candidates.first()
+        if pk is None:
+            # 匹配的行已全部抽中
+            break
+        ids.append(pk)
+    return ids
+
+
+def sample_objects(queryset, count, rng):
+    """随机抽取对象，按抽样顺序返回"""
+    ids = sample_ids(queryset, count, rng)
+    objects = queryset.model.objects.in_bulk(ids)
+    return [objects[pk] for pk in ids if pk in objects]
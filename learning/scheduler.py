@@ -0,0 +1,60 @@
+"""
+间隔重复调度（SM-2）
+
+每个复习对象保存难度系数 ease_factor、复习间隔 interval（天）、连续答对次数
+repetitions 以及下次复习时间 next_due。复习队列按 next_due 走索引范围扫描。
+"""
+from datetime import timedelta
+
+# 评分 0-5，也可以使用以下名称
+GRADE_NAMES = {
+    'again': 1,
+    'hard': 3,
+    'good': 4,
+    'easy': 5,
+}
+DEFAULT_GRADE = GRADE_NAMES['good']
+PASSING_GRADE = 3
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+# 间隔上限（天），避免长期答对后 next_due 超出日期范围
+MAX_INTERVAL = 36500
+
+
+def parse_grade(value):
+    """解析评分，未提供时按 good 处理，不合法时抛出 ValueError"""
+    if value is None or value == '':
+        return DEFAULT_GRADE
+    if isinstance(value, str) and value.lower() in GRADE_NAMES:
+        return GRADE_NAMES[value.lower()]
+    grade = int(value)
+    if not 0 <= grade <= 5:
+        raise ValueError('grade 必须在 0-5 之间')
+    return grade
+
+
+def next_schedule(ease_factor, interval, repetitions, grade, now):
+    """根据本次评分计算新的 (ease_factor, interval, repetitions, next_due)"""
+    if grade < PASSING_GRADE:
+        repetitions = 0
+        interval = 1
+    else:
+        if repetitions == 0:
+            interval = 1
+        elif repetitions == 1:
+            interval = 6
+        else:
+            interval = min(MAX_INTERVAL, max(1, round(interval * ease_factor)))
+        repetitions += 1
+
+    miss = 5 - grade
+    ease_factor = max(MIN_EASE, ease_factor + 0.1 - miss * (0.08 + miss * 0.02))
+    return round(ease_factor, 2), interval, repetitions, now + timedelta(days=interval)
+
+
+def apply_review(item, grade, now):
+    """把评分结果写到复习对象上（不保存）"""
+    item.ease_factor, item.interval, item.repetitions, item.next_due = next_schedule(
+        item.ease_factor, item.interval, item.repetitions, grade, now
+    )
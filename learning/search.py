@@ -0,0 +1,333 @@
+"""
+全文搜索
+
+英文按单词切分，中文按单字 + 相邻双字切分，分词结果存入 SearchDocument。
+检索后端按数据库自动选择：
+
+- SQLite：FTS5 外部内容表 ``learning_search_fts``，按 bm25 排序
+- PostgreSQL：tsvector 表达式上的 GIN 索引，按 ts_rank 排序
+- 其他情况：进程内倒排索引，按 DataVersion 判断是否需要重建
+"""
+import bisect
+import math
+import re
+import threading
+from collections import defaultdict
+
+from django.db import connection
+from django.db.models import Case, IntegerField, When
+
+from .models import Word, Sentence, Grammar, DataVersion, SearchDocument
+
+WORD_RE = re.compile(r'[a-z0-9]+')
+CJK_RE = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+')
+
+# 类型 -> (模型, 标题字段, 正文字段)
+SEARCH_FIELDS = {
+    'word': (Word, 'word', ('meaning',)),
+    'sentence': (Sentence, 'english', ('chinese',)),
+    'grammar': (Grammar, 'title', ('structure', 'explanation')),
+}
+MODEL_KINDS = {model: kind for kind, (model, _, _) in SEARCH_FIELDS.items()}
+
+# 标题命中的权重
+TITLE_WEIGHT = 5.0
+# 前缀查询最多展开的词数（进程内索引）
+PREFIX_EXPANSIONS = 50
+# 进程内索引用于列表筛选时最多取的匹配数：每个 id 占 3 个 SQL 参数（IN 1 个、排序 When 2 个），
+# 不超过 SQLite 旧版本的 999 个参数限制
+PYTHON_MAX_RESULTS = 300
+
+SEARCH_VERSION = 'search'
+FTS_TABLE = 'learning_search_fts'
+# 列名带表名：filter_ranked 连接的 learning_grammar 也有 title 列
+PG_VECTOR = (
+    "(setweight(to_tsvector('simple', learning_searchdocument.title), 'A') || "
+    "setweight(to_tsvector('simple', learning_searchdocument.body), 'B'))"
+)
+
+
+def tokenize(text, cjk_unigrams=True):
+    """切分文本：英文小写单词，中文单字与相邻双字"""
+    text = (text or '').lower()
+    tokens = WORD_RE.findall(text)
+    for run in CJK_RE.findall(text):
+        if cjk_unigrams or len(run) == 1:
+            tokens.extend(run)
+        tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def parse_query(query):
+    """把查询切成检索词，返回 (词列表, 最后一个词是否按前缀匹配)
+
+    中文只用双字（单字查询除外），末尾的英文词按前缀匹配以支持边输边搜。
+    """
+    terms = list(dict.fromkeys(tokenize(query, cjk_unigrams=False)))
+    prefix = bool(terms) and bool(WORD_RE.fullmatch(terms[-1])) and not query[-1:].isspace()
+    return terms, prefix
+
+
+def build_document(kind, obj):
+    """根据对象生成索引文本 (title, body)"""
+    _, title_field, body_fields = SEARCH_FIELDS[kind]
+    title = ' '.join(tokenize(getattr(obj, title_field)))
+    body = ' '.join(
+        token for field in body_fields for token in tokenize(getattr(obj, field))
+    )
+    return title, body
+
+
+def index_object(obj):
+    """新增或更新对象的索引文档"""
+    kind = MODEL_KINDS[type(obj)]
+    title, body = build_document(kind, obj)
+    SearchDocument.objects.update_or_create(
+        kind=kind, ref_id=obj.pk, defaults={'title': title, 'body': body}
+    )
+    DataVersion.bump(SEARCH_VERSION)
+
+
+def index_objects(kind, objects):
+    """批量写入新对象的索引文档（bulk_create 不会触发信号时使用）"""
+    documents = []
+    for obj in objects:
+        title, body = build_document(kind, obj)
+        documents.append(SearchDocument(kind=kind, ref_id=obj.pk, title=title, body=body))
+    SearchDocument.objects.bulk_create(documents)
+    DataVersion.bump(SEARCH_VERSION)
+
+
+def remove_object(obj):
+    """删除对象的索引文档"""
+    SearchDocument.objects.filter(kind=MODEL_KINDS[type(obj)], ref_id=obj.pk).delete()
+    DataVersion.bump(SEARCH_VERSION)
+
+
+def remove_objects(kind, pks):
+    """批量删除对象的索引文档（绕过信号批量删除对象时使用）"""
+    SearchDocument.objects.filter(kind=kind, ref_id__in=list(pks)).delete()
+    DataVersion.bump(SEARCH_VERSION)
+
+
+def rebuild_index(kinds=None, batch_size=1000):
+    """重建索引文档，返回写入的文档数"""
+    total = 0
+    for kind in kinds or SEARCH_FIELDS:
+        model, title_field, body_fields = SEARCH_FIELDS[kind]
+        SearchDocument.objects.filter(kind=kind).delete()
+        batch = []
+        for obj in model.objects.only('id', title_field, *body_fields).order_by().iterator(chunk_size=batch_size):
+            title, body = build_document(kind, obj)
+            batch.append(SearchDocument(kind=kind, ref_id=obj.pk, title=title, body=body))
+            if len(batch) >= batch_size:
+                SearchDocument.objects.bulk_create(batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            SearchDocument.objects.bulk_create(batch)
+            total += len(batch)
+    DataVersion.bump(SEARCH_VERSION)
+    return total
+
+
+class SqliteSearchBackend:
+    """SQLite FTS5 后端"""
+
+    @staticmethod
+    def match_query(terms, prefix):
+        match = ' '.join(f'"{term}"' for term in terms)
+        return match + '*' if prefix else match
+
+    def search(self, kind, terms, prefix, limit):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT d.ref_id FROM {FTS_TABLE} '
+                f'JOIN learning_searchdocument d ON d.id = {FTS_TABLE}.rowid '
+                f'WHERE {FTS_TABLE} MATCH %s AND d.kind = %s '
+                f'ORDER BY bm25({FTS_TABLE}, {TITLE_WEIGHT}, 1.0) LIMIT %s',
+                [self.match_query(terms, prefix), kind, limit]
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def filter_ranked(self, queryset, kind, terms, prefix):
+        table = queryset.model._meta.db_table
+        return queryset.extra(
+            tables=['learning_searchdocument', FTS_TABLE],
+            where=[
+                f'{FTS_TABLE} MATCH %s',
+                # "+" 使 rowid 条件不能用于 FTS 表，由 MATCH 驱动连接（否则可能逐行重复执行 MATCH）
+                f'+{FTS_TABLE}.rowid = learning_searchdocument.id',
+                'learning_searchdocument.kind = %s',
+                f'learning_searchdocument.ref_id = {table}.id',
+            ],
+            params=[self.match_query(terms, prefix), kind],
+            select={'search_rank': f'bm25({FTS_TABLE}, {TITLE_WEIGHT}, 1.0)'},
+        ).order_by('search_rank', '-pk')
+
+
+class PostgresSearchBackend:
+    """PostgreSQL tsvector 后端"""
+
+    @staticmethod
+    def ts_query(terms, prefix):
+        lexemes = ["'" + term.replace("'", "''") + "'" for term in terms]
+        if prefix:
+            lexemes[-1] += ':*'
+        return ' & '.join(lexemes)
+
+    def search(self, kind, terms, prefix, limit):
+        tsquery = self.ts_query(terms, prefix)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT ref_id FROM learning_searchdocument "
+                f"WHERE kind = %s AND {PG_VECTOR} @@ to_tsquery('simple', %s) "
+                f"ORDER BY ts_rank({PG_VECTOR}, to_tsquery('simple', %s)) DESC LIMIT %s",
+                [kind, tsquery, tsquery, limit]
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def filter_ranked(self, queryset, kind, terms, prefix):
+        table = queryset.model._meta.db_table
+        return queryset.extra(
+            tables=['learning_searchdocument'],
+            where=[
+                f"{PG_VECTOR} @@ to_tsquery('simple', %s)",
+                'learning_searchdocument.kind = %s',
+                f'learning_searchdocument.ref_id = {table}.id',
+            ],
+            params=[self.ts_query(terms, prefix), kind],
+            select={'search_rank': f"ts_rank({PG_VECTOR}, to_tsquery('simple', %s))"},
+            select_params=[self.ts_query(terms, prefix)],
+        ).order_by('-search_rank', '-pk')
+
+
+class PythonSearchBackend:
+    """进程内倒排索引后端
+
+    首次查询时从 SearchDocument 构建，DataVersion 变化后整体重建。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._postings = {}
+        self._terms = []
+        self._doc_count = 0
+
+    def _ensure_current(self):
+        version = DataVersion.current(SEARCH_VERSION)[SEARCH_VERSION]
+        if version == self._version:
+            return
+        with self._lock:
+            if version == self._version:
+                return
+            postings = defaultdict(lambda: defaultdict(float))
+            doc_count = 0
+            for kind, ref_id, title, body in SearchDocument.objects.values_list(
+                'kind', 'ref_id', 'title', 'body'
+            ).iterator():
+                doc_count += 1
+                for term in title.split():
+                    postings[term][(kind, ref_id)] += TITLE_WEIGHT
+                for term in body.split():
+                    postings[term][(kind, ref_id)] += 1.0
+            self._postings = {term: dict(docs) for term, docs in postings.items()}
+            self._terms = sorted(self._postings)
+            self._doc_count = doc_count
+            self._version = version
+
+    def _term_scores(self, term, prefix):
+        """单个检索词命中的文档及得分（tf * idf）"""
+        if prefix:
+            start = bisect.bisect_left(self._terms, term)
+            matched = []
+            for candidate in self._terms[start:start + PREFIX_EXPANSIONS]:
+                if not candidate.startswith(term):
+                    break
+                matched.append(candidate)
+        else:
+            matched = [term] if term in self._postings else []
+        scores = defaultdict(float)
+        for candidate in matched:
+            docs = self._postings[candidate]
+            idf = math.log(1 + self._doc_count / len(docs))
+            for key, weight in docs.items():
+                scores[key] += weight * idf
+        return scores
+
+    def search(self, kind, terms, prefix, limit):
+        self._ensure_current()
+        total = None
+        for i, term in enumerate(terms):
+            scores = self._term_scores(term, prefix and i == len(terms) - 1)
+            if total is None:
+                total = {key: score for key, score in scores.items() if key[0] == kind}
+            else:
+                total = {key: score + scores[key] for key, score in total.items() if key in scores}
+            if not total:
+                return []
+        ranked = sorted(total.items(), key=lambda item: (-item[1], -item[0][1]))
+        return [key[1] for key, _ in ranked[:limit]]
+
+    def filter_ranked(self, queryset, kind, terms, prefix):
+        # 进程内索引只能给出 id 列表（用于开发环境和没有 FTS5 的 SQLite），只取相关度最高的部分
+        ids = self.search(kind, terms, prefix, PYTHON_MAX_RESULTS)
+        if not ids:
+            return queryset.none()
+        ranking = Case(
+            *[When(pk=pk, then=position) for position, pk in enumerate(ids)],
+            output_field=IntegerField()
+        )
+        return queryset.filter(pk__in=ids).order_by(ranking)
+
+
+_backend = None
+
+
+def fts_available():
+    """当前 SQLite 数据库是否已建好 FTS5 表"""
+    return FTS_TABLE in connection.introspection.table_names()
+
+
+def get_backend():
+    """按数据库类型选择检索后端（每个进程只判断一次）"""
+    global _backend
+    if _backend is None:
+        if connection.vendor == 'postgresql':
+            _backend = PostgresSearchBackend()
+        elif connection.vendor == 'sqlite' and fts_available():
+            _backend = SqliteSearchBackend()
+        else:
+            _backend = PythonSearchBackend()
+    return _backend
+
+
+def search_ids(kind, query, limit=10):
+    """按相关度返回匹配对象的 ID 列表"""
+    terms, prefix = parse_query(query)
+    if not terms:
+        return []
+    return get_backend().search(kind, terms, prefix, limit)
+
+
+def search_objects(kind, query, limit=10, queryset=None):
+    """按相关度返回匹配对象列表"""
+    ids = search_ids(kind, query, limit)
+    if queryset is None:
+        queryset = SEARCH_FIELDS[kind][0].objects.all()
+    objects = queryset.in_bulk(ids)
+    return [objects[pk] for pk in ids if pk in objects]
+
+
+def filter_ranked(queryset, kind, query):
+    """把查询集限制为搜索结果，并按相关度排序
+
+    SQLite FTS5 / PostgreSQL 上匹配和排序都在同一条 SQL 中完成（不预先截断），
+    之后追加的筛选条件、计数和分页都作用于全部匹配结果；进程内索引后端只取
+    相关度最高的 PYTHON_MAX_RESULTS 条。
+    """
+    terms, prefix = parse_query(query)
+    if not terms:
+        return queryset.none()
+    return get_backend().filter_ranked(queryset, kind, terms, prefix)
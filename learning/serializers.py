@@ -6,8 +6,8 @@ class WordSerializer(serializers.ModelSerializer):
     """单词序列化器"""
     class Meta:
         model = Word
-        fields = '__all__'
-        read_only_fields = ['created_at', 'updated_at', 'review_count']
+        exclude = ['tags']
+        read_only_fields = ['created_at', 'updated_at', 'review_count', 'ease_factor', 'interval', 'repetitions', 'next_due']
 
 
 class WordListSerializer(serializers.ModelSerializer):
@@ -23,8 +23,8 @@ class SentenceSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Sentence
-        fields = '__all__'
-        read_only_fields = ['created_at', 'updated_at', 'review_count']
+        exclude = ['tags']
+        read_only_fields = ['created_at', 'updated_at', 'review_count', 'ease_factor', 'interval', 'repetitions', 'next_due']
 
 
 class SentenceListSerializer(serializers.ModelSerializer):
@@ -40,8 +40,8 @@ class GrammarSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Grammar
-        fields = '__all__'
-        read_only_fields = ['created_at', 'updated_at', 'review_count']
+        exclude = ['tags']
+        read_only_fields = ['created_at', 'updated_at', 'review_count', 'ease_factor', 'interval', 'repetitions', 'next_due']
 
 
 class GrammarListSerializer(serializers.ModelSerializer):
@@ -109,3 +109,4 @@ class ReviewItemSerializer(serializers.Serializer):
     content = serializers.CharField()
     last_reviewed = serializers.DateTimeField()
     review_count = serializers.IntegerField()
+    next_due = serializers.DateTimeField()
@@ -0,0 +1,99 @@
+"""
+learning 应用的信号处理
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from .bulk import purge_logs
+from .cache import response_cache
+from .models import (
+    Word, Sentence, Grammar, StudyLog, StudyGoal, DataVersion,
+    data_changed, touch_models
+)
+from .rollups import record_daily_logs
+from .search import index_object, remove_object
+from .stats import record_study_activity
+from .tags import MODEL_KINDS, TAG_FIELDS, tag_objects, untag_objects
+from .suggest import WORD_VERSION, suggest_index
+
+
+@receiver(post_save, sender=StudyLog)
+def update_streak_on_log(sender, instance, created, **kwargs):
+    """新增学习记录时累加每日汇总，并增量更新连续学习天数（依赖汇总，须在其后）"""
+    if created:
+        record_daily_logs([instance])
+        record_study_activity(instance.created_at)
+
+
+@receiver(post_save, sender=Word)
+@receiver(post_save, sender=Sentence)
+@receiver(post_save, sender=Grammar)
+def update_search_document(sender, instance, **kwargs):
+    """保存后更新搜索索引"""
+    index_object(instance)
+
+
+@receiver(post_delete, sender=Word)
+@receiver(post_delete, sender=Sentence)
+@receiver(post_delete, sender=Grammar)
+def delete_search_document(sender, instance, **kwargs):
+    """删除后移除搜索索引"""
+    remove_object(instance)
+
+
+@receiver(post_save, sender=Word)
+@receiver(post_save, sender=Sentence)
+@receiver(post_save, sender=Grammar)
+def sync_tags(sender, instance, created, update_fields=None, **kwargs):
+    """保存后按分类 / 关键词同步标签关联和计数（只更新其他字段时跳过）"""
+    kind = MODEL_KINDS[sender]
+    if update_fields is not None and TAG_FIELDS[kind][1] not in update_fields:
+        return
+    tag_objects(kind, [instance], created=created)
+
+
+@receiver(pre_delete, sender=Word)
+@receiver(pre_delete, sender=Sentence)
+@receiver(pre_delete, sender=Grammar)
+def release_tags(sender, instance, **kwargs):
+    """删除前扣减标签计数"""
+    untag_objects(MODEL_KINDS[sender], [instance.pk])
+
+
+@receiver(post_delete, sender=Word)
+@receiver(post_delete, sender=Sentence)
+@receiver(post_delete, sender=Grammar)
+def delete_study_logs(sender, instance, **kwargs):
+    """删除后清理对象的学习记录（每日汇总保留）"""
+    if purge_logs(MODEL_KINDS[sender], [instance.pk]):
+        touch_models(StudyLog)
+
+
+@receiver(post_save, sender=Word)
+@receiver(post_delete, sender=Word)
+def bump_word_version(sender, instance, **kwargs):
+    """单词变更后递增版本号，让各进程的联想索引失效"""
+    DataVersion.bump(WORD_VERSION)
+    suggest_index.invalidate()
+
+
+@receiver(post_save, sender=Word)
+@receiver(post_save, sender=Sentence)
+@receiver(post_save, sender=Grammar)
+@receiver(post_save, sender=StudyLog)
+@receiver(post_save, sender=StudyGoal)
+@receiver(post_delete, sender=Word)
+@receiver(post_delete, sender=Sentence)
+@receiver(post_delete, sender=Grammar)
+@receiver(post_delete, sender=StudyLog)
+@receiver(post_delete, sender=StudyGoal)
+def touch_model_version(sender, instance, **kwargs):
+    """数据变更后递增模型版本号，让条件请求的 ETag 失效"""
+    touch_models(sender)
+
+
+@receiver(data_changed)
+def invalidate_response_cache(sender, labels, **kwargs):
+    """数据变更后让依赖的接口缓存失效（事务提交后执行，避免缓存未提交前的旧数据）"""
+    transaction.on_commit(lambda: response_cache.invalidate(labels))
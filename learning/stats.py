@@ -0,0 +1,325 @@
+"""
+统计聚合工具
+
+仪表盘、统计页共用的聚合查询，尽量用条件聚合把多个计数合并成一条 SQL。
+"""
+from datetime import date, datetime, time, timedelta
+
+from django.db.models import Count, DateField, F, Q, Sum
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+from .models import Word, Sentence, Grammar, StudyLog, StudyLogDaily, StudyStreak
+
+# 重新计算连续天数时最多回看的天数
+STREAK_LOOKBACK_DAYS = 365
+
+# StudyStreak 只保存一行
+STREAK_PK = 1
+
+# 时间序列支持的分桶粒度与最大窗口
+SERIES_BUCKETS = ('day', 'week', 'month')
+SERIES_DEFAULT_DAYS = 7
+SERIES_MAX_DAYS = 366 * 5
+
+
+def local_day_range(date):
+    """返回某个本地日期对应的 [开始, 结束) 时间区间
+
+    用区间过滤代替 ``created_at__date``，避免对列做时区转换，可以走索引。
+    """
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(date, time.min), tz)
+    end = timezone.make_aware(datetime.combine(date + timedelta(days=1), time.min), tz)
+    return start, end
+
+
+def _today():
+    start, end = local_day_range(timezone.localdate())
+    return Q(created_at__gte=start, created_at__lt=end)
+
+
+def word_counters():
+    """单词的总数、今日新增、收藏数（一条条件聚合查询）"""
+    words = Word.objects.aggregate(
+        total=Count('id'),
+        today=Count('id', filter=_today()),
+        favorite=Count('id', filter=Q(is_favorite=True)),
+    )
+    return {
+        'total_words': words['total'],
+        'today_words': words['today'],
+        'favorite_words': words['favorite'],
+    }
+
+
+def sentence_counters():
+    """句子的总数、今日新增、收藏数（一条条件聚合查询）"""
+    sentences = Sentence.objects.aggregate(
+        total=Count('id'),
+        today=Count('id', filter=_today()),
+        favorite=Count('id', filter=Q(is_favorite=True)),
+    )
+    return {
+        'total_sentences': sentences['total'],
+        'today_sentences': sentences['today'],
+        'favorite_sentences': sentences['favorite'],
+    }
+
+
+def grammar_counters():
+    """语法的总数、今日新增、已掌握数（一条条件聚合查询）"""
+    grammar = Grammar.objects.aggregate(
+        total=Count('id'),
+        today=Count('id', filter=_today()),
+        mastered=Count('id', filter=Q(is_mastered=True)),
+    )
+    return {
+        'total_grammar': grammar['total'],
+        'today_grammar': grammar['today'],
+        'mastered_grammar': grammar['mastered'],
+    }
+
+
+# 仪表盘计数，各项相互独立，异步视图可以并发执行
+DASHBOARD_COUNTERS = (word_counters, sentence_counters, grammar_counters)
+
+
+def dashboard_counters():
+    """用条件聚合计算仪表盘计数，每个模型一条查询"""
+    data = {}
+    for counters in DASHBOARD_COUNTERS:
+        data.update(counters())
+    return data
+
+
+def recent_activities(limit=10):
+    """最近的学习活动"""
+    logs = StudyLog.objects.only('log_type', 'action', 'created_at')[:limit]
+    return [
+        {
+            'type': log.log_type,
+            'action': log.action,
+            'time': log.created_at.strftime('%Y-%m-%d %H:%M')
+        }
+        for log in logs
+    ]
+
+
+def activity_dates(since):
+    """从每日汇总中一次查询取出 since 之后有学习记录的所有本地日期（倒序）"""
+    return list(
+        StudyLogDaily.objects.filter(date__gte=since)
+        .values_list('date', flat=True)
+        .distinct()
+        .order_by('-date')
+    )
+
+
+def count_streak(dates, end_date):
+    """在内存中计算截止到 end_date 的连续天数，dates 须为倒序"""
+    streak = 0
+    expected = end_date
+    for day in dates:
+        if day > expected:
+            continue
+        if day != expected:
+            break
+        streak += 1
+        expected -= timedelta(days=1)
+    return streak
+
+
+def rebuild_study_streak():
+    """扫描学习记录重建连续天数缓存
+
+    先 UPDATE，没有这一行时再 INSERT（主键冲突时忽略），都是单条语句；
+    首条学习记录由多个请求同时写入时不会出现 SQLite 的锁升级冲突。
+    """
+    today = timezone.localdate()
+    dates = activity_dates(today - timedelta(days=STREAK_LOOKBACK_DAYS - 1))
+    last_active = dates[0] if dates else None
+    streak = StudyStreak(
+        pk=STREAK_PK,
+        current_streak=count_streak(dates, last_active) if last_active else 0,
+        last_active_date=last_active,
+        updated_at=timezone.now()
+    )
+    if not StudyStreak.objects.filter(pk=STREAK_PK).update(
+        current_streak=streak.current_streak, last_active_date=last_active, updated_at=streak.updated_at
+    ):
+        StudyStreak.objects.bulk_create([streak], ignore_conflicts=True)
+    return streak
+
+
+def record_study_activity(when=None):
+    """记录某一时刻有学习活动，增量更新连续天数缓存
+
+    每一步都是单条条件 UPDATE，不在事务里先读后写，多个 worker 同时写入时
+    不会出现 SQLite 的锁升级冲突。
+    """
+    day = timezone.localdate(when)
+    streak = StudyStreak.objects.filter(pk=STREAK_PK)
+    current = streak.filter(last_active_date__gte=day).values_list('last_active_date', 'current_streak').first()
+    if current:
+        # 今天已经记录过，或是早于最后学习日期的补录记录：补在当前连续区间的前一天时
+        # 区间变长（还可能与更早的区间相连），按每日汇总重建；其他日期不影响连续天数
+        last_active, count = current
+        if day == last_active - timedelta(days=count):
+            rebuild_study_streak()
+        return
+    if streak.filter(last_active_date=day - timedelta(days=1)).update(
+        current_streak=F('current_streak') + 1, last_active_date=day, updated_at=timezone.now()
+    ):
+        return
+    if streak.filter(Q(last_active_date__lt=day) | Q(last_active_date__isnull=True)).update(
+        current_streak=1, last_active_date=day, updated_at=timezone.now()
+    ):
+        return
+    if not streak.exists():
+        rebuild_study_streak()
+
+
+def get_study_streak():
+    """读取连续学习天数，今天没有学习记录时为 0"""
+    streak = StudyStreak.objects.filter(pk=STREAK_PK).first() or rebuild_study_streak()
+    if streak.last_active_date == timezone.localdate():
+        return streak.current_streak
+    return 0
+
+
+def _parse_date(params, key):
+    try:
+        return date.fromisoformat(params[key])
+    except ValueError:
+        raise ValueError(f'{key} 必须是 YYYY-MM-DD 格式的日期')
+
+
+def parse_series_window(params):
+    """解析时间序列参数 ``days`` / ``from`` / ``to`` / ``bucket``
+
+    参数不合法时抛出 ValueError。
+    """
+    bucket = params.get('bucket', 'day') or 'day'
+    if bucket not in SERIES_BUCKETS:
+        raise ValueError(f'bucket 只能是 {", ".join(SERIES_BUCKETS)}')
+    
+    date_to = _parse_date(params, 'to') if params.get('to') else timezone.localdate()
+    if params.get('from'):
+        date_from = _parse_date(params, 'from')
+    else:
+        try:
+            days = int(params.get('days') or SERIES_DEFAULT_DAYS)
+        except ValueError:
+            raise ValueError('days 必须是整数')
+        if days < 1:
+            raise ValueError('days 必须大于 0')
+        date_from = date_to - timedelta(days=days - 1)
+    
+    if date_from > date_to:
+        raise ValueError('from 不能晚于 to')
+    if (date_to - date_from).days + 1 > SERIES_MAX_DAYS:
+        raise ValueError(f'时间窗口不能超过 {SERIES_MAX_DAYS} 天')
+    return date_from, date_to, bucket
+
+
+def bucket_start(day, bucket):
+    """day 所在分桶的起始日期（周从周一开始）"""
+    if bucket == 'week':
+        return day - timedelta(days=day.weekday())
+    if bucket == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(day, bucket):
+    """下一个分桶的起始日期"""
+    if bucket == 'week':
+        return day + timedelta(days=7)
+    if bucket == 'month':
+        return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return day + timedelta(days=1)
+
+
+def created_time_series(date_from, date_to, bucket='day'):
+    """按创建时间分桶统计单词、句子、语法数量，以及学习活动次数
+
+    每个模型一条 GROUP BY 查询，学习活动读取每日汇总表，空缺的分桶在内存中补 0。
+    """
+    start, _ = local_day_range(date_from)
+    _, end = local_day_range(date_to)
+    
+    counts = {}
+    for key, model in (('words', Word), ('sentences', Sentence), ('grammar', Grammar)):
+        rows = (
+            model.objects.filter(created_at__gte=start, created_at__lt=end)
+            .annotate(bucket=Trunc('created_at', bucket, output_field=DateField()))
+            .values('bucket')
+            .annotate(count=Count('id'))
+            .order_by()
+        )
+        counts[key] = {row['bucket']: row['count'] for row in rows}
+    
+    counts['activities'] = {}
+    daily = (
+        StudyLogDaily.objects.filter(date__gte=date_from, date__lte=date_to)
+        .values('date')
+        .annotate(count=Sum('count'))
+        .order_by()
+    )
+    for row in daily:
+        day = bucket_start(row['date'], bucket)
+        counts['activities'][day] = counts['activities'].get(day, 0) + row['count']
+    
+    points = []
+    day = bucket_start(date_from, bucket)
+    while day <= date_to:
+        points.append({
+            'date': day,
+            'words': counts['words'].get(day, 0),
+            'sentences': counts['sentences'].get(day, 0),
+            'grammar': counts['grammar'].get(day, 0),
+            'activities': counts['activities'].get(day, 0)
+        })
+        day = next_bucket(day, bucket)
+    return points
+
+
+def distribution(model, field):
+    """按某个字段分组计数"""
+    return list(model.objects.values(field).annotate(count=Count('id')))
+
+
+# 统计页的分布图：键 -> (模型, 分组字段)
+DISTRIBUTIONS = {
+    'word_by_difficulty': (Word, 'difficulty'),
+    'sentence_by_type': (Sentence, 'sentence_type'),
+    'grammar_by_difficulty': (Grammar, 'difficulty'),
+}
+
+
+def last_7_days():
+    """最近 7 天的每日新增与学习活动，日期格式为 ``MM-DD``"""
+    today = timezone.localdate()
+    return [
+        dict(point, date=point['date'].strftime('%m-%d'))
+        for point in created_time_series(today - timedelta(days=6), today)
+    ]
+
+
+def time_series(date_from, date_to, bucket):
+    """统计接口的自定义时间序列"""
+    return {
+        'bucket': bucket,
+        'from': date_from.isoformat(),
+        'to': date_to.isoformat(),
+        'points': [
+            dict(point, date=point['date'].isoformat())
+            for point in created_time_series(date_from, date_to, bucket)
+        ]
+    }
+
+
+def wants_time_series(params):
+    """是否请求了自定义时间窗口（?days= 或 ?from=&to=，可选 ?bucket=）"""
+    return any(params.get(key) for key in ('days', 'from', 'to', 'bucket'))
@@ -0,0 +1,145 @@
+"""
+单词联想（前缀补全）
+
+每个进程在内存中保存一份按字典序排好的 (关键字, 单词ID) 列表，关键字包括
+单词本身和中文释义的各个义项，用二分查找做前缀匹配，热路径不访问数据库。
+
+单词写入时递增 DataVersion('word')。本进程的写入会立即让索引失效，其他 worker
+最多每 VERSION_CHECK_INTERVAL 秒查询一次版本号，发现变化后重建。已知过期（等待
+后台重建）时不再查询版本号。
+
+重建（读取全部单词）在后台线程中进行，期间查询继续使用旧索引；只有进程中还没有
+索引时（第一次查询）才在请求中同步构建。
+"""
+import bisect
+import itertools
+import logging
+import re
+import threading
+import time
+
+from django.db import connection
+
+from .models import Word, DataVersion
+
+logger = logging.getLogger(__name__)
+
+WORD_VERSION = 'word'
+VERSION_CHECK_INTERVAL = 2.0
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+# 释义中的义项分隔符，以及开头的词性标记（如 "n."、"vt."）
+MEANING_SPLIT_RE = re.compile(r'[，,；;、/|\s]+')
+POS_PREFIX_RE = re.compile(r'^[a-z]+\.', re.IGNORECASE)
+
+
+def meaning_keys(meaning):
+    """把中文释义拆成可供前缀匹配的义项"""
+    keys = []
+    for part in MEANING_SPLIT_RE.split(meaning or ''):
+        part = POS_PREFIX_RE.sub('', part).strip()
+        if part:
+            keys.append(part)
+    return keys
+
+
+class WordSuggestIndex:
+    """单词前缀索引"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (关键字列表, 单词 ID 列表, {单词 ID: 单词})，整体替换，查询时不会读到一半新一半旧
+        self._data = ([], [], {})
+        self._version = None
+        self._checked_at = 0.0
+        # invalidate() 取下一个代号；构建成功后记录构建开始时的代号，二者不同即为过期
+        self._generations = itertools.count(1)
+        self._generation = next(self._generations)
+        self._built_generation = None
+        self._builder = None
+
+    def invalidate(self):
+        """标记索引过期，下次查询时在后台重建"""
+        self._generation = next(self._generations)
+
+    def _ensure_current(self):
+        if self._version is None:
+            # 还没有索引，只能在请求中构建
+            with self._lock:
+                if self._version is None:
+                    self._build()
+            return
+        if self._built_generation == self._generation:
+            # 本进程没有写入：按间隔检查其他 worker 是否修改过单词
+            now = time.monotonic()
+            if now - self._checked_at < VERSION_CHECK_INTERVAL:
+                return
+            version = DataVersion.current(WORD_VERSION)[WORD_VERSION]
+            self._checked_at = now
+            if version == self._version:
+                return
+        # 已知过期时不查询版本号（重建时读取），只确保后台重建在进行
+        self._start_builder()
+
+    def _start_builder(self):
+        """启动后台重建（同一时间只有一个重建线程）"""
+        with self._lock:
+            if self._builder is not None and self._builder.is_alive():
+                return
+            self._builder = threading.Thread(target=self._build_in_background, daemon=True)
+            self._builder.start()
+
+    def _build_in_background(self):
+        try:
+            self._build()
+        except Exception as e:
+            # 索引保持过期，下次查询时重试
+            logger.error(f"Error in suggest index rebuild: {str(e)}")
+        finally:
+            connection.close()
+
+    def _build(self):
+        generation = self._generation
+        checked_at = time.monotonic()
+        version = DataVersion.current(WORD_VERSION)[WORD_VERSION]
+        pairs = []
+        entries = {}
+        for pk, word, meaning, part_of_speech in Word.objects.values_list(
+            'id', 'word', 'meaning', 'part_of_speech'
+        ).order_by().iterator():
+            entries[pk] = {
+                'id': pk,
+                'word': word,
+                'meaning': meaning,
+                'part_of_speech': part_of_speech
+            }
+            pairs.append((word.lower(), pk))
+            pairs.extend((key, pk) for key in meaning_keys(meaning))
+        pairs.sort()
+        self._data = ([key for key, _ in pairs], [pk for _, pk in pairs], entries)
+        # 构建成功后才标记为最新；构建期间再次失效时仍然过期
+        self._version = version
+        self._checked_at = checked_at
+        self._built_generation = generation
+
+    def suggest(self, prefix, limit=DEFAULT_LIMIT):
+        """返回关键字以 prefix 开头的单词，按关键字字典序排列"""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        self._ensure_current()
+        keys, ids, entries = self._data
+        results = []
+        seen = set()
+        i = bisect.bisect_left(keys, prefix)
+        while i < len(keys) and keys[i].startswith(prefix) and len(results) < limit:
+            pk = ids[i]
+            if pk not in seen:
+                seen.add(pk)
+                results.append(entries[pk])
+            i += 1
+        return results
+
+
+suggest_index = WordSuggestIndex()
@@ -0,0 +1,147 @@
+"""
+分类与关键词
+
+单词分类、语法分类和句子关键词（逗号分隔）规范化为 Tag，通过多对多关联到对象：
+
+- 筛选先按 (kind, name) 唯一索引找到标签，再按关联表的索引取对象，
+  不再对原字段做 ``icontains`` 子串扫描
+- Tag.count 保存关联的条数，用 ``F('count') + n`` 增量更新，分类列表直接读取
+- 原字段保持不变（接口读写方式不变），保存、删除时由信号同步关联和计数；
+  bulk_create 等不触发信号的写入需要调用 ``tag_objects``
+"""
+import re
+from collections import Counter, defaultdict
+
+from django.db.models import Count, F
+
+from .models import Word, Sentence, Grammar, Tag
+
+# 类型 -> (模型, 来源字段, 是否按分隔符切分为多个标签)
+TAG_FIELDS = {
+    'word': (Word, 'category', False),
+    'sentence': (Sentence, 'keywords', True),
+    'grammar': (Grammar, 'category', False),
+}
+MODEL_KINDS = {model: kind for kind, (model, _, _) in TAG_FIELDS.items()}
+
+SEPARATOR_RE = re.compile(r'[,，;；、]')
+NAME_MAX_LENGTH = 200
+
+
+def tag_names(value, multiple=False):
+    """字段值 -> 标签名列表：去掉首尾空白和重复，关键词按中英文逗号、分号、顿号切分"""
+    parts = SEPARATOR_RE.split(value or '') if multiple else [value or '']
+    return list(dict.fromkeys(
+        part.strip()[:NAME_MAX_LENGTH] for part in parts if part.strip()
+    ))
+
+
+def _links(kind):
+    """(关联表模型, 关联表中指向对象的列名)"""
+    field = TAG_FIELDS[kind][0]._meta.get_field('tags')
+    return field.remote_field.through, f'{field.m2m_field_name()}_id'
+
+
+def _tag_ids(kind, names):
+    """{标签名: id}，不存在的标签先创建"""
+    if not names:
+        return {}
+    ids = dict(Tag.objects.filter(kind=kind, name__in=names).values_list('name', 'id'))
+    missing = [name for name in names if name not in ids]
+    if missing:
+        # 并发创建同名标签时由唯一约束去重
+        Tag.objects.bulk_create([Tag(kind=kind, name=name) for name in missing], ignore_conflicts=True)
+        ids.update(Tag.objects.filter(kind=kind, name__in=missing).values_list('name', 'id'))
+    return ids
+
+
+def _add_counts(deltas):
+    """按 {标签 id: 增量} 更新计数，增量相同的标签合并为一条 UPDATE"""
+    groups = defaultdict(list)
+    for tag_id, delta in deltas.items():
+        if delta:
+            groups[delta].append(tag_id)
+    for delta, tag_ids in groups.items():
+        Tag.objects.filter(pk__in=tag_ids).update(count=F('count') + delta)
+
+
+def tag_objects(kind, objects, created=False):
+    """按来源字段同步对象的标签关联和计数
+
+    created=True 表示新对象（没有已有关联，不需要读取）；bulk_create 后调用。
+    """
+    if not objects:
+        return
+    _, field, multiple = TAG_FIELDS[kind]
+    through, column = _links(kind)
+    wanted = {obj.pk: tag_names(getattr(obj, field), multiple) for obj in objects}
+    ids = _tag_ids(kind, list({name for names in wanted.values() for name in names}))
+    wanted = {pk: {ids[name] for name in names} for pk, names in wanted.items()}
+
+    current = defaultdict(dict)
+    if not created:
+        rows = through.objects.filter(**{f'{column}__in': list(wanted)}).values_list('id', column, 'tag_id')
+        for link_id, pk, tag_id in rows:
+            current[pk][tag_id] = link_id
+
+    deltas = Counter()
+    added, removed = [], []
+    for pk, tag_ids in wanted.items():
+        for tag_id in tag_ids - current[pk].keys():
+            added.append(through(**{column: pk, 'tag_id': tag_id}))
+            deltas[tag_id] += 1
+        for tag_id, link_id in current[pk].items():
+            if tag_id not in tag_ids:
+                removed.append(link_id)
+                deltas[tag_id] -= 1
+    if removed:
+        through.objects.filter(pk__in=removed).delete()
+    if added:
+        through.objects.bulk_create(added)
+    _add_counts(deltas)
+
+
+def untag_objects(kind, pks):
+    """对象删除前扣减标签计数并删除关联行"""
+    through, column = _links(kind)
+    links = through.objects.filter(**{f'{column}__in': list(pks)})
+    deltas = Counter({
+        tag_id: -count for tag_id, count in
+        links.values('tag_id').annotate(count=Count('id')).values_list('tag_id', 'count').order_by()
+    })
+    if deltas:
+        links.delete()
+        _add_counts(deltas)
+
+
+def filter_tags(queryset, kind, names):
+    """按标签精确筛选（多个标签须同时具备）"""
+    for name in names:
+        queryset = queryset.filter(tags__in=Tag.objects.filter(kind=kind, name=name.strip()).values('pk'))
+    return queryset
+
+
+def tag_list(kind):
+    """有关联对象的标签名，按名称排序"""
+    return list(Tag.objects.filter(kind=kind, count__gt=0).order_by('name').values_list('name', flat=True))
+
+
+def rebuild_tags(kinds=None, batch_size=1000):
+    """根据来源字段重建标签关联并重新统计计数，返回关联数"""
+    total = 0
+    for kind in kinds or TAG_FIELDS:
+        model, field, _ = TAG_FIELDS[kind]
+        through, _ = _links(kind)
+        through.objects.all().delete()
+        Tag.objects.filter(kind=kind).update(count=0)
+        batch = []
+        for obj in model.objects.only('id', field).order_by().iterator(chunk_size=batch_size):
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                tag_objects(kind, batch, created=True)
+                batch = []
+        tag_objects(kind, batch, created=True)
+        total += through.objects.count()
+        # 不再使用的标签
+        Tag.objects.filter(kind=kind, count=0).delete()
+    return total
@@ -0,0 +1,1303 @@
+"""
+learning 应用测试
+
+运行：python manage.py test learning
+"""
+import csv
+import importlib
+import io
+import json
+import re
+import threading
+from datetime import date, datetime, time, timedelta
+from unittest import mock, skipUnless
+
+from django.apps import apps
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+from django.http import QueryDict
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import AsyncRequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from . import async_views, renderers
+from .benchmark import seed
+from .bulk import filter_queryset, parse_filters
+from .cache import ENDPOINTS, response_cache
+from .exporter import iter_export
+from .importer import import_file
+from .models import DataVersion, Grammar, SearchDocument, Sentence, StudyLog, StudyLogDaily, StudyStreak, Tag, Word
+from .rollups import add_daily_count, compact_logs
+from .sampling import make_rng, sample_ids
+from .scheduler import DEFAULT_GRADE, MAX_INTERVAL, MIN_EASE, next_schedule, parse_grade
+from .suggest import VERSION_CHECK_INTERVAL, WordSuggestIndex, suggest_index
+from .search import PYTHON_MAX_RESULTS, PythonSearchBackend, index_objects, search_ids, tokenize
+from .stats import (
+    get_study_streak, last_7_days, local_day_range, rebuild_study_streak, record_study_activity
+)
+from .tags import rebuild_tags, tag_names
+from .perf import perf_store
+from .views import GrammarViewSet, ReviewListView, SentenceViewSet, StudyLogViewSet, WordViewSet
+
+# 仪表盘每次请求的 SQL 条数：数据版本 1 + 单词 / 句子 / 语法计数各 1 + 最近活动 1 + 连续天数 1
+DASHBOARD_QUERIES = 6
+
+
+@override_settings(LEARNING_CACHE_TTLS={'dashboard': 0})
+class DashboardQueryBudgetTests(TestCase):
+    """仪表盘的 SQL 条数固定，不随数据量增长（关闭响应缓存）"""
+
+    def get_dashboard(self):
+        with self.assertNumQueries(DASHBOARD_QUERIES):
+            response = self.client.get('/api/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_small_tables(self):
+        seed({'word': 10, 'sentence': 10, 'grammar': 3, 'log': 30}, years=1, goals=1)
+        data = self.get_dashboard()
+        self.assertEqual(data['total_words'], 10)
+        self.assertEqual(data['total_grammar'], 3)
+
+    def test_large_tables(self):
+        seed({'word': 2000, 'sentence': 1000, 'grammar': 200, 'log': 5000}, years=1, goals=1)
+        data = self.get_dashboard()
+        self.assertEqual(data['total_words'], 2000)
+        self.assertEqual(data['total_sentences'], 1000)
+        self.assertEqual(len(data['recent_activities']), 10)
+        # 测试数据中没有未来时间的学习记录
+        self.assertFalse(StudyLog.objects.filter(created_at__gt=timezone.now()).exists())
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN 的输出只针对 SQLite')
+class ListIndexTests(TestCase):
+    """列表、筛选、复习和学习记录查询使用 0004 / 0003 中的索引"""
+
+    @staticmethod
+    def list_queryset(viewset_class, query=''):
+        """与列表接口相同的查询集（一页 20 条）"""
+        view = viewset_class(action='list', format_kwarg=None)
+        view.request = Request(APIRequestFactory().get(f'/?{query}'))
+        return view.get_queryset()[:20]
+
+    def assertUsesIndex(self, queryset, index):
+        plan = queryset.explain()
+        self.assertIn(f'INDEX {index}', plan)
+        # 按索引顺序读取，不需要额外排序
+        self.assertNotIn('TEMP B-TREE FOR ORDER BY', plan)
+
+    def test_list_ordering(self):
+        self.assertUsesIndex(self.list_queryset(WordViewSet), 'word_created_idx')
+        self.assertUsesIndex(self.list_queryset(SentenceViewSet), 'sentence_created_idx')
+        self.assertUsesIndex(self.list_queryset(GrammarViewSet), 'grammar_created_idx')
+        self.assertUsesIndex(self.list_queryset(StudyLogViewSet), 'studylog_created_idx')
+
+    def test_list_filters(self):
+        cases = [
+            (WordViewSet, 'difficulty=hard', 'word_difficulty_created_idx'),
+            (WordViewSet, 'is_favorite=true', 'word_favorite_created_idx'),
+            (SentenceViewSet, 'type=business', 'sentence_type_created_idx'),
+            (SentenceViewSet, 'is_favorite=true', 'sentence_favorite_created_idx'),
+            (GrammarViewSet, 'difficulty=advanced', 'grammar_difficulty_created_idx'),
+            (GrammarViewSet, 'is_mastered=false', 'grammar_mastered_created_idx'),
+            (StudyLogViewSet, 'type=word', 'studylog_type_created_idx'),
+            (StudyLogViewSet, 'type=word&from=2024-01-01&to=2024-12-31', 'studylog_type_created_idx'),
+        ]
+        for viewset_class, query, index in cases:
+            with self.subTest(viewset=viewset_class.__name__, query=query):
+                self.assertUsesIndex(self.list_queryset(viewset_class, query), index)
+
+    def test_study_log_date_range(self):
+        plan = self.list_queryset(StudyLogViewSet, 'from=2024-01-01&to=2024-12-31').explain()
+        self.assertIn('INDEX studylog_created_idx (created_at>? AND created_at<?)', plan)
+
+    def test_review_queue(self):
+        now = timezone.now()
+        for item_type in ReviewListView.SOURCES:
+            with self.subTest(item_type=item_type):
+                plan = ReviewListView.due_queryset(item_type, now, 50).explain()
+                self.assertRegex(plan, r'USING INDEX \w*next_due\w* \(next_due<\?\)')
+                self.assertNotIn('TEMP B-TREE FOR ORDER BY', plan)
+
+
+class SearchFilterTests(TestCase):
+    """?search= 与其他筛选条件在同一条查询中生效：计数、筛选项和排序覆盖全部匹配结果"""
+
+    @classmethod
+    def setUpTestData(cls):
+        words = Word.objects.bulk_create(
+            Word(word='planet', meaning=f'行星 {i}', difficulty='hard' if i % 3 == 0 else 'easy')
+            for i in range(900)
+        )
+        # 只有正文命中，相关度最低
+        cls.orbit = Word.objects.create(word='orbit', meaning='planet orbit', difficulty='hard')
+        index_objects('word', words)
+
+    def test_filters_apply_to_all_matches(self):
+        data = self.client.get('/api/words/?search=planet&difficulty=hard').json()
+        self.assertEqual(data['count'], 301)
+        data = self.client.get('/api/words/?search=plan&difficulty=easy').json()
+        self.assertEqual(data['count'], 600)
+
+    def test_facets(self):
+        data = self.client.get('/api/words/facets/?search=planet').json()
+        self.assertEqual(data['total'], 901)
+        counts = {item['value']: item['count'] for item in data['facets']['difficulty']}
+        self.assertEqual(counts, {'easy': 600, 'medium': 0, 'hard': 301})
+
+    def test_ranking(self):
+        queryset = WordViewSet.apply_filters(Word.objects.all(), QueryDict('search=planet&difficulty=hard'))
+        ids = list(queryset.values_list('pk', flat=True))
+        self.assertEqual(len(ids), 301)
+        self.assertEqual(ids[-1], self.orbit.pk)
+
+    def test_python_backend_is_bounded(self):
+        # 进程内索引后端只取相关度最高的 PYTHON_MAX_RESULTS 条，SQL 参数个数有上限
+        queryset = PythonSearchBackend().filter_ranked(Word.objects.all(), 'word', ['planet'], False)
+        ids = list(queryset.values_list('pk', flat=True))
+        self.assertEqual(len(ids), PYTHON_MAX_RESULTS)
+        self.assertNotIn(self.orbit.pk, ids)
+
+
+class BulkFilterTests(TestCase):
+    """批量修改、删除拒绝空值、无法解析的布尔值和不能限制对象的筛选条件"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed({'word': 30, 'sentence': 10, 'grammar': 10, 'log': 0}, years=1, goals=1)
+
+    def post(self, url, body):
+        return self.client.post(url, body, content_type='application/json')
+
+    def test_delete_rejects_unsafe_filters(self):
+        cases = [
+            {'difficulty': ''},
+            {'difficulty': '  '},
+            {'difficulty': None},
+            {'difficulty': []},
+            {'is_favorite': 'yes'},
+            {'is_favorite': 1},
+        ]
+        for filters in cases:
+            with self.subTest(filters=filters):
+                response = self.post('/api/words/bulk-delete/', {'filters': filters})
+                self.assertEqual(response.status_code, 400)
+        response = self.post('/api/grammar/bulk-delete/', {'filters': {'is_mastered': 'maybe'}})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Word.objects.count(), 30)
+
+    def test_delete_requires_narrowing_filters(self):
+        filters = parse_filters({'difficulty': 'hard'}, WordViewSet.query_filters)
+        with self.assertRaises(ValueError):
+            filter_queryset(Word.objects.all(), filters, lambda queryset, params: queryset)
+
+    def test_delete_with_filters(self):
+        hard = Word.objects.filter(difficulty='hard').count()
+        response = self.post('/api/words/bulk-delete/', {'filters': {'difficulty': 'hard', 'is_favorite': False}})
+        self.assertEqual(response.status_code, 200)
+        deleted = response.json()['deleted']
+        self.assertLessEqual(deleted, hard)
+        self.assertEqual(Word.objects.count(), 30 - deleted)
+        self.assertFalse(Word.objects.filter(difficulty='hard', is_favorite=False).exists())
+
+    def test_update_rejects_unsafe_filters(self):
+        for filters in [{'category': ''}, {'search': ' '}, {'is_favorite': 'on'}]:
+            with self.subTest(filters=filters):
+                response = self.post('/api/words/bulk-update/', {'filters': filters, 'set': {'category': 'x'}})
+                self.assertEqual(response.status_code, 400)
+        response = self.post('/api/sentences/bulk-update/', {'filters': {'keyword': ''}, 'set': {'is_favorite': True}})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Word.objects.filter(category='x').exists())
+
+    def test_update_with_filters(self):
+        response = self.post('/api/words/bulk-update/', {'filters': {'difficulty': 'easy'}, 'set': {'category': 'x'}})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['updated'], Word.objects.filter(difficulty='easy').count())
+        self.assertEqual(Word.objects.filter(category='x').count(), response.json()['updated'])
+
+    def test_update_with_search(self):
+        planets = [Word.objects.create(word=f'planet{i}', meaning='行星', difficulty='easy').pk for i in range(3)]
+        for filters in [{'search': 'planet'}, {'search': 'planet', 'difficulty': 'easy'}]:
+            with self.subTest(filters=filters):
+                response = self.post('/api/words/bulk-update/', {'filters': filters, 'set': {'difficulty': 'hard'}})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(sorted(Word.objects.filter(difficulty='hard', word__startswith='planet')
+                                        .values_list('pk', flat=True)), planets)
+                Word.objects.filter(pk__in=planets).update(difficulty='easy')
+        response = self.post('/api/words/bulk-update/', {
+            'ids': planets[:2] + [Word.objects.exclude(pk__in=planets).first().pk],
+            'filters': {'search': 'planet'}, 'set': {'is_favorite': True},
+        })
+        self.assertEqual(response.json()['updated'], 2)
+
+
+class SamplingTests(TestCase):
+    """随机抽样总是返回 min(数量, 匹配行数) 个不重复的 ID"""
+
+    @classmethod
+    def setUpTestData(cls):
+        Word.objects.bulk_create(
+            Word(word=f'w{i}', meaning='词', is_favorite=i % 17 == 0) for i in range(200)
+        )
+
+    def test_sparse_filtered_set(self):
+        favorites = Word.objects.filter(is_favorite=True)
+        for seed_value in range(20):
+            ids = sample_ids(favorites, 10, make_rng(seed_value))
+            self.assertEqual(len(ids), 10)
+            self.assertEqual(len(set(ids)), 10)
+            self.assertTrue(set(ids) <= set(favorites.values_list('id', flat=True)))
+            ids = sample_ids(favorites, 20, make_rng(seed_value))
+            self.assertEqual(sorted(ids), sorted(favorites.values_list('id', flat=True)))
+
+    def test_full_table(self):
+        ids = sample_ids(Word.objects.all(), 50, make_rng(1))
+        self.assertEqual(len(set(ids)), 50)
+        self.assertEqual(ids, sample_ids(Word.objects.all(), 50, make_rng(1)))
+
+    def test_random_endpoint(self):
+        data = self.client.get('/api/words/random/?count=50&is_favorite=true&seed=3').json()
+        self.assertEqual(len(data), Word.objects.filter(is_favorite=True).count())
+
+
+class ConcurrentReviewTests(TransactionTestCase):
+    """并发复习同一对象：每次复习都计入，调度字段按最新状态计算，不返回 500"""
+
+    REVIEWS = 16
+
+    def setUp(self):
+        self.word = Word.objects.create(word='concurrent', meaning='并发')
+
+    def test_stale_objects(self):
+        # 两个请求读到同一状态后先后写入
+        first = Word.objects.get(pk=self.word.pk)
+        second = Word.objects.get(pk=self.word.pk)
+        first.review(DEFAULT_GRADE)
+        second.review(DEFAULT_GRADE)
+        self.word.refresh_from_db()
+        self.assertEqual(self.word.review_count, 2)
+        self.assertEqual(self.word.repetitions, 2)
+        self.assertEqual(second.review_count, 2)
+
+    def test_parallel_requests(self):
+        barrier = threading.Barrier(self.REVIEWS)
+        statuses = []
+
+        def review():
+            try:
+                barrier.wait()
+                response = self.client_class().post(f'/api/words/{self.word.pk}/review/', {'grade': 'good'})
+                statuses.append(response.status_code)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=review) for _ in range(self.REVIEWS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(statuses, [200] * self.REVIEWS)
+        self.word.refresh_from_db()
+        self.assertEqual(self.word.review_count, self.REVIEWS)
+        self.assertEqual(self.word.repetitions, self.REVIEWS)
+
+
+class ImportTests(TestCase):
+    """批量导入：CSV / JSONL 解析、去重、逐行错误和导入速度"""
+
+    @staticmethod
+    def jsonl(*rows):
+        return '\n'.join(row if isinstance(row, str) else json.dumps(row, ensure_ascii=False) for row in rows)
+
+    def assertResult(self, result, created, skipped, error_rows):
+        self.assertEqual(result.created, created)
+        self.assertEqual(result.skipped, skipped)
+        self.assertEqual(result.error_count, len(error_rows))
+        self.assertEqual([error['row'] for error in result.errors], error_rows)
+        total = created + skipped + len(error_rows)
+        self.assertAlmostEqual(result.rows_per_second, total / result.elapsed, delta=0.1)
+
+    def test_csv(self):
+        Word.objects.create(word='existing', meaning='已有')
+        content = (
+            '\ufeffword,meaning,difficulty,category\n'
+            'apple,苹果,easy,水果\n'
+            'banana,香蕉,,水果\n'
+            'apple,重复的苹果,hard,\n'
+            'existing,数据库中已有,easy,\n'
+            'broken,,easy,\n'
+            'cherry,樱桃,impossible,\n'
+        )
+        result = import_file('word', io.BytesIO(content.encode('utf-8')), 'csv')
+        self.assertResult(result, created=2, skipped=2, error_rows=[5, 6])
+        self.assertIn('meaning', result.errors[0]['errors'])
+        self.assertIn('difficulty', result.errors[1]['errors'])
+        # 空单元格使用默认值；导入的对象建立了搜索索引和分类标签
+        self.assertEqual(Word.objects.get(word='banana').difficulty, 'medium')
+        self.assertEqual(Word.objects.get(word='apple').meaning, '苹果')
+        self.assertEqual(search_ids('word', 'banana'), [Word.objects.get(word='banana').pk])
+        self.assertEqual(Tag.objects.get(kind='word', name='水果').count, 2)
+
+    def test_jsonl(self):
+        content = self.jsonl(
+            {'title': '现在完成时', 'structure': 'have done', 'explanation': '解释', 'usage': '用法',
+             'examples': ['I have done it.'], 'category': '时态'},
+            '',
+            '{"title": "坏行"',
+            '[1, 2]',
+            {'title': '现在完成时', 'structure': 's', 'explanation': 'e', 'usage': 'u', 'category': '时态'},
+            {'title': '缺少字段'},
+        )
+        result = import_file('grammar', io.StringIO(content), 'jsonl')
+        self.assertResult(result, created=1, skipped=1, error_rows=[3, 4, 6])
+        self.assertEqual(Grammar.objects.get().examples, ['I have done it.'])
+
+    def test_dedupe_across_batches(self):
+        rows = [{'english': f'Sentence {i % 7}.', 'chinese': '句子'} for i in range(20)]
+        result = import_file('sentence', io.StringIO(self.jsonl(*rows)), 'jsonl', batch_size=3)
+        self.assertResult(result, created=7, skipped=13, error_rows=[])
+        self.assertEqual(Sentence.objects.count(), 7)
+
+    def test_endpoint(self):
+        rows = [{'word': f'word{i}', 'meaning': '词'} for i in range(2000)]
+        rows.append({'word': 'word1', 'meaning': '重复'})
+        rows.append({'word': ''})
+        upload = SimpleUploadedFile('words.jsonl', self.jsonl(*rows).encode('utf-8'))
+        response = self.client.post('/api/import/', {'file': upload, 'type': 'word'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual((data['created'], data['skipped'], data['error_count']), (2000, 1, 1))
+        self.assertEqual(data['errors'][0]['row'], 2002)
+        self.assertGreater(data['rows_per_second'], 0)
+        self.assertEqual(Word.objects.count(), 2000)
+
+    def test_endpoint_rejects_bad_requests(self):
+        self.assertEqual(self.client.post('/api/import/', {'type': 'word'}).status_code, 400)
+        upload = SimpleUploadedFile('words.txt', b'word,meaning\n')
+        self.assertEqual(self.client.post('/api/import/', {'file': upload, 'type': 'word'}).status_code, 400)
+        upload = SimpleUploadedFile('words.csv', b'word,meaning\n')
+        self.assertEqual(self.client.post('/api/import/', {'file': upload, 'type': 'note'}).status_code, 400)
+
+
+class SuggestIndexTests(TransactionTestCase):
+    """单词联想索引：过期后在后台重建，重建成功前一直视为过期"""
+
+    def setUp(self):
+        Word.objects.create(word='apple', meaning='n. 苹果')
+        self.index = WordSuggestIndex()
+
+    def words(self, prefix):
+        return [item['word'] for item in self.index.suggest(prefix)]
+
+    def wait_for_builder(self):
+        self.index._builder.join(timeout=10)
+        self.assertFalse(self.index._builder.is_alive())
+
+    def test_rebuild_off_request_path(self):
+        self.assertEqual(self.words('ap'), ['apple'])
+        Word.objects.create(word='apricot', meaning='杏')
+        self.index.invalidate()
+        # 请求中不读取单词表：仍返回旧索引，并启动后台重建
+        with mock.patch.object(Word.objects, 'values_list') as values_list, \
+                mock.patch.object(self.index, '_start_builder') as start_builder:
+            self.assertEqual(self.words('ap'), ['apple'])
+        values_list.assert_not_called()
+        start_builder.assert_called_once()
+        self.index.suggest('ap')
+        self.wait_for_builder()
+        self.assertEqual(self.words('ap'), ['apple', 'apricot'])
+        self.assertEqual(self.words('杏'), ['apricot'])
+
+    def test_failed_rebuild_stays_stale(self):
+        self.assertEqual(self.words('ap'), ['apple'])
+        Word.objects.create(word='apricot', meaning='杏')
+        self.index.invalidate()
+        with mock.patch.object(Word.objects, 'values_list', side_effect=RuntimeError('database unavailable')):
+            self.assertEqual(self.words('ap'), ['apple'])
+            self.wait_for_builder()
+        self.assertNotEqual(self.index._built_generation, self.index._generation)
+        # 下一次查询重新在后台构建（重建可能在本次查询返回前完成，不检查本次的结果）
+        self.index.suggest('ap')
+        self.wait_for_builder()
+        self.assertEqual(self.words('ap'), ['apple', 'apricot'])
+
+    def test_version_checks_throttled(self):
+        self.assertEqual(self.words('ap'), ['apple'])
+        with mock.patch('learning.suggest.DataVersion.current', wraps=DataVersion.current) as current, \
+                mock.patch.object(self.index, '_start_builder') as start_builder:
+            # 索引最新时每 VERSION_CHECK_INTERVAL 秒最多查询一次版本号
+            for _ in range(5):
+                self.words('ap')
+            current.assert_not_called()
+            self.index._checked_at -= VERSION_CHECK_INTERVAL
+            self.words('ap')
+            self.assertEqual(current.call_count, 1)
+            # 过期后等待重建期间不查询版本号
+            self.index.invalidate()
+            self.index._checked_at -= VERSION_CHECK_INTERVAL
+            for _ in range(5):
+                self.assertEqual(self.words('ap'), ['apple'])
+            self.assertEqual(current.call_count, 1)
+            self.assertEqual(start_builder.call_count, 5)
+        # 其他 worker 修改单词后（版本号变化、本进程未失效），检查到期时重建
+        Word.objects.create(word='apricot', meaning='杏')
+        self.index._generation = self.index._built_generation
+        self.index._checked_at -= VERSION_CHECK_INTERVAL
+        self.index.suggest('ap')
+        self.wait_for_builder()
+        self.assertEqual(self.words('ap'), ['apple', 'apricot'])
+
+
+@override_settings(LEARNING_CACHE_TTLS={})
+class ResponseCacheTests(TestCase):
+    """响应缓存：缓存键包含全部查询参数"""
+
+    def setUp(self):
+        cache.clear()
+        Sentence.objects.create(english='First one.', chinese='一', keywords='a, b')
+        Sentence.objects.create(english='Second one.', chinese='二', keywords='b')
+
+    def facet_total(self, query):
+        return self.client.get(f'/api/sentences/facets/?{query}').json()['total']
+
+    def test_repeated_params(self):
+        self.assertEqual(self.facet_total('keyword=a&keyword=b'), 1)
+        self.assertEqual(self.facet_total('keyword=b'), 2)
+        self.assertEqual(self.facet_total('keyword=b&keyword=a'), 1)
+
+
+@override_settings(LEARNING_CACHE_TTLS={'dashboard': 0, 'stats': 0})
+class AsyncViewTests(TransactionTestCase):
+    """异步视图：响应与同步视图一致；ASGI 下导出使用异步迭代器"""
+
+    VIEWS = (
+        (async_views.AsyncDashboardView, '/api/dashboard/'),
+        (async_views.AsyncStatisticsView, '/api/stats/?days=30&bucket=week'),
+        (async_views.AsyncReviewListView, '/api/review/?limit=20'),
+        (async_views.AsyncSearchView, '/api/search/?q=word'),
+    )
+
+    def setUp(self):
+        cache.clear()
+        seed({'word': 60, 'sentence': 30, 'grammar': 10, 'log': 80}, years=1, goals=1)
+
+    async def test_same_as_sync_views(self):
+        for view_class, url in self.VIEWS:
+            with self.subTest(url=url):
+                expected = await self.async_client.get(url)
+                response = await view_class.as_view()(AsyncRequestFactory().get(url))
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(json.loads(response.content), expected.json())
+
+    async def test_export_streams_async(self):
+        response = await self.async_client.get('/api/export/?format=csv&models=word')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        content = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(len(content.decode().splitlines()), 61)
+
+
+
+class PaginationTests(TestCase):
+    """列表分页：游标分页遇到相同创建时间不重复、不遗漏；不计数的页码分页"""
+
+    @classmethod
+    def setUpTestData(cls):
+        Word.objects.bulk_create(Word(word=f'tie{i:02d}', meaning='同时') for i in range(23))
+        # 三组相同的创建时间，检验 (created_at, id) 游标的并列处理
+        now = timezone.now()
+        for i, pk in enumerate(Word.objects.order_by('pk').values_list('pk', flat=True)):
+            Word.objects.filter(pk=pk).update(created_at=now - timedelta(minutes=i % 3))
+        cls.expected = list(Word.objects.order_by('-created_at', '-id').values_list('pk', flat=True))
+
+    def walk(self, url, link):
+        """沿 next / previous 链接翻完，返回各页的 id 和最后一页的地址"""
+        pages = []
+        while True:
+            data = self.client.get(url).json()
+            pages.append([item['id'] for item in data['results']])
+            if not data[link]:
+                return pages, url
+            url = data[link]
+
+    def test_cursor_walk(self):
+        pages, _ = self.walk('/api/words/?paginate=cursor&page_size=5', 'next')
+        self.assertEqual([len(page) for page in pages], [5, 5, 5, 5, 3])
+        self.assertEqual(sum(pages, []), self.expected)
+
+    def test_cursor_previous(self):
+        pages, last = self.walk('/api/words/?paginate=cursor&page_size=5', 'next')
+        # 从最后一页沿 previous 往回翻，得到相同的各页，第一页没有 previous
+        backward, _ = self.walk(last, 'previous')
+        self.assertEqual(backward[::-1], pages)
+
+    def test_cursor_count(self):
+        data = self.client.get('/api/words/?paginate=cursor&page_size=5').json()
+        self.assertNotIn('count', data)
+        data = self.client.get('/api/words/?paginate=cursor&page_size=5&count=true').json()
+        self.assertEqual(data['count'], 23)
+
+    def test_page_without_count(self):
+        pages = []
+        for page in (1, 2, 3):
+            data = self.client.get(f'/api/words/?count=false&page_size=10&page={page}').json()
+            counted = self.client.get(f'/api/words/?page_size=10&page={page}').json()
+            self.assertNotIn('count', data)
+            self.assertEqual(data['results'], counted['results'])
+            pages.append(data)
+        self.assertEqual(sorted(item['id'] for data in pages for item in data['results']), sorted(self.expected))
+        self.assertIsNone(pages[0]['previous'])
+        self.assertIn('page=2', pages[0]['next'])
+        self.assertNotIn('page=', pages[1]['previous'])
+        self.assertIsNone(pages[2]['next'])
+        self.assertEqual(self.client.get('/api/words/?count=false&page=0').status_code, 404)
+
+    def test_malformed_cursor(self):
+        for cursor in ('garbage', 'eHx5fHo', '%%%'):
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self.client.get(f'/api/words/?cursor={cursor}').status_code, 404)
+
+
+class ETagTests(TestCase):
+    """条件请求：数据未变时返回 304，任何写入后 ETag 都会变化"""
+
+    def setUp(self):
+        self.word = Word.objects.create(word='etag', meaning='标签')
+
+    def etag(self, url='/api/words/'):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response['ETag']
+
+    def post(self, url, body):
+        return self.client.post(url, body, content_type='application/json')
+
+    def test_not_modified(self):
+        etag = self.etag()
+        response = self.client.get('/api/words/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        # 其他模型的写入不影响单词列表
+        Sentence.objects.create(english='Unrelated.', chinese='无关')
+        self.assertEqual(self.client.get('/api/words/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        # 不同的查询参数对应不同的 ETag
+        self.assertNotEqual(self.etag('/api/words/?difficulty=hard'), etag)
+
+    def test_changes_after_writes(self):
+        other = Word.objects.create(word='other', meaning='其他')
+        writes = {
+            'create': lambda: self.post('/api/words/', {'word': 'created', 'meaning': '新建'}),
+            'update': lambda: self.client.patch(
+                f'/api/words/{self.word.pk}/', {'meaning': '修改'}, content_type='application/json'),
+            'toggle_favorite': lambda: self.client.post(f'/api/words/{self.word.pk}/toggle_favorite/'),
+            'bulk_update': lambda: self.post('/api/words/bulk-update/', {'ids': [self.word.pk], 'set': {'category': 'x'}}),
+            'bulk_delete': lambda: self.post('/api/words/bulk-delete/', {'ids': [other.pk]}),
+        }
+        for name, write in writes.items():
+            with self.subTest(write=name):
+                etag = self.etag()
+                detail_etag = self.etag(f'/api/words/{self.word.pk}/')
+                self.assertLess(write().status_code, 300)
+                self.assertEqual(self.client.get('/api/words/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+                self.assertNotEqual(self.etag(), etag)
+                self.assertNotEqual(self.etag(f'/api/words/{self.word.pk}/'), detail_etag)
+
+
+@override_settings(LEARNING_CACHE_TTLS={})
+class CacheInvalidationTests(TestCase):
+    """响应缓存：写入后依赖该模型的接口代数递增，读到的是新数据"""
+
+    def setUp(self):
+        cache.clear()
+        self.word = Word.objects.create(word='cached', meaning='缓存', category='old')
+        self.grammar = Grammar.objects.create(title='Cached', structure='S + V', explanation='缓存', usage='缓存', category='old')
+
+    def generations(self):
+        return {name: response_cache._generation(name) for name in ENDPOINTS}
+
+    def bumped_by(self, write):
+        before = self.generations()
+        # 失效在事务提交后执行
+        with self.captureOnCommitCallbacks(execute=True):
+            write()
+        after = self.generations()
+        return {name for name in ENDPOINTS if after[name] != before[name]}
+
+    def test_generations(self):
+        post = lambda url, body: self.client.post(url, body, content_type='application/json')
+        cases = [
+            (lambda: Word.objects.create(word='new', meaning='新'),
+             {'dashboard', 'stats', 'word_categories', 'word_facets'}),
+            (lambda: post('/api/grammar/bulk-update/', {'ids': [self.grammar.pk], 'set': {'category': 'new'}}),
+             {'dashboard', 'stats', 'grammar_categories', 'grammar_facets'}),
+            (lambda: self.client.post('/api/sentences/', {'english': 'New.', 'chinese': '新'}),
+             {'dashboard', 'stats', 'sentence_facets'}),
+            (lambda: StudyLog.objects.create(log_type='word', reference_id=self.word.pk, action='review'),
+             {'dashboard', 'stats'}),
+        ]
+        for write, expected in cases:
+            with self.subTest(expected=expected):
+                self.assertEqual(self.bumped_by(write), expected)
+
+    def test_fresh_after_write(self):
+        urls = ['/api/dashboard/', '/api/stats/', '/api/words/categories/', '/api/words/facets/']
+        before = {url: self.client.get(url).json() for url in urls}
+        # 未写入时命中缓存
+        self.assertEqual({url: self.client.get(url).json() for url in urls}, before)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/words/{self.word.pk}/', {'category': 'fresh', 'difficulty': 'hard'},
+                              content_type='application/json')
+            Word.objects.create(word='another', meaning='另一个', difficulty='hard')
+        after = {url: self.client.get(url).json() for url in urls}
+        self.assertEqual(after['/api/dashboard/']['total_words'], before['/api/dashboard/']['total_words'] + 1)
+        self.assertNotEqual(after['/api/stats/']['word_by_difficulty'], before['/api/stats/']['word_by_difficulty'])
+        self.assertIn('fresh', json.dumps(after['/api/words/categories/']))
+        self.assertEqual(after['/api/words/facets/']['total'], 2)
+
+
+class CompactLogsTests(TestCase):
+    """压缩学习记录：删除旧的原始记录后每日汇总、统计和连续天数不变"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed({'word': 20, 'sentence': 10, 'grammar': 5, 'log': 600}, years=1, goals=1)
+
+    def daily_totals(self):
+        return sorted(StudyLogDaily.objects.values_list('date', 'log_type', 'action', 'count'))
+
+    def test_totals_and_streak(self):
+        totals, streak, week = self.daily_totals(), get_study_streak(), last_7_days()
+        self.assertGreater(streak, 0)
+        cutoff, _ = local_day_range(timezone.localdate() - timedelta(days=30))
+        old = StudyLog.objects.filter(created_at__lt=cutoff).count()
+        recent = StudyLog.objects.count() - old
+
+        days, deleted = compact_logs(30, chunk_size=50)
+        self.assertEqual(deleted, old)
+        self.assertGreater(days, 0)
+        self.assertEqual(StudyLog.objects.count(), recent)
+        self.assertFalse(StudyLog.objects.filter(created_at__lt=cutoff).exists())
+        self.assertEqual(self.daily_totals(), totals)
+        self.assertEqual(get_study_streak(), streak)
+        self.assertEqual(rebuild_study_streak().current_streak, streak)
+        self.assertEqual(last_7_days(), week)
+        # 重复执行没有可压缩的记录
+        self.assertEqual(compact_logs(30), (0, 0))
+
+    def test_restores_missing_totals(self):
+        totals = self.daily_totals()
+        oldest = StudyLog.objects.order_by('created_at').first()
+        day = timezone.localdate(oldest.created_at)
+        # 汇总缺失的一天在压缩前按原始记录补齐
+        StudyLogDaily.objects.filter(date=day).delete()
+        compact_logs(30)
+        self.assertEqual(self.daily_totals(), totals)
+
+    def test_dry_run(self):
+        count = StudyLog.objects.count()
+        days, deleted = compact_logs(30, dry_run=True)
+        self.assertGreater(deleted, 0)
+        self.assertEqual(StudyLog.objects.count(), count)
+
+
+class BulkDeleteConsistencyTests(TransactionTestCase):
+    """批量删除后搜索索引、标签计数、联想索引和学习记录保持一致"""
+
+    def setUp(self):
+        for i in range(12):
+            word = Word.objects.create(word=f'comet{i:02d}', meaning='彗星', category='space' if i % 2 else 'sky',
+                                       difficulty='hard' if i < 8 else 'easy')
+            StudyLog.objects.create(log_type='word', reference_id=word.pk, action='review')
+        for i in range(6):
+            Sentence.objects.create(english=f'Comet number {i}.', chinese='彗星', keywords='comet, sky' if i % 2 else 'comet')
+
+    def post(self, url, body):
+        return self.client.post(url, body, content_type='application/json')
+
+    def suggestions(self, prefix):
+        # 索引过期时本次仍返回旧结果并在后台重建，等待重建完成后再查询
+        suggest_index.suggest(prefix)
+        if suggest_index._builder:
+            suggest_index._builder.join(timeout=10)
+        return [item['word'] for item in suggest_index.suggest(prefix, 50)]
+
+    def assert_tags_consistent(self, kind, model, field, multiple=False):
+        expected = {}
+        for value in model.objects.values_list(field, flat=True):
+            for name in tag_names(value, multiple):
+                expected[name] = expected.get(name, 0) + 1
+        counts = dict(Tag.objects.filter(kind=kind, count__gt=0).values_list('name', 'count'))
+        self.assertEqual(counts, expected)
+        self.assertFalse(Tag.objects.filter(kind=kind, count__lt=0).exists())
+        self.assertEqual(model.tags.through.objects.count(), sum(expected.values()))
+
+    def test_delete_by_filters(self):
+        self.assertEqual(len(self.suggestions('comet')), 12)
+        hard = list(Word.objects.filter(difficulty='hard').values_list('pk', flat=True))
+        response = self.post('/api/words/bulk-delete/', {'filters': {'difficulty': 'hard', 'search': 'comet'}})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['deleted'], 8)
+
+        self.assertEqual(sorted(search_ids('word', 'comet', 50)), sorted(Word.objects.values_list('pk', flat=True)))
+        self.assertFalse(SearchDocument.objects.filter(kind='word', ref_id__in=hard).exists())
+        self.assertFalse(StudyLog.objects.filter(log_type='word', reference_id__in=hard).exists())
+        self.assertEqual(StudyLog.objects.count(), 4)
+        self.assert_tags_consistent('word', Word, 'category')
+        self.assertEqual(self.client.get('/api/words/categories/').json(), ['sky', 'space'])
+        self.assertEqual(self.suggestions('comet'), ['comet08', 'comet09', 'comet10', 'comet11'])
+
+    def test_delete_by_ids(self):
+        pks = list(Sentence.objects.order_by('pk').values_list('pk', flat=True)[:3])
+        response = self.post('/api/sentences/bulk-delete/', {'ids': pks + [0]})
+        self.assertEqual(response.json()['deleted'], 3)
+        self.assertEqual(len(search_ids('sentence', 'comet', 50)), 3)
+        self.assert_tags_consistent('sentence', Sentence, 'keywords', multiple=True)
+        # 全部删除后标签计数归零，分类列表为空
+        self.post('/api/sentences/bulk-delete/', {'ids': list(Sentence.objects.values_list('pk', flat=True))})
+        self.assertFalse(Tag.objects.filter(kind='sentence', count__gt=0).exists())
+        self.assertFalse(SearchDocument.objects.filter(kind='sentence').exists())
+        self.assertEqual(search_ids('sentence', 'comet', 50), [])
+
+
+class ServerTimingTests(TestCase):
+    """请求性能统计：Server-Timing 响应头与按 URL 名称记录的样本"""
+
+    HEADER_RE = re.compile(
+        r'total;dur=(\d+\.\d{2}), db;dur=(\d+\.\d{2});desc="(\d+) queries", '
+        r'render;dur=(\d+\.\d{2}), app;dur=(\d+\.\d{2})'
+    )
+
+    def setUp(self):
+        perf_store.reset()
+        Word.objects.create(word='timing', meaning='计时')
+
+    def parse(self, response):
+        match = self.HEADER_RE.fullmatch(response['Server-Timing'])
+        self.assertIsNotNone(match, response['Server-Timing'])
+        total, db, queries, render, app = match.groups()
+        return float(total), float(db), int(queries), float(render), float(app)
+
+    def test_header(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/words/')
+        total, db, count, render, app = self.parse(response)
+        self.assertEqual(count, len(queries))
+        self.assertGreater(count, 0)
+        self.assertLessEqual(db + render, total + 0.01)
+        self.assertAlmostEqual(db + render + app, total, delta=0.02)
+        samples = perf_store.snapshot()['word-list']
+        self.assertEqual(len(samples), 1)
+        self.assertEqual(samples[0][2], count)
+
+    async def test_header_async(self):
+        response = await self.async_client.get('/api/sentences/')
+        self.assertGreater(self.parse(response)[2], 0)
+
+    @override_settings(PERF_SERVER_TIMING=False)
+    def test_disabled(self):
+        response = self.client.get('/api/words/')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Server-Timing', response)
+        # 不输出响应头时仍记录样本
+        self.assertEqual(len(perf_store.snapshot()['word-list']), 1)
+
+
+class FastListTests(TestCase):
+    """列表快速序列化和 orjson 编码的输出与原来的序列化器、JSONRenderer 逐字节相同"""
+
+    URLS = [
+        '/api/words/',
+        '/api/words/?page_size=100&ordering=word',
+        '/api/words/?paginate=cursor&page_size=7&search=line',
+        '/api/sentences/?page_size=100',
+        '/api/sentences/?sentence_type=question',
+        '/api/grammar/?page_size=100',
+        '/api/study-logs/?page_size=100',
+        '/api/study-logs/?paginate=cursor',
+        '/api/search/?q=line',
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        seed({'word': 40, 'sentence': 30, 'grammar': 10, 'log': 60}, years=1, goals=1)
+        # 需要转义的字符、非 ASCII 字符和空值
+        Word.objects.create(word='line\u2028break', meaning='换行\u2029"引号"\\ 😀', part_of_speech='')
+        Sentence.objects.create(english='Line\u2028sep? "yes"', chinese='问句\t制表', sentence_type='question')
+        Grammar.objects.create(title='Line </script>', structure='S + V\n', explanation='', usage='', category='')
+
+    def fetch(self, url, fast):
+        with self.settings(FAST_LIST_SERIALIZATION=fast, FAST_JSON_ENCODER=fast):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.content
+
+    def test_same_bytes(self):
+        for url in self.URLS:
+            with self.subTest(url=url):
+                self.assertEqual(self.fetch(url, True), self.fetch(url, False))
+
+    def test_sparse_fields_same_bytes(self):
+        for url in ('/api/words/?fields=word,id', '/api/sentences/?fields=english', '/api/grammar/?fields=category,title',
+                    '/api/study-logs/?fields=log_type_display,created_at'):
+            with self.subTest(url=url):
+                self.assertEqual(self.fetch(url, True), self.fetch(url, False))
+
+    @skipUnless(renderers.orjson, 'orjson 未安装')
+    def test_uses_orjson(self):
+        with mock.patch.object(renderers.orjson, 'dumps', wraps=renderers.orjson.dumps) as dumps:
+            self.fetch('/api/words/', True)
+            dumps.assert_called_once()
+            dumps.reset_mock()
+            self.fetch('/api/words/', False)
+            dumps.assert_not_called()
+
+
+class SparseFieldsTests(TestCase):
+    """?fields= 只返回、只读取指定的字段"""
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(12):
+            Word.objects.create(word=f'field{i:02d}', meaning='字段' * 50, part_of_speech='n.')
+        Grammar.objects.create(title='Fields', structure='S + V', explanation='很长的解释' * 100, usage='用法')
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        selects = [query['sql'] for query in queries if query['sql'].startswith('SELECT') and 'learning_word' in query['sql']]
+        return response, selects
+
+    def test_projection(self):
+        full = self.client.get('/api/words/?page_size=100').json()['results']
+        for fast in (True, False):
+            with self.subTest(fast=fast), self.settings(FAST_LIST_SERIALIZATION=fast):
+                response, selects = self.get('/api/words/?page_size=100&fields=word,%20id,word')
+                results = response.json()['results']
+                # 按序列化器的字段顺序输出，重复和空白忽略
+                self.assertEqual([list(item) for item in results], [['id', 'word']] * 12)
+                self.assertEqual(results, [{'id': item['id'], 'word': item['word']} for item in full])
+                self.assertTrue(selects)
+                self.assertFalse(any('"meaning"' in sql or '"part_of_speech"' in sql for sql in selects))
+
+    def test_cursor_pagination(self):
+        # 游标需要的 created_at 不在 fields 中也能翻页
+        data = self.client.get('/api/words/?paginate=cursor&page_size=5&fields=word').json()
+        words = [item['word'] for item in data['results']]
+        while data['next']:
+            data = self.client.get(data['next']).json()
+            words += [item['word'] for item in data['results']]
+        self.assertEqual(words, [f'field{i:02d}' for i in reversed(range(12))])
+
+    def test_unknown_fields(self):
+        for url in ('/api/words/?fields=id,meanings', '/api/grammar/?fields=explanation',
+                    '/api/search/?q=field&fields[words]=id,nope'):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()['status'], 'error')
+        message = self.client.get('/api/search/?q=field&fields[grammar]=x').json()['message']
+        self.assertTrue(message.startswith('fields[grammar]: 未知字段: x'))
+        # 空的 fields 返回全部字段
+        item = self.client.get('/api/words/?fields=,').json()['results'][0]
+        self.assertEqual(set(item), {'id', 'word', 'meaning', 'part_of_speech', 'difficulty', 'is_favorite', 'review_count'})
+
+    def test_search_sections(self):
+        for fast in (True, False):
+            with self.subTest(fast=fast), self.settings(FAST_LIST_SERIALIZATION=fast):
+                data = self.client.get('/api/search/?q=field&fields[words]=word&fields[grammar]=id,title').json()
+                self.assertEqual(len(data['words']), 10)
+                self.assertTrue(all(list(item) == ['word'] for item in data['words']))
+                self.assertEqual(data['grammar'], [{'id': Grammar.objects.get().pk, 'title': 'Fields'}])
+
+
+class ReviewSubmitTests(TestCase):
+    """批量提交复习结果：重复项目整批拒绝，SQL 条数与提交条数无关"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed({'word': 30, 'sentence': 30, 'grammar': 30, 'log': 0}, years=1, goals=1)
+
+    def submit(self, results):
+        return self.client.post('/api/review/submit/', {'results': results}, content_type='application/json')
+
+    def items(self, count, offset=0):
+        return [
+            {'type': kind, 'id': pk, 'grade': 'good'}
+            for kind, model in (('word', Word), ('sentence', Sentence), ('grammar', Grammar))
+            for pk in model.objects.order_by('pk').values_list('pk', flat=True)[offset:offset + count]
+        ]
+
+    def test_duplicates_rejected(self):
+        word = Word.objects.order_by('pk').first()
+        results = [{'type': 'word', 'id': word.pk, 'grade': 'good'}, {'type': 'word', 'id': str(word.pk), 'grade': 'easy'}]
+        response = self.submit(results)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('第 2 条', response.json()['message'])
+        self.assertEqual(Word.objects.get(pk=word.pk).review_count, word.review_count)
+        self.assertFalse(StudyLog.objects.exists())
+        # 不同类型的相同 id 不算重复
+        pk = max(Word.objects.latest('pk').pk, Sentence.objects.latest('pk').pk) + 1
+        Word.objects.create(id=pk, word='same', meaning='相同')
+        Sentence.objects.create(id=pk, english='Same.', chinese='相同')
+        response = self.submit([{'type': 'word', 'id': pk}, {'type': 'sentence', 'id': pk}])
+        self.assertEqual(response.json()['reviewed'], 2)
+
+    def test_submit(self):
+        results = self.items(2)
+        models = {'word': Word, 'sentence': Sentence, 'grammar': Grammar}
+        before = {
+            (item['type'], item['id']): models[item['type']].objects.get(pk=item['id']).review_count for item in results
+        }
+        response = self.submit(results + [{'type': 'word', 'id': 0, 'grade': 'again'}])
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['reviewed'], 6)
+        self.assertEqual(len(data['items']), 6)
+        self.assertEqual(data['missing'], [{'type': 'word', 'id': 0}])
+        for item in data['items']:
+            obj = models[item['type']].objects.get(pk=item['id'])
+            self.assertEqual(obj.review_count, before[item['type'], item['id']] + 1)
+            self.assertEqual(obj.interval, item['interval'])
+            self.assertGreater(obj.next_due, timezone.now())
+        self.assertEqual(StudyLog.objects.count(), 6)
+
+    def test_query_count(self):
+        self.submit(self.items(1))
+        with CaptureQueriesContext(connection) as few:
+            self.assertEqual(self.submit(self.items(2, offset=1)).json()['reviewed'], 6)
+        with CaptureQueriesContext(connection) as many:
+            self.assertEqual(self.submit(self.items(20, offset=3)).json()['reviewed'], 60)
+        self.assertEqual(len(many), len(few))
+        self.assertLessEqual(len(many), 30)
+
+
+class ExportTests(TestCase):
+    """流式导出：NDJSON / CSV 行数，参数校验，响应是流式的"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed({'word': 25, 'sentence': 15, 'grammar': 5, 'log': 40}, years=1, goals=2)
+
+    def export(self, query):
+        response = self.client.get(f'/api/export/?{query}')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment;', response['Content-Disposition'])
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson(self):
+        rows = [json.loads(line) for line in self.export('format=ndjson').splitlines()]
+        counts = {}
+        for row in rows:
+            counts[row['model']] = counts.get(row['model'], 0) + 1
+        self.assertEqual(counts, {
+            'learning.word': 25, 'learning.sentence': 15, 'learning.grammar': 5,
+            'learning.studylog': StudyLog.objects.count(), 'learning.studygoal': 2,
+        })
+        word = next(row for row in rows if row['model'] == 'learning.word')
+        self.assertEqual(word['fields']['word'], Word.objects.order_by('pk').first().word)
+        self.assertNotIn('id', word['fields'])
+
+    def test_csv(self):
+        rows = list(csv.reader(io.StringIO(self.export('format=csv&models=sentence'))))
+        self.assertEqual(rows[0][:2], ['id', 'english'])
+        self.assertEqual(len(rows), 16)
+        self.assertEqual([int(row[0]) for row in rows[1:]], list(Sentence.objects.order_by('pk').values_list('pk', flat=True)))
+
+    def test_chunks(self):
+        # 分块读取时不丢行、不重复
+        lines = ''.join(iter_export('ndjson', ['word', 'grammar'], chunk_size=4)).splitlines()
+        self.assertEqual(len(lines), 30)
+        self.assertEqual(len(set(lines)), 30)
+        self.assertEqual(''.join(iter_export('ndjson', ['word', 'grammar'])).splitlines(), lines)
+
+    def test_invalid(self):
+        for query in ('format=csv&models=word,sentence', 'format=csv', 'models=note'):
+            with self.subTest(query=query):
+                response = self.client.get(f'/api/export/?{query}')
+                self.assertEqual(response.status_code, 400)
+                # CSV 格式的错误信息由 CSVRenderer 渲染为 JSON 文本
+                self.assertEqual(json.loads(response.content)['status'], 'error')
+        with self.assertRaises(ValueError):
+            iter_export('xml', ['word'])
+
+
+class TagCountTests(TestCase):
+    """标签关联和计数随保存、删除、批量修改、导入增量维护，与重建的结果一致"""
+
+    def counts(self, kind):
+        return dict(Tag.objects.filter(kind=kind, count__gt=0).values_list('name', 'count'))
+
+    def assert_rebuild_matches(self):
+        counts = {kind: self.counts(kind) for kind in ('word', 'sentence', 'grammar')}
+        rebuild_tags()
+        self.assertEqual({kind: self.counts(kind) for kind in counts}, counts)
+
+    def test_save_and_delete(self):
+        apple = Word.objects.create(word='apple', meaning='苹果', category='fruit')
+        Word.objects.create(word='pear', meaning='梨', category=' fruit ')
+        self.assertEqual(self.counts('word'), {'fruit': 2})
+        apple.category = 'food'
+        apple.save()
+        self.assertEqual(self.counts('word'), {'fruit': 1, 'food': 1})
+        apple.delete()
+        Word.objects.create(word='blank', meaning='空', category='')
+        self.assertEqual(self.counts('word'), {'fruit': 1})
+        self.assertEqual(self.client.get('/api/words/categories/').json(), ['fruit'])
+        self.assert_rebuild_matches()
+
+    def test_keywords(self):
+        sentence = Sentence.objects.create(english='One.', chinese='一', keywords='travel，food; travel 、 hotel')
+        Sentence.objects.create(english='Two.', chinese='二', keywords='food')
+        self.assertEqual(self.counts('sentence'), {'travel': 1, 'food': 2, 'hotel': 1})
+        sentence.keywords = 'hotel'
+        sentence.save()
+        self.assertEqual(self.counts('sentence'), {'food': 1, 'hotel': 1})
+        self.assertEqual(len(self.client.get('/api/sentences/?keyword=hotel').json()['results']), 1)
+        self.assert_rebuild_matches()
+
+    def test_bulk_update_and_import(self):
+        words = [Word.objects.create(word=f'w{i}', meaning='词', category='old') for i in range(4)]
+        response = self.client.post('/api/words/bulk-update/', {'ids': [w.pk for w in words[:3]], 'set': {'category': 'new'}},
+                                    content_type='application/json')
+        self.assertEqual(response.json()['updated'], 3)
+        self.assertEqual(self.counts('word'), {'old': 1, 'new': 3})
+        import_file('word', io.StringIO('word,meaning,category\nx,叉,new\ny,歪,imported\n'), 'csv')
+        self.assertEqual(self.counts('word'), {'old': 1, 'new': 4, 'imported': 1})
+        self.assert_rebuild_matches()
+
+    def test_migration_matches(self):
+        # 迁移中冻结的 tag_names 与应用代码的结果一致
+        migration = importlib.import_module('learning.migrations.0007_tags')
+        for value, multiple in [(' a , b，b;c ', True), ('  fruit  ', False), ('', True), ('x' * 300, False)]:
+            self.assertEqual(migration.tag_names(value, multiple), tag_names(value, multiple))
+        Word.objects.create(word='apple', meaning='苹果', category='fruit')
+        Sentence.objects.create(english='One.', chinese='一', keywords='travel, food')
+        expected = {kind: self.counts(kind) for kind in ('word', 'sentence', 'grammar')}
+        for model in (Word, Sentence, Grammar):
+            model.tags.through.objects.all().delete()
+        Tag.objects.all().delete()
+        migration.build_tags(apps, None)
+        self.assertEqual({kind: self.counts(kind) for kind in expected}, expected)
+
+
+class SearchMigrationTests(TestCase):
+    """搜索索引迁移中冻结的分词与应用代码一致"""
+
+    def test_build_documents(self):
+        migration = importlib.import_module('learning.migrations.0005_search_index')
+        for text in ('Hello, World 42', '学习英语', '中', 'Mixed 中文 text！', '', None):
+            for unigrams in (True, False):
+                self.assertEqual(migration.tokenize(text, unigrams), tokenize(text, unigrams))
+        Word.objects.create(word='Apple pie', meaning='苹果派')
+        Sentence.objects.create(english='I like it.', chinese='我喜欢')
+        Grammar.objects.create(title='Past tense', structure='V-ed', explanation='过去时', usage='')
+        expected = sorted(SearchDocument.objects.values_list('kind', 'ref_id', 'title', 'body'))
+        SearchDocument.objects.all().delete()
+        migration.build_documents(apps, None)
+        self.assertEqual(sorted(SearchDocument.objects.values_list('kind', 'ref_id', 'title', 'body')), expected)
+
+
+class SchedulerTests(SimpleTestCase):
+    """SM-2 调度：评分 -> 间隔 / 难度系数"""
+
+    NOW = timezone.now()
+
+    def review(self, grades, ease=2.5, interval=0, repetitions=0):
+        for grade in grades:
+            ease, interval, repetitions, next_due = next_schedule(ease, interval, repetitions, grade, self.NOW)
+            self.assertEqual(next_due, self.NOW + timedelta(days=interval))
+        return ease, interval, repetitions
+
+    def test_first_review(self):
+        cases = {
+            'again': (1.96, 1, 0),
+            'hard': (2.36, 1, 1),
+            'good': (2.5, 1, 1),
+            'easy': (2.6, 1, 1),
+        }
+        for name, expected in cases.items():
+            with self.subTest(grade=name):
+                self.assertEqual(self.review([parse_grade(name)]), expected)
+        self.assertEqual(self.review([0]), (1.7, 1, 0))
+
+    def test_intervals(self):
+        self.assertEqual(self.review([4] * 2), (2.5, 6, 2))
+        self.assertEqual(self.review([4] * 3), (2.5, 15, 3))
+        self.assertEqual(self.review([4] * 4), (2.5, 38, 4))
+        self.assertEqual(self.review([5] * 3), (2.8, 16, 3))
+        # 答错后重新从 1 天开始，难度系数保留
+        self.assertEqual(self.review([4, 4, 4, 1, 4]), (1.96, 1, 1))
+        self.assertEqual(self.review([4, 4, 4, 1, 4, 4]), (1.96, 6, 2))
+
+    def test_bounds(self):
+        ease, _, _ = self.review([0] * 10)
+        self.assertEqual(ease, MIN_EASE)
+        self.assertEqual(self.review([5], ease=2.5, interval=30000, repetitions=5)[1], MAX_INTERVAL)
+        self.assertEqual(self.review([4], ease=MIN_EASE, interval=0, repetitions=2)[1], 1)
+
+    def test_parse_grade(self):
+        self.assertEqual(parse_grade(None), DEFAULT_GRADE)
+        self.assertEqual(parse_grade(''), DEFAULT_GRADE)
+        self.assertEqual(parse_grade('EASY'), 5)
+        self.assertEqual(parse_grade('2'), 2)
+        for value in (6, -1, 'perfect', '4.5'):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                parse_grade(value)
+
+
+class BackfillNextDueTests(TestCase):
+    """0009 迁移：根据最后复习时间和复习次数回填 next_due"""
+
+    def test_backfill(self):
+        migration = importlib.import_module('learning.migrations.0009_backfill_next_due')
+        now = timezone.now()
+        last = now - timedelta(days=3)
+        new = Word.objects.create(word='new', meaning='新')
+        once = Word.objects.create(word='once', meaning='一次')
+        thrice = Sentence.objects.create(english='Thrice.', chinese='三次')
+        scheduled = Grammar.objects.create(title='Scheduled', structure='S', explanation='', usage='')
+        Word.objects.filter(pk=new.pk).update(next_due=now, created_at=now - timedelta(days=10))
+        Word.objects.filter(pk=once.pk).update(review_count=1, last_reviewed=last, next_due=now)
+        Sentence.objects.filter(pk=thrice.pk).update(review_count=3, last_reviewed=last, next_due=now)
+        Grammar.objects.filter(pk=scheduled.pk).update(
+            review_count=2, last_reviewed=last, interval=6, repetitions=2, next_due=now + timedelta(days=3))
+
+        migration.backfill_next_due(apps, None)
+
+        new.refresh_from_db()
+        self.assertEqual(new.next_due, new.created_at)
+        once.refresh_from_db()
+        self.assertEqual((once.interval, once.repetitions, once.next_due), (1, 1, last + timedelta(days=1)))
+        thrice.refresh_from_db()
+        # 与按 good 复习三次的调度结果一致
+        self.assertEqual(next_schedule(2.5, 6, 2, DEFAULT_GRADE, last),
+                         (thrice.ease_factor, thrice.interval, thrice.repetitions, thrice.next_due))
+        self.assertEqual(thrice.next_due, last + timedelta(days=15))
+        # 已经按调度复习过的对象不变
+        scheduled.refresh_from_db()
+        self.assertEqual((scheduled.interval, scheduled.next_due), (6, now + timedelta(days=3)))
+        schedule = (2.5, 0, 0)
+        for n in range(1, 8):
+            schedule = next_schedule(*schedule, DEFAULT_GRADE, now)[:3]
+            self.assertEqual(migration.replay_schedule(n), schedule)
+
+
+class StudyStreakTests(TestCase):
+    """连续学习天数缓存的增量更新与按每日汇总重建的结果一致"""
+
+    TODAY = timezone.localdate()
+
+    def study(self, offset, at=time(12)):
+        """在 TODAY - offset 天的本地时间 at 学习一次"""
+        day = self.TODAY - timedelta(days=offset)
+        add_daily_count(day, 'word', 'review')
+        record_study_activity(timezone.make_aware(datetime.combine(day, at)))
+
+    def cached(self):
+        streak = StudyStreak.objects.get()
+        return streak.current_streak, streak.last_active_date
+
+    def assert_matches_rebuild(self):
+        cached = self.cached()
+        rebuilt = rebuild_study_streak()
+        self.assertEqual(cached, (rebuilt.current_streak, rebuilt.last_active_date))
+
+    def test_day_boundary(self):
+        self.study(2, time(23, 59))
+        self.assertEqual(self.cached(), (1, self.TODAY - timedelta(days=2)))
+        self.study(1, time(0, 1))
+        self.study(1, time(23, 59))
+        self.assertEqual(self.cached(), (2, self.TODAY - timedelta(days=1)))
+        self.assertEqual(get_study_streak(), 0)
+        self.study(0, time(0, 0))
+        self.assertEqual(get_study_streak(), 3)
+        self.assert_matches_rebuild()
+
+    def test_gap_resets(self):
+        self.study(3)
+        self.study(1)
+        self.study(0)
+        self.assertEqual(self.cached(), (2, self.TODAY))
+        self.assert_matches_rebuild()
+
+    def test_backfilled_day(self):
+        for offset in (5, 4, 2, 0):
+            self.study(offset)
+        self.assertEqual(self.cached(), (1, self.TODAY))
+        # 补录当前区间内或与之不相邻的日期，连续天数不变
+        self.study(0)
+        self.study(9)
+        self.assertEqual(self.cached(), (1, self.TODAY))
+        # 补上前一天后与更早的区间相连
+        self.study(1)
+        self.assertEqual(self.cached(), (3, self.TODAY))
+        self.study(3)
+        self.assertEqual(self.cached(), (6, self.TODAY))
+        self.assertEqual(get_study_streak(), 6)
+        self.assert_matches_rebuild()
+
+
+@override_settings(LEARNING_CACHE_TTLS={'stats': 0})
+class TimeSeriesTests(TestCase):
+    """统计时间序列：按本地日期分桶，周从周一开始，月从 1 日开始"""
+
+    @classmethod
+    def setUpTestData(cls):
+        created = [
+            datetime(2026, 1, 10, 12, 0),   # 时间窗口之前
+            datetime(2026, 1, 31, 23, 50),  # 周六
+            datetime(2026, 2, 1, 23, 30),   # 周日
+            datetime(2026, 2, 2, 0, 10),    # 周一
+            datetime(2026, 2, 16, 8, 0),
+            datetime(2026, 3, 3, 23, 59),
+        ]
+        for i, value in enumerate(created):
+            word = Word.objects.create(word=f'series{i}', meaning='序列')
+            Word.objects.filter(pk=word.pk).update(created_at=timezone.make_aware(value))
+        for day, count in ((date(2026, 2, 1), 2), (date(2026, 2, 2), 3), (date(2026, 2, 28), 1)):
+            add_daily_count(day, 'word', 'review', count)
+
+    def series(self, query):
+        response = self.client.get(f'/api/stats/?{query}')
+        self.assertEqual(response.status_code, 200)
+        return [(point['date'], point['words'], point['activities']) for point in response.json()['time_series']['points']]
+
+    def test_week_buckets(self):
+        self.assertEqual(self.series('from=2026-01-28&to=2026-02-16&bucket=week'), [
+            ('2026-01-26', 2, 2),
+            ('2026-02-02', 1, 3),
+            ('2026-02-09', 0, 0),
+            ('2026-02-16', 1, 0),
+        ])
+
+    def test_month_buckets(self):
+        self.assertEqual(self.series('from=2026-01-15&to=2026-03-05&bucket=month'), [
+            ('2026-01-01', 1, 0),
+            ('2026-02-01', 3, 6),
+            ('2026-03-01', 1, 0),
+        ])
+
+    def test_day_buckets(self):
+        points = self.series('from=2026-01-31&to=2026-02-02')
+        self.assertEqual(points, [('2026-01-31', 1, 0), ('2026-02-01', 1, 2), ('2026-02-02', 1, 3)])
+
+    def test_invalid_params(self):
+        cases = {
+            'from=2026-13-01': 'from 必须是 YYYY-MM-DD 格式的日期',
+            'to=yesterday': 'to 必须是 YYYY-MM-DD 格式的日期',
+            'days=abc': 'days 必须是整数',
+            'days=0': 'days 必须大于 0',
+            'bucket=year': 'bucket 只能是 day, week, month',
+            'from=2026-02-02&to=2026-02-01': 'from 不能晚于 to',
+        }
+        for query, message in cases.items():
+            with self.subTest(query=query):
+                response = self.client.get(f'/api/stats/?{query}')
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {'status': 'error', 'message': message})
+
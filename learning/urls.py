@@ -1,7 +1,21 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from . import views
 
+# ASGI 部署时多查询的只读接口使用异步视图，否则使用同步视图
+if settings.ASYNC_VIEWS:
+    from . import async_views
+    dashboard_view = async_views.AsyncDashboardView.as_view()
+    stats_view = async_views.AsyncStatisticsView.as_view()
+    review_list_view = async_views.AsyncReviewListView.as_view()
+    search_view = async_views.AsyncSearchView.as_view()
+else:
+    dashboard_view = views.DashboardView.as_view()
+    stats_view = views.StatisticsView.as_view()
+    review_list_view = views.ReviewListView.as_view()
+    search_view = views.SearchView.as_view()
+
 router = DefaultRouter()
 router.register(r'words', views.WordViewSet, basename='word')
 router.register(r'sentences', views.SentenceViewSet, basename='sentence')
@@ -10,17 +24,28 @@ router.register(r'study-logs', views.StudyLogViewSet, basename='study-log')
 router.register(r'study-goals', views.StudyGoalViewSet, basename='study-goal')
 
 urlpatterns = [
+    # 批量操作（放在路由器之前，否则 words/<pk>/ 会把 bulk-delete / bulk-update 当成 pk）
+    path('words/bulk-delete/', views.WordBulkDeleteView.as_view(), name='word-bulk-delete'),
+    path('sentences/bulk-delete/', views.SentenceBulkDeleteView.as_view(), name='sentence-bulk-delete'),
+    path('grammar/bulk-delete/', views.GrammarBulkDeleteView.as_view(), name='grammar-bulk-delete'),
+    path('words/bulk-update/', views.WordBulkUpdateView.as_view(), name='word-bulk-update'),
+    path('sentences/bulk-update/', views.SentenceBulkUpdateView.as_view(), name='sentence-bulk-update'),
+    path('grammar/bulk-update/', views.GrammarBulkUpdateView.as_view(), name='grammar-bulk-update'),
     path('', include(router.urls)),
     # 仪表盘
-    path('dashboard/', views.DashboardView.as_view(), name='dashboard'),
+    path('dashboard/', dashboard_view, name='dashboard'),
     # 统计数据
-    path('stats/', views.StatisticsView.as_view(), name='stats'),
+    path('stats/', stats_view, name='stats'),
+    # 响应缓存命中统计
+    path('cache-stats/', views.CacheStatsView.as_view(), name='cache-stats'),
+    # 请求耗时统计
+    path('_perf/', views.PerfStatsView.as_view(), name='perf-stats'),
     # 复习项目
-    path('review/', views.ReviewListView.as_view(), name='review-list'),
+    path('review/', review_list_view, name='review-list'),
+    path('review/submit/', views.ReviewSubmitView.as_view(), name='review-submit'),
     # 搜索
-    path('search/', views.SearchView.as_view(), name='search'),
-    # 批量操作
-    path('words/bulk-delete/', views.WordBulkDeleteView.as_view(), name='word-bulk-delete'),
-    path('sentences/bulk-delete/', views.SentenceBulkDeleteView.as_view(), name='sentence-bulk-delete'),
-    path('grammar/bulk-delete/', views.GrammarBulkDeleteView.as_view(), name='grammar-bulk-delete'),
+    path('search/', search_view, name='search'),
+    # 批量导入 / 导出
+    path('import/', views.ImportView.as_view(), name='import'),
+    path('export/', views.ExportView.as_view(), name='export'),
 ]
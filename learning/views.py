@@ -1,13 +1,19 @@
 from rest_framework import viewsets, status, generics
 from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from django.db.models import Q, Count
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
 from django.utils import timezone
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from itertools import islice
+import heapq
 import logging
 
-from .models import Word, Sentence, Grammar, StudyLog, StudyGoal
+from .models import Word, Sentence, Grammar, StudyLog, StudyGoal, toggle_flag
 from .serializers import (
     WordSerializer, WordListSerializer,
     SentenceSerializer, SentenceListSerializer,
@@ -15,14 +21,50 @@ from .serializers import (
     StudyLogSerializer, StudyGoalSerializer,
     DashboardSerializer, ReviewItemSerializer
 )
+from . import suggest
+from .bulk import bulk_delete, bulk_update, filter_queryset, parse_changes, parse_filters, parse_ids
+from .cache import response_cache
+from .conditional import ConditionalGetMixin, conditional
+from .exporter import aiter_export, iter_export, parse_models
+from .facets import facet_counts
+from .fastlist import FastListMixin, parse_fields, serialize_ranked
+from .importer import guess_format, import_file
+from .pagination import LearningPagination
+from .perf import perf_store
+from .renderers import NDJSONRenderer, CSVRenderer
+from .reviews import SCHEDULE_FIELDS, parse_results, submit_reviews
+from .sampling import MAX_SAMPLE, make_rng, sample_objects
+from .scheduler import parse_grade
+from .search import filter_ranked, search_ids
+from .stats import (
+    DISTRIBUTIONS, dashboard_counters, recent_activities, get_study_streak,
+    distribution, last_7_days, time_series, wants_time_series,
+    parse_series_window, local_day_range
+)
+from .tags import filter_tags, tag_list, tag_names
 
 logger = logging.getLogger(__name__)
 
 
-class WordViewSet(viewsets.ModelViewSet):
+def flag_filter(field, value):
+    """布尔筛选条件（?is_favorite=true）
+
+    用 ``__in`` 而不是 ``=``：Django 在 SQLite 上把 ``field=True`` 写成裸列
+    （``WHERE "is_favorite"``），无法使用 (is_favorite, -created_at) 索引。
+    """
+    return {f'{field}__in': [value.lower() == 'true']}
+
+
+class WordViewSet(ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
     """单词 API"""
     queryset = Word.objects.all()
     serializer_class = WordSerializer
+    pagination_class = LearningPagination
+    facet_fields = ['difficulty', 'category', 'is_favorite']
+    # 列表接口支持的筛选参数（批量修改、删除校验 filters 用）
+    query_filters = ['search', 'difficulty', 'is_favorite', 'category']
+    # 允许批量修改的字段
+    bulk_update_fields = ['difficulty', 'category', 'part_of_speech', 'is_favorite']
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -31,49 +73,59 @@ class WordViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         try:
-            queryset = Word.objects.all()
-            
-            # 搜索
-            search = self.request.query_params.get('search', '')
-            if search:
-                queryset = queryset.filter(
-                    Q(word__icontains=search) | 
-                    Q(meaning__icontains=search)
-                )
-            
-            # 难度筛选
-            difficulty = self.request.query_params.get('difficulty', '')
-            if difficulty:
-                queryset = queryset.filter(difficulty=difficulty)
-            
-            # 收藏筛选
-            is_favorite = self.request.query_params.get('is_favorite', '')
-            if is_favorite:
-                queryset = queryset.filter(is_favorite=is_favorite.lower() == 'true')
-            
-            # 分类筛选
-            category = self.request.query_params.get('category', '')
-            if category:
-                queryset = queryset.filter(category__icontains=category)
-            
-            return queryset
+            return self.apply_filters(Word.objects.all(), self.request.query_params)
         except Exception as e:
             logger.error(f"Error in WordViewSet.get_queryset: {str(e)}")
             return Word.objects.none()
     
+    @staticmethod
+    def apply_filters(queryset, params):
+        """按列表接口的查询参数筛选（批量修改、删除也使用）"""
+        # 搜索（按相关度排序）
+        search = params.get('search', '')
+        if search:
+            queryset = filter_ranked(queryset, 'word', search)
+        
+        # 难度筛选
+        difficulty = params.get('difficulty', '')
+        if difficulty:
+            queryset = queryset.filter(difficulty=difficulty)
+        
+        # 收藏筛选
+        is_favorite = params.get('is_favorite', '')
+        if is_favorite:
+            queryset = queryset.filter(**flag_filter('is_favorite', is_favorite))
+        
+        # 分类筛选（按标签精确匹配）
+        category = params.get('category', '')
+        if category:
+            queryset = filter_tags(queryset, 'word', [category])
+        
+        return queryset
+    
     @action(detail=True, methods=['post'])
     def review(self, request, pk=None):
         """记录复习"""
         try:
-            word = self.get_object()
-            word.review()
+            grade = parse_grade(request.data.get('grade'))
+            word = Word.objects.only('id', 'word', *SCHEDULE_FIELDS).filter(pk=pk).first()
+            if word is None:
+                return Response({'status': 'error', 'message': 'Not found'}, status=404)
+            word.review(grade)
             StudyLog.objects.create(
                 log_type='word',
                 reference_id=word.id,
                 action='复习单词',
                 notes=f'复习了单词: {word.word}'
             )
-            return Response({'status': 'success', 'review_count': word.review_count})
+            return Response({
+                'status': 'success',
+                'review_count': word.review_count,
+                'interval': word.interval,
+                'next_due': word.next_due
+            })
+        except ValueError as e:
+            return Response({'status': 'error', 'message': str(e)}, status=400)
         except Exception as e:
             logger.error(f"Error in review word: {str(e)}")
             return Response({'status': 'error', 'message': str(e)}, status=500)
@@ -82,46 +134,82 @@ class WordViewSet(viewsets.ModelViewSet):
     def toggle_favorite(self, request, pk=None):
         """切换收藏状态"""
         try:
-            word = self.get_object()
-            word.is_favorite = not word.is_favorite
-            word.save()
-            return Response({'status': 'success', 'is_favorite': word.is_favorite})
+            value = toggle_flag(Word, pk, 'is_favorite')
+            if value is None:
+                return Response({'status': 'error', 'message': 'Not found'}, status=404)
+            return Response({'status': 'success', 'is_favorite': value})
         except Exception as e:
             logger.error(f"Error in toggle favorite: {str(e)}")
             return Response({'status': 'error', 'message': str(e)}, status=500)
     
     @action(detail=False, methods=['get'])
+    @conditional(Word)
+    def facets(self, request):
+        """当前筛选和搜索条件下各筛选项的条数"""
+        try:
+            return Response(response_cache.get_or_set(
+                'word_facets', lambda: facet_counts(self.get_queryset(), self.facet_fields), request.query_params
+            ))
+        except Exception as e:
+            logger.error(f"Error in word facets: {str(e)}")
+            return Response({'status': 'error', 'message': str(e)}, status=500)
+    
+    @action(detail=False, methods=['get'])
+    @conditional(Word)
     def categories(self, request):
         """获取所有分类"""
         try:
-            categories = Word.objects.exclude(category='').values_list('category', flat=True).distinct()
-            return Response(list(categories))
+            categories = response_cache.get_or_set('word_categories', lambda: tag_list('word'))
+            return Response(categories)
         except Exception as e:
             logger.error(f"Error in categories: {str(e)}")
             return Response([])
     
     @action(detail=False, methods=['get'])
-    def random(self, request):
-        """随机获取单词"""
+    def suggest(self, request):
+        """单词联想（按单词或中文释义前缀匹配）"""
         try:
-            import random
-            count = int(request.query_params.get('count', 1))
-            word_ids = list(Word.objects.values_list('id', flat=True))
-            if word_ids:
-                selected_ids = random.sample(word_ids, min(count, len(word_ids)))
-                words = Word.objects.filter(id__in=selected_ids)
-                serializer = WordSerializer(words, many=True)
-                return Response(serializer.data)
+            prefix = request.query_params.get('prefix', '')
+            limit = int(request.query_params.get('limit', suggest.DEFAULT_LIMIT))
+            limit = max(1, min(limit, suggest.MAX_LIMIT))
+            return Response(suggest.suggest_index.suggest(prefix, limit))
+        except Exception as e:
+            logger.error(f"Error in suggest words: {str(e)}")
             return Response([])
+    
+    @action(detail=False, methods=['get'])
+    def random(self, request):
+        """随机获取单词（支持 difficulty / category / is_favorite 筛选和 seed）"""
+        try:
+            params = request.query_params
+            count = max(1, min(int(params.get('count', 1)), MAX_SAMPLE))
+            
+            queryset = Word.objects.all()
+            if params.get('difficulty'):
+                queryset = queryset.filter(difficulty=params['difficulty'])
+            if params.get('category'):
+                queryset = queryset.filter(category=params['category'])
+            if params.get('is_favorite'):
+                queryset = queryset.filter(**flag_filter('is_favorite', params['is_favorite']))
+            
+            words = sample_objects(queryset, count, make_rng(params.get('seed')))
+            serializer = WordSerializer(words, many=True)
+            return Response(serializer.data)
         except Exception as e:
             logger.error(f"Error in random words: {str(e)}")
             return Response([])
 
 
-class SentenceViewSet(viewsets.ModelViewSet):
+class SentenceViewSet(ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
     """句子 API"""
     queryset = Sentence.objects.all()
     serializer_class = SentenceSerializer
+    pagination_class = LearningPagination
+    facet_fields = ['sentence_type', 'is_favorite']
+    # 列表接口支持的筛选参数（批量修改、删除校验 filters 用）
+    query_filters = ['search', 'type', 'keyword', 'is_favorite']
+    # 允许批量修改的字段
+    bulk_update_fields = ['sentence_type', 'keywords', 'is_favorite']
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -130,44 +218,62 @@ class SentenceViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         try:
-            queryset = Sentence.objects.all()
-            
-            # 搜索
-            search = self.request.query_params.get('search', '')
-            if search:
-                queryset = queryset.filter(
-                    Q(english__icontains=search) | 
-                    Q(chinese__icontains=search)
-                )
-            
-            # 类型筛选
-            sentence_type = self.request.query_params.get('type', '')
-            if sentence_type:
-                queryset = queryset.filter(sentence_type=sentence_type)
-            
-            # 收藏筛选
-            is_favorite = self.request.query_params.get('is_favorite', '')
-            if is_favorite:
-                queryset = queryset.filter(is_favorite=is_favorite.lower() == 'true')
-            
-            return queryset
+            return self.apply_filters(Sentence.objects.all(), self.request.query_params)
         except Exception as e:
             logger.error(f"Error in SentenceViewSet.get_queryset: {str(e)}")
             return Sentence.objects.none()
     
+    @staticmethod
+    def apply_filters(queryset, params):
+        """按列表接口的查询参数筛选（批量修改、删除也使用）"""
+        # 搜索（按相关度排序）
+        search = params.get('search', '')
+        if search:
+            queryset = filter_ranked(queryset, 'sentence', search)
+        
+        # 类型筛选
+        sentence_type = params.get('type', '')
+        if sentence_type:
+            queryset = queryset.filter(sentence_type=sentence_type)
+        
+        # 关键词筛选（?keyword= 可重复或用逗号分隔，须同时包含）
+        keywords = [
+            name for value in params.getlist('keyword')
+            for name in tag_names(value, multiple=True)
+        ]
+        if keywords:
+            queryset = filter_tags(queryset, 'sentence', keywords)
+        
+        # 收藏筛选
+        is_favorite = params.get('is_favorite', '')
+        if is_favorite:
+            queryset = queryset.filter(**flag_filter('is_favorite', is_favorite))
+        
+        return queryset
+    
     @action(detail=True, methods=['post'])
     def review(self, request, pk=None):
         """记录复习"""
         try:
-            sentence = self.get_object()
-            sentence.review()
+            grade = parse_grade(request.data.get('grade'))
+            sentence = Sentence.objects.only('id', 'english', *SCHEDULE_FIELDS).filter(pk=pk).first()
+            if sentence is None:
+                return Response({'status': 'error', 'message': 'Not found'}, status=404)
+            sentence.review(grade)
             StudyLog.objects.create(
                 log_type='sentence',
                 reference_id=sentence.id,
                 action='复习句子',
                 notes=f'复习了句子: {sentence.english[:30]}...'
             )
-            return Response({'status': 'success', 'review_count': sentence.review_count})
+            return Response({
+                'status': 'success',
+                'review_count': sentence.review_count,
+                'interval': sentence.interval,
+                'next_due': sentence.next_due
+            })
+        except ValueError as e:
+            return Response({'status': 'error', 'message': str(e)}, status=400)
         except Exception as e:
             logger.error(f"Error in review sentence: {str(e)}")
             return Response({'status': 'error', 'message': str(e)}, status=500)
@@ -176,41 +282,64 @@ class SentenceViewSet(viewsets.ModelViewSet):
     def toggle_favorite(self, request, pk=None):
         """切换收藏状态"""
         try:
-            sentence = self.get_object()
-            sentence.is_favorite = not sentence.is_favorite
-            sentence.save()
-            return Response({'status': 'success', 'is_favorite': sentence.is_favorite})
+            value = toggle_flag(Sentence, pk, 'is_favorite')
+            if value is None:
+                return Response({'status': 'error', 'message': 'Not found'}, status=404)
+            return Response({'status': 'success', 'is_favorite': value})
         except Exception as e:
             logger.error(f"Error in toggle favorite: {str(e)}")
             return Response({'status': 'error', 'message': str(e)}, status=500)
     
+    @action(detail=False, methods=['get'])
+    @conditional(Sentence)
+    def facets(self, request):
+        """当前筛选和搜索条件下各筛选项的条数"""
+        try:
+            return Response(response_cache.get_or_set(
+                'sentence_facets', lambda: facet_counts(self.get_queryset(), self.facet_fields), request.query_params
+            ))
+        except Exception as e:
+            logger.error(f"Error in sentence facets: {str(e)}")
+            return Response({'status': 'error', 'message': str(e)}, status=500)
+    
     @action(detail=False, methods=['get'])
     def types(self, request):
         """获取所有句子类型"""
-        return Response([{'value': t[0], 'label': t[1]} for t in Sentence.SENTENCE_TYPES])
+        return Response(response_cache.get_or_set(
+            'sentence_types', lambda: [{'value': t[0], 'label': t[1]} for t in Sentence.SENTENCE_TYPES]
+        ))
     
     @action(detail=False, methods=['get'])
     def random(self, request):
-        """随机获取句子"""
+        """随机获取句子（支持 type / is_favorite 筛选和 seed）"""
         try:
-            import random
-            count = int(request.query_params.get('count', 1))
-            sentence_ids = list(Sentence.objects.values_list('id', flat=True))
-            if sentence_ids:
-                selected_ids = random.sample(sentence_ids, min(count, len(sentence_ids)))
-                sentences = Sentence.objects.filter(id__in=selected_ids)
-                serializer = SentenceSerializer(sentences, many=True)
-                return Response(serializer.data)
-            return Response([])
+            params = request.query_params
+            count = max(1, min(int(params.get('count', 1)), MAX_SAMPLE))
+            
+            queryset = Sentence.objects.all()
+            if params.get('type'):
+                queryset = queryset.filter(sentence_type=params['type'])
+            if params.get('is_favorite'):
+                queryset = queryset.filter(**flag_filter('is_favorite', params['is_favorite']))
+            
+            sentences = sample_objects(queryset, count, make_rng(params.get('seed')))
+            serializer = SentenceSerializer(sentences, many=True)
+            return Response(serializer.data)
         except Exception as e:
             logger.error(f"Error in random sentences: {str(e)}")
             return Response([])
 
 
-class GrammarViewSet(viewsets.ModelViewSet):
+class GrammarViewSet(ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
     """语法 API"""
     queryset = Grammar.objects.all()
     serializer_class = GrammarSerializer
+    pagination_class = LearningPagination
+    facet_fields = ['difficulty', 'category', 'is_mastered']
+    # 列表接口支持的筛选参数（批量修改、删除校验 filters 用）
+    query_filters = ['search', 'difficulty', 'category', 'is_mastered']
+    # 允许批量修改的字段
+    bulk_update_fields = ['difficulty', 'category', 'is_mastered']
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -219,50 +348,59 @@ class GrammarViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         try:
-            queryset = Grammar.objects.all()
-            
-            # 搜索
-            search = self.request.query_params.get('search', '')
-            if search:
-                queryset = queryset.filter(
-                    Q(title__icontains=search) | 
-                    Q(structure__icontains=search) |
-                    Q(explanation__icontains=search)
-                )
-            
-            # 难度筛选
-            difficulty = self.request.query_params.get('difficulty', '')
-            if difficulty:
-                queryset = queryset.filter(difficulty=difficulty)
-            
-            # 分类筛选
-            category = self.request.query_params.get('category', '')
-            if category:
-                queryset = queryset.filter(category__icontains=category)
-            
-            # 掌握状态筛选
-            is_mastered = self.request.query_params.get('is_mastered', '')
-            if is_mastered:
-                queryset = queryset.filter(is_mastered=is_mastered.lower() == 'true')
-            
-            return queryset
+            return self.apply_filters(Grammar.objects.all(), self.request.query_params)
         except Exception as e:
             logger.error(f"Error in GrammarViewSet.get_queryset: {str(e)}")
             return Grammar.objects.none()
     
+    @staticmethod
+    def apply_filters(queryset, params):
+        """按列表接口的查询参数筛选（批量修改、删除也使用）"""
+        # 搜索（按相关度排序）
+        search = params.get('search', '')
+        if search:
+            queryset = filter_ranked(queryset, 'grammar', search)
+        
+        # 难度筛选
+        difficulty = params.get('difficulty', '')
+        if difficulty:
+            queryset = queryset.filter(difficulty=difficulty)
+        
+        # 分类筛选（按标签精确匹配）
+        category = params.get('category', '')
+        if category:
+            queryset = filter_tags(queryset, 'grammar', [category])
+        
+        # 掌握状态筛选
+        is_mastered = params.get('is_mastered', '')
+        if is_mastered:
+            queryset = queryset.filter(**flag_filter('is_mastered', is_mastered))
+        
+        return queryset
+    
     @action(detail=True, methods=['post'])
     def review(self, request, pk=None):
         """记录复习"""
         try:
-            grammar = self.get_object()
-            grammar.review()
+            grade = parse_grade(request.data.get('grade'))
+            grammar = Grammar.objects.only('id', 'title', *SCHEDULE_FIELDS).filter(pk=pk).first()
+            if grammar is None:
+                return Response({'status': 'error', 'message': 'Not found'}, status=404)
+            grammar.review(grade)
             StudyLog.objects.create(
                 log_type='grammar',
                 reference_id=grammar.id,
                 action='复习语法',
                 notes=f'复习了语法: {grammar.title}'
             )
-            return Response({'status': 'success', 'review_count': grammar.review_count})
+            return Response({
+                'status': 'success',
+                'review_count': grammar.review_count,
+                'interval': grammar.interval,
+                'next_due': grammar.next_due
+            })
+        except ValueError as e:
+            return Response({'status': 'error', 'message': str(e)}, status=400)
         except Exception as e:
             logger.error(f"Error in review grammar: {str(e)}")
             return Response({'status': 'error', 'message': str(e)}, status=500)
@@ -271,29 +409,43 @@ class GrammarViewSet(viewsets.ModelViewSet):
     def toggle_mastered(self, request, pk=None):
         """切换掌握状态"""
         try:
-            grammar = self.get_object()
-            grammar.is_mastered = not grammar.is_mastered
-            grammar.save()
-            return Response({'status': 'success', 'is_mastered': grammar.is_mastered})
+            value = toggle_flag(Grammar, pk, 'is_mastered')
+            if value is None:
+                return Response({'status': 'error', 'message': 'Not found'}, status=404)
+            return Response({'status': 'success', 'is_mastered': value})
         except Exception as e:
             logger.error(f"Error in toggle mastered: {str(e)}")
             return Response({'status': 'error', 'message': str(e)}, status=500)
     
     @action(detail=False, methods=['get'])
+    @conditional(Grammar)
+    def facets(self, request):
+        """当前筛选和搜索条件下各筛选项的条数"""
+        try:
+            return Response(response_cache.get_or_set(
+                'grammar_facets', lambda: facet_counts(self.get_queryset(), self.facet_fields), request.query_params
+            ))
+        except Exception as e:
+            logger.error(f"Error in grammar facets: {str(e)}")
+            return Response({'status': 'error', 'message': str(e)}, status=500)
+    
+    @action(detail=False, methods=['get'])
+    @conditional(Grammar)
     def categories(self, request):
         """获取所有分类"""
         try:
-            categories = Grammar.objects.values_list('category', flat=True).distinct()
-            return Response(list(categories))
+            categories = response_cache.get_or_set('grammar_categories', lambda: tag_list('grammar'))
+            return Response(categories)
         except Exception as e:
             logger.error(f"Error in categories: {str(e)}")
             return Response([])
 
 
-class StudyLogViewSet(viewsets.ReadOnlyModelViewSet):
+class StudyLogViewSet(ConditionalGetMixin, FastListMixin, viewsets.ReadOnlyModelViewSet):
     """学习记录 API（只读）"""
     queryset = StudyLog.objects.all()
     serializer_class = StudyLogSerializer
+    pagination_class = LearningPagination
     
     def get_queryset(self):
         try:
@@ -304,13 +456,15 @@ class StudyLogViewSet(viewsets.ReadOnlyModelViewSet):
             if log_type:
                 queryset = queryset.filter(log_type=log_type)
             
-            # 日期筛选
+            # 日期筛选（换算成本地日期的时间区间，可以走 created_at 索引）
             date_from = self.request.query_params.get('from', '')
             date_to = self.request.query_params.get('to', '')
             if date_from:
-                queryset = queryset.filter(created_at__date__gte=date_from)
+                start, _ = local_day_range(date.fromisoformat(date_from))
+                queryset = queryset.filter(created_at__gte=start)
             if date_to:
-                queryset = queryset.filter(created_at__date__lte=date_to)
+                _, end = local_day_range(date.fromisoformat(date_to))
+                queryset = queryset.filter(created_at__lt=end)
             
             return queryset
         except Exception as e:
@@ -318,94 +472,57 @@ class StudyLogViewSet(viewsets.ReadOnlyModelViewSet):
             return StudyLog.objects.none()
 
 
-class StudyGoalViewSet(viewsets.ModelViewSet):
+class StudyGoalViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """学习目标 API"""
     queryset = StudyGoal.objects.all()
     serializer_class = StudyGoalSerializer
 
 
+# 仪表盘出错时返回的空数据
+EMPTY_DASHBOARD = {
+    'total_words': 0,
+    'total_sentences': 0,
+    'total_grammar': 0,
+    'today_words': 0,
+    'today_sentences': 0,
+    'today_grammar': 0,
+    'favorite_words': 0,
+    'favorite_sentences': 0,
+    'mastered_grammar': 0,
+    'recent_activities': [],
+    'study_streak': 0,
+}
+
+
 class DashboardView(APIView):
     """仪表盘视图"""
     
+    @conditional(Word, Sentence, Grammar, StudyLog, daily=True)
     def get(self, request):
         try:
-            today = timezone.now().date()
-            
-            # 统计数据
-            total_words = Word.objects.count()
-            total_sentences = Sentence.objects.count()
-            total_grammar = Grammar.objects.count()
-            
-            today_words = Word.objects.filter(created_at__date=today).count()
-            today_sentences = Sentence.objects.filter(created_at__date=today).count()
-            today_grammar = Grammar.objects.filter(created_at__date=today).count()
-            
-            favorite_words = Word.objects.filter(is_favorite=True).count()
-            favorite_sentences = Sentence.objects.filter(is_favorite=True).count()
-            mastered_grammar = Grammar.objects.filter(is_mastered=True).count()
-            
-            # 最近活动
-            recent_activities = StudyLog.objects.select_related()[:10]
-            activities_data = []
-            for activity in recent_activities:
-                activities_data.append({
-                    'type': activity.log_type,
-                    'action': activity.action,
-                    'time': activity.created_at.strftime('%Y-%m-%d %H:%M')
-                })
-            
-            # 计算连续学习天数
-            study_streak = self._calculate_streak()
-            
-            data = {
-                'total_words': total_words,
-                'total_sentences': total_sentences,
-                'total_grammar': total_grammar,
-                'today_words': today_words,
-                'today_sentences': today_sentences,
-                'today_grammar': today_grammar,
-                'favorite_words': favorite_words,
-                'favorite_sentences': favorite_sentences,
-                'mastered_grammar': mastered_grammar,
-                'recent_activities': activities_data,
-                'study_streak': study_streak
-            }
-            
-            return Response(data)
+            return Response(response_cache.get_or_set('dashboard', self._dashboard_data))
         except Exception as e:
             logger.error(f"Error in DashboardView: {str(e)}")
             # 返回空数据而不是500错误
-            return Response({
-                'total_words': 0,
-                'total_sentences': 0,
-                'total_grammar': 0,
-                'today_words': 0,
-                'today_sentences': 0,
-                'today_grammar': 0,
-                'favorite_words': 0,
-                'favorite_sentences': 0,
-                'mastered_grammar': 0,
-                'recent_activities': [],
-                'study_streak': 0,
-                'error': str(e)
-            })
+            return Response(dict(EMPTY_DASHBOARD, error=str(e)))
     
-    def _calculate_streak(self):
+    def _dashboard_data(self):
+        # 统计数据（每个模型一条条件聚合查询）
+        data = dashboard_counters()
+        
+        # 最近活动
+        data['recent_activities'] = recent_activities()
+        
+        # 计算连续学习天数
+        data['study_streak'] = self._calculate_streak()
+        
+        return DashboardSerializer(data).data
+    
+    @staticmethod
+    def _calculate_streak():
         """计算连续学习天数"""
         try:
-            today = timezone.now().date()
-            streak = 0
-            
-            for i in range(365):  # 最多查一年
-                check_date = today - timedelta(days=i)
-                has_activity = StudyLog.objects.filter(created_at__date=check_date).exists()
-                
-                if has_activity:
-                    streak += 1
-                else:
-                    break
-            
-            return streak
+            return get_study_streak()
         except Exception as e:
             logger.error(f"Error in _calculate_streak: {str(e)}")
             return 0
@@ -414,39 +531,13 @@ class DashboardView(APIView):
 class StatisticsView(APIView):
     """统计数据视图"""
     
+    @conditional(Word, Sentence, Grammar, StudyLog, daily=True)
     def get(self, request):
         try:
-            # 按难度统计单词
-            word_by_difficulty = Word.objects.values('difficulty').annotate(count=Count('id'))
-            
-            # 按类型统计句子
-            sentence_by_type = Sentence.objects.values('sentence_type').annotate(count=Count('id'))
-            
-            # 按难度统计语法
-            grammar_by_difficulty = Grammar.objects.values('difficulty').annotate(count=Count('id'))
-            
-            # 最近7天的学习记录
-            last_7_days = []
-            today = timezone.now().date()
-            for i in range(6, -1, -1):
-                date = today - timedelta(days=i)
-                word_count = Word.objects.filter(created_at__date=date).count()
-                sentence_count = Sentence.objects.filter(created_at__date=date).count()
-                grammar_count = Grammar.objects.filter(created_at__date=date).count()
-                
-                last_7_days.append({
-                    'date': date.strftime('%m-%d'),
-                    'words': word_count,
-                    'sentences': sentence_count,
-                    'grammar': grammar_count
-                })
-            
-            return Response({
-                'word_by_difficulty': list(word_by_difficulty),
-                'sentence_by_type': list(sentence_by_type),
-                'grammar_by_difficulty': list(grammar_by_difficulty),
-                'last_7_days': last_7_days
-            })
+            params = request.query_params
+            return Response(response_cache.get_or_set('stats', lambda: self._statistics(params), params))
+        except ValueError as e:
+            return Response({'status': 'error', 'message': str(e)}, status=400)
         except Exception as e:
             logger.error(f"Error in StatisticsView: {str(e)}")
             return Response({
@@ -455,151 +546,315 @@ class StatisticsView(APIView):
                 'grammar_by_difficulty': [],
                 'last_7_days': []
             })
+    
+    def _statistics(self, params):
+        # 自定义时间窗口先校验参数，不合法时直接返回 400
+        window = parse_series_window(params) if wants_time_series(params) else None
+        
+        # 按难度 / 类型分组统计单词、句子、语法
+        data = {key: distribution(model, field) for key, (model, field) in DISTRIBUTIONS.items()}
+        
+        # 最近7天的学习记录（每个模型一条分组查询）
+        data['last_7_days'] = last_7_days()
+        
+        # 自定义时间窗口：?days= 或 ?from=&to=，可选 ?bucket=day|week|month
+        if window:
+            data['time_series'] = time_series(*window)
+        
+        return data
+
+
+class CacheStatsView(APIView):
+    """响应缓存命中统计（当前进程，仅管理员）"""
+    permission_classes = [IsAdminUser]
+    
+    def get(self, request):
+        return Response(response_cache.stats())
+
+
+class PerfStatsView(APIView):
+    """请求耗时统计（仅管理员，?scope=process|shared）"""
+    permission_classes = [IsAdminUser]
+    
+    def get(self, request):
+        scope = request.query_params.get('scope') or ('shared' if settings.PERF_SHARED else 'process')
+        if scope not in ('process', 'shared'):
+            return Response({'status': 'error', 'message': 'scope 只能是 process 或 shared'}, status=400)
+        try:
+            return Response(perf_store.summary(shared=scope == 'shared'))
+        except Exception as e:
+            logger.error(f"Error in PerfStatsView: {str(e)}")
+            return Response({'status': 'error', 'message': str(e)}, status=500)
 
 
 class ReviewListView(APIView):
-    """复习列表视图"""
+    """复习列表视图
+
+    各类型分别按 next_due 取出已到期的项目（走 next_due 索引），再归并排序。
+    """
+    DEFAULT_LIMIT = 50
+    MAX_LIMIT = 200
+    
+    # 类型 -> (模型, 标题字段, 内容字段)
+    SOURCES = {
+        'word': (Word, 'word', 'meaning'),
+        'sentence': (Sentence, 'english', 'chinese'),
+        'grammar': (Grammar, 'title', 'structure'),
+    }
     
     def get(self, request):
         try:
-            items = []
+            limit = self.parse_limit(request)
+            now = timezone.now()
             
-            # 获取需要复习的单词（7天未复习或复习次数<5）
-            seven_days_ago = timezone.now() - timedelta(days=7)
-            words_to_review = Word.objects.filter(
-                Q(last_reviewed__isnull=True) | 
-                Q(last_reviewed__lt=seven_days_ago) |
-                Q(review_count__lt=5)
-            )[:20]
+            # 到期的单词、句子、语法
+            items = [self.due_items(item_type, now, limit) for item_type in self.SOURCES]
             
-            for word in words_to_review:
-                items.append({
-                    'id': word.id,
-                    'type': 'word',
-                    'title': word.word,
-                    'content': word.meaning,
-                    'last_reviewed': word.last_reviewed,
-                    'review_count': word.review_count
-                })
-            
-            # 获取需要复习的句子
-            sentences_to_review = Sentence.objects.filter(
-                Q(last_reviewed__isnull=True) | 
-                Q(last_reviewed__lt=seven_days_ago) |
-                Q(review_count__lt=3)
-            )[:20]
-            
-            for sentence in sentences_to_review:
-                items.append({
-                    'id': sentence.id,
-                    'type': 'sentence',
-                    'title': sentence.english[:50],
-                    'content': sentence.chinese,
-                    'last_reviewed': sentence.last_reviewed,
-                    'review_count': sentence.review_count
-                })
-            
-            # 获取需要复习的语法（未掌握或10天未复习）
-            ten_days_ago = timezone.now() - timedelta(days=10)
-            grammar_to_review = Grammar.objects.filter(
-                Q(is_mastered=False) |
-                Q(last_reviewed__isnull=True) | 
-                Q(last_reviewed__lt=ten_days_ago)
-            )[:20]
-            
-            for grammar in grammar_to_review:
-                items.append({
-                    'id': grammar.id,
-                    'type': 'grammar',
-                    'title': grammar.title,
-                    'content': grammar.structure,
-                    'last_reviewed': grammar.last_reviewed,
-                    'review_count': grammar.review_count
-                })
-            
-            # 按最后复习时间排序
-            items.sort(key=lambda x: x['last_reviewed'] or timezone.datetime.min.replace(tzinfo=timezone.get_current_timezone()))
-            
-            return Response(items[:50])
+            return Response(self.merge(items, limit))
         except Exception as e:
             logger.error(f"Error in ReviewListView: {str(e)}")
             return Response([])
+    
+    @classmethod
+    def parse_limit(cls, request):
+        limit = int(request.GET.get('limit', cls.DEFAULT_LIMIT))
+        return max(1, min(limit, cls.MAX_LIMIT))
+    
+    @classmethod
+    def due_queryset(cls, item_type, now, limit):
+        """某一类型已到期的项目，按 next_due 走索引范围扫描"""
+        model, title_field, content_field = cls.SOURCES[item_type]
+        return model.objects.filter(next_due__lte=now).order_by('next_due').only(
+            'id', title_field, content_field, 'last_reviewed', 'review_count', 'next_due'
+        )[:limit]
+    
+    @classmethod
+    def due_items(cls, item_type, now, limit):
+        """某一类型已到期的项目"""
+        _, title_field, content_field = cls.SOURCES[item_type]
+        objects = cls.due_queryset(item_type, now, limit)
+        return [
+            cls._item(
+                obj, item_type,
+                getattr(obj, title_field)[:50] if item_type == 'sentence' else getattr(obj, title_field),
+                getattr(obj, content_field)
+            )
+            for obj in objects
+        ]
+    
+    @staticmethod
+    def merge(item_lists, limit):
+        """各列表各自有序，归并后按到期时间取前 limit 个"""
+        items = heapq.merge(*item_lists, key=lambda x: x['next_due'])
+        return list(islice(items, limit))
+    
+    @staticmethod
+    def _item(obj, item_type, title, content):
+        return {
+            'id': obj.id,
+            'type': item_type,
+            'title': title,
+            'content': content,
+            'last_reviewed': obj.last_reviewed,
+            'review_count': obj.review_count,
+            'next_due': obj.next_due
+        }
+
+
+class ReviewSubmitView(APIView):
+    """批量提交复习结果
+
+    请求体: {"results": [{"type": "word", "id": 1, "grade": "good"}, ...]}
+    """
+    
+    def post(self, request):
+        try:
+            parsed = parse_results(request.data.get('results'))
+            updated, missing = submit_reviews(parsed)
+            return Response({
+                'status': 'success',
+                'reviewed': len(updated),
+                'items': updated,
+                'missing': missing
+            })
+        except ValueError as e:
+            return Response({'status': 'error', 'message': str(e)}, status=400)
+        except Exception as e:
+            logger.error(f"Error in ReviewSubmitView: {str(e)}")
+            return Response({'status': 'error', 'message': str(e)}, status=500)
 
 
 class SearchView(APIView):
     """搜索视图"""
+    SECTIONS = (
+        ('words', 'word', WordListSerializer),
+        ('sentences', 'sentence', SentenceListSerializer),
+        ('grammar', 'grammar', GrammarListSerializer),
+    )
     
+    @conditional(Word, Sentence, Grammar)
     def get(self, request):
+        try:
+            only = self.parse_section_fields(request.query_params)
+        except ValueError as e:
+            return Response({'status': 'error', 'message': str(e)}, status=400)
         try:
             query = request.query_params.get('q', '')
             if not query:
                 return Response({'words': [], 'sentences': [], 'grammar': []})
             
-            # 搜索单词
-            words = Word.objects.filter(
-                Q(word__icontains=query) | Q(meaning__icontains=query)
-            )[:10]
-            
-            # 搜索句子
-            sentences = Sentence.objects.filter(
-                Q(english__icontains=query) | Q(chinese__icontains=query)
-            )[:10]
-            
-            # 搜索语法
-            grammar_items = Grammar.objects.filter(
-                Q(title__icontains=query) | Q(structure__icontains=query) | Q(explanation__icontains=query)
-            )[:10]
-            
+            # 按相关度分别搜索单词、句子、语法
             return Response({
-                'words': WordListSerializer(words, many=True).data,
-                'sentences': SentenceListSerializer(sentences, many=True).data,
-                'grammar': GrammarListSerializer(grammar_items, many=True).data
+                key: self.search_section(kind, serializer_class, query, only=only[key])
+                for key, kind, serializer_class in self.SECTIONS
             })
         except Exception as e:
             logger.error(f"Error in SearchView: {str(e)}")
             return Response({'words': [], 'sentences': [], 'grammar': []})
+    
+    @classmethod
+    def parse_section_fields(cls, params):
+        """解析 ?fields[words]=id,word 这样按分组指定的返回字段"""
+        only = {}
+        for key, _, serializer_class in cls.SECTIONS:
+            try:
+                only[key] = parse_fields(params.get(f'fields[{key}]'), serializer_class)
+            except ValueError as e:
+                raise ValueError(f'fields[{key}]: {e}')
+        return only
+    
+    @staticmethod
+    def search_section(kind, serializer_class, query, limit=10, only=None):
+        return serialize_ranked(serializer_class, search_ids(kind, query, limit), only)
 
 
-class WordBulkDeleteView(APIView):
-    """批量删除单词"""
+class BulkDeleteView(APIView):
+    """批量删除（子类通过 viewset 指定模型和筛选参数）
+
+    请求体：``{"ids": [1, 2]}`` 或 ``{"filters": {"difficulty": "hard"}}``（同时给出时取交集）。
+    对象的学习记录一并删除，返回实际删除的条数。
+    """
+    viewset = None
     
     def post(self, request):
         try:
-            ids = request.data.get('ids', [])
-            if ids:
-                Word.objects.filter(id__in=ids).delete()
-                return Response({'status': 'success', 'deleted': len(ids)})
-            return Response({'status': 'error', 'message': 'No IDs provided'}, status=400)
+            viewset = self.viewset
+            ids = parse_ids(request.data.get('ids'))
+            filters = parse_filters(request.data.get('filters'), viewset.query_filters)
+            if ids is None and filters is None:
+                return Response({'status': 'error', 'message': 'No IDs or filters provided'}, status=400)
+            queryset = viewset.queryset.model.objects.all()
+            if filters is not None:
+                queryset = filter_queryset(queryset, filters, viewset.apply_filters)
+            deleted, logs = bulk_delete(queryset, ids)
+            return Response({'status': 'success', 'deleted': deleted, 'logs_deleted': logs})
+        except ValueError as e:
+            return Response({'status': 'error', 'message': str(e)}, status=400)
         except Exception as e:
-            logger.error(f"Error in WordBulkDeleteView: {str(e)}")
+            logger.error(f"Error in {type(self).__name__}: {str(e)}")
             return Response({'status': 'error', 'message': str(e)}, status=500)
 
 
-class SentenceBulkDeleteView(APIView):
+class WordBulkDeleteView(BulkDeleteView):
+    """批量删除单词"""
+    viewset = WordViewSet
+
+
+class SentenceBulkDeleteView(BulkDeleteView):
     """批量删除句子"""
+    viewset = SentenceViewSet
+
+
+class GrammarBulkDeleteView(BulkDeleteView):
+    """批量删除语法"""
+    viewset = GrammarViewSet
+
+
+class BulkUpdateView(APIView):
+    """批量修改（子类通过 viewset 指定模型、筛选参数和可修改的字段）
+
+    请求体：``{"ids": [1, 2]}`` 或 ``{"filters": {"difficulty": "hard"}}``（同时给出时取交集），
+    加上要修改的字段 ``{"set": {"is_favorite": true}}``
+    """
+    viewset = None
     
     def post(self, request):
         try:
-            ids = request.data.get('ids', [])
-            if ids:
-                Sentence.objects.filter(id__in=ids).delete()
-                return Response({'status': 'success', 'deleted': len(ids)})
-            return Response({'status': 'error', 'message': 'No IDs provided'}, status=400)
+            viewset = self.viewset
+            model = viewset.queryset.model
+            changes = parse_changes(request.data.get('set'), viewset.serializer_class, viewset.bulk_update_fields)
+            ids = parse_ids(request.data.get('ids'))
+            filters = parse_filters(request.data.get('filters'), viewset.query_filters)
+            if ids is None and filters is None:
+                return Response({'status': 'error', 'message': 'No IDs or filters provided'}, status=400)
+            queryset = model.objects.all()
+            if filters is not None:
+                queryset = filter_queryset(queryset, filters, viewset.apply_filters)
+            return Response({'status': 'success', 'updated': bulk_update(queryset, changes, ids)})
+        except ValueError as e:
+            return Response({'status': 'error', 'message': str(e)}, status=400)
         except Exception as e:
-            logger.error(f"Error in SentenceBulkDeleteView: {str(e)}")
+            logger.error(f"Error in {type(self).__name__}: {str(e)}")
             return Response({'status': 'error', 'message': str(e)}, status=500)
 
 
-class GrammarBulkDeleteView(APIView):
-    """批量删除语法"""
+class WordBulkUpdateView(BulkUpdateView):
+    """批量修改单词"""
+    viewset = WordViewSet
+
+
+class SentenceBulkUpdateView(BulkUpdateView):
+    """批量修改句子"""
+    viewset = SentenceViewSet
+
+
+class GrammarBulkUpdateView(BulkUpdateView):
+    """批量修改语法"""
+    viewset = GrammarViewSet
+
+
+class ImportView(APIView):
+    """批量导入（上传 CSV / JSONL 文件）"""
     
     def post(self, request):
         try:
-            ids = request.data.get('ids', [])
-            if ids:
-                Grammar.objects.filter(id__in=ids).delete()
-                return Response({'status': 'success', 'deleted': len(ids)})
-            return Response({'status': 'error', 'message': 'No IDs provided'}, status=400)
+            upload = request.FILES.get('file')
+            if not upload:
+                return Response({'status': 'error', 'message': 'No file provided'}, status=400)
+            kind = request.data.get('type', '')
+            fmt = request.data.get('format') or guess_format(upload.name)
+            result = import_file(kind, upload, fmt)
+            return Response(dict(result.as_dict(), status='success'))
+        except ValueError as e:
+            return Response({'status': 'error', 'message': str(e)}, status=400)
+        except Exception as e:
+            logger.error(f"Error in ImportView: {str(e)}")
+            return Response({'status': 'error', 'message': str(e)}, status=500)
+
+
+class ExportView(APIView):
+    """流式导出（?format=ndjson|csv&models=word,sentence,...）"""
+    renderer_classes = [JSONRenderer, NDJSONRenderer, CSVRenderer]
+    
+    CONTENT_TYPES = {
+        'ndjson': 'application/x-ndjson; charset=utf-8',
+        'csv': 'text/csv; charset=utf-8',
+    }
+    
+    def get(self, request):
+        try:
+            fmt = request.query_params.get('format', 'ndjson')
+            names = parse_models(request.query_params.get('models'))
+            rows = iter_export(fmt, names)
+            if isinstance(request._request, ASGIRequest):
+                # ASGI 下同步迭代器会被整体缓冲后再发送
+                rows = aiter_export(rows)
+            response = StreamingHttpResponse(rows, content_type=self.CONTENT_TYPES[fmt])
+            filename = f"export-{'-'.join(names) if len(names) == 1 else 'all'}-{timezone.localdate():%Y%m%d}.{fmt}"
+            response['Content-Disposition'] = f'attachment; filename="{filename}"'
+            return response
+        except ValueError as e:
+            return Response({'status': 'error', 'message': str(e)}, status=400)
         except Exception as e:
-            logger.error(f"Error in GrammarBulkDeleteView: {str(e)}")
+            logger.error(f"Error in ExportView: {str(e)}")
             return Response({'status': 'error', 'message': str(e)}, status=500)
@@ -9,18 +9,23 @@ echo "Waiting for database..."
 sleep 5
 
 # Run database migrations
+# --fake-initial lets databases created by the old `migrate --run-syncdb`
+# adopt 0001_initial without recreating existing tables.
 echo "Running database migrations..."
-python manage.py migrate --run-syncdb
+python manage.py migrate --fake-initial
 
 # Check if migrations were successful
 if [ $? -eq 0 ]; then
     echo "✓ Database migrations completed successfully!"
 else
     echo "✗ Database migrations failed!"
-    echo "Trying to create tables manually..."
-    python manage.py migrate --run-syncdb --verbosity=2
+    echo "Retrying with verbose output..."
+    python manage.py migrate --fake-initial --verbosity=2
 fi
 
+# Create the cache table (only does anything when CACHE_BACKEND=db)
+python manage.py createcachetable
+
 # Create default superuser if not exists (optional)
 # echo "Creating default admin user..."
 # echo "from django.contrib.auth import get_user_model; User = get_user_model(); User.objects.filter(username='admin').exists() or User.objects.create_superuser('admin', 'admin@example.com', 'admin123')" | python manage.py shell